@@ -1,8 +1,11 @@
 """
 Advocate Agent - Builds the strongest possible case FOR the proposal
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 ADVOCATE_BACKSTORY = """
 IDENTITY & ROLE
@@ -28,13 +31,13 @@ Structure your response as: (1) THESIS: One-sentence summary of your position, (
 """
 
 
-def create_advocate_agent() -> Agent:
-    """Create the Advocate agent."""
+def create_advocate_agent(llm: Optional[LLM] = None) -> Agent:
+    """Create the Advocate agent (llm overrides the configured model)."""
     return Agent(
         role="Strategic Advocate",
         goal="Build the strongest possible case FOR the proposal with rigorous arguments and evidence",
         backstory=ADVOCATE_BACKSTORY,
-        llm=get_llm("advocate"),
-        verbose=True,
+        llm=llm or get_llm("advocate"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
@@ -1,8 +1,11 @@
 """
 Contrarian Agent - Generates alternative approaches that reframe the problem or pursue different paths
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 CONTRARIAN_BACKSTORY = """
 IDENTITY & ROLE
@@ -29,13 +32,13 @@ Structure your response as: (1) REFRAME: How might we think about this problem d
 """
 
 
-def create_contrarian_agent() -> Agent:
-    """Create the Contrarian agent."""
+def create_contrarian_agent(llm: Optional[LLM] = None) -> Agent:
+    """Create the Contrarian agent (llm overrides the configured model)."""
     return Agent(
         role="Strategic Contrarian",
         goal="Generate genuinely different alternative approaches and reframe the problem",
         backstory=CONTRARIAN_BACKSTORY,
-        llm=get_llm("contrarian"),
-        verbose=True,
+        llm=llm or get_llm("contrarian"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
@@ -1,8 +1,11 @@
 """
 Critic Agent - Stress-tests assumptions, identifies failure modes, and surfaces hidden risks
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 CRITIC_BACKSTORY = """
 IDENTITY & ROLE
@@ -29,13 +32,13 @@ Structure your response as: (1) CRITICAL THESIS: One-sentence summary of your pr
 """
 
 
-def create_critic_agent() -> Agent:
-    """Create the Critic agent."""
+def create_critic_agent(llm: Optional[LLM] = None) -> Agent:
+    """Create the Critic agent (llm overrides the configured model)."""
     return Agent(
         role="Strategic Critic",
         goal="Identify weaknesses, risks, and potential failure modes in the proposal",
         backstory=CRITIC_BACKSTORY,
-        llm=get_llm("critic"),
-        verbose=True,
+        llm=llm or get_llm("critic"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
@@ -1,8 +1,11 @@
 """
 Domain Expert Agent - Grounds the debate in domain-specific reality, regulatory context, and practical constraints
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 DOMAIN_EXPERT_BACKSTORY = """
 IDENTITY & ROLE
@@ -29,8 +32,11 @@ Structure your response as: (1) DOMAIN CONTEXT: Key facts the debate must accoun
 """
 
 
-def create_domain_expert_agent(domain: str = "general business strategy") -> Agent:
-    """Create the Domain Expert agent with optional domain specialization."""
+def create_domain_expert_agent(
+    domain: str = "general business strategy",
+    llm: Optional[LLM] = None
+) -> Agent:
+    """Create the Domain Expert agent with optional domain specialization (llm overrides the configured model)."""
     backstory = DOMAIN_EXPERT_BACKSTORY.replace(
         "in the relevant domain",
         f"in {domain}"
@@ -40,7 +46,7 @@ def create_domain_expert_agent(domain: str = "general business strategy") -> Age
         role="Domain Expert",
         goal="Ground the debate in domain-specific reality and practical constraints",
         backstory=backstory,
-        llm=get_llm("domain_expert"),
-        verbose=True,
+        llm=llm or get_llm("domain_expert"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
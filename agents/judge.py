@@ -1,8 +1,11 @@
 """
 Judge Agent - Evaluates argument quality, manages debate dynamics, and renders final assessment
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 JUDGE_BACKSTORY = """
 IDENTITY & ROLE
@@ -29,13 +32,13 @@ Structure your response as: (1) EXECUTIVE ASSESSMENT: 2-3 sentence summary of wh
 """
 
 
-def create_judge_agent() -> Agent:
-    """Create the Judge agent."""
+def create_judge_agent(llm: Optional[LLM] = None) -> Agent:
+    """Create the Judge agent (llm overrides the configured model)."""
     return Agent(
         role="Impartial Judge",
         goal="Evaluate argument quality and provide clear assessment to support decision-making",
         backstory=JUDGE_BACKSTORY,
-        llm=get_llm("judge"),
-        verbose=True,
+        llm=llm or get_llm("judge"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
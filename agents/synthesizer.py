@@ -1,8 +1,11 @@
 """
 Synthesizer Agent - Integrates diverse viewpoints into coherent options while preserving productive tensions
 """
-from crewai import Agent
+from typing import Optional
+
+from crewai import Agent, LLM
 from utils.llm_factory import get_llm
+import config
 
 SYNTHESIZER_BACKSTORY = """
 IDENTITY & ROLE
@@ -29,13 +32,13 @@ Structure your response as: (1) CONVERGENCE POINTS: Where all/most perspectives
 """
 
 
-def create_synthesizer_agent() -> Agent:
-    """Create the Synthesizer agent."""
+def create_synthesizer_agent(llm: Optional[LLM] = None) -> Agent:
+    """Create the Synthesizer agent (llm overrides the configured model)."""
     return Agent(
         role="Strategic Synthesizer",
         goal="Integrate diverse viewpoints into coherent strategic options while preserving productive tensions",
         backstory=SYNTHESIZER_BACKSTORY,
-        llm=get_llm("synthesizer"),
-        verbose=True,
+        llm=llm or get_llm("synthesizer"),
+        verbose=config.DEBATE_CONFIG["verbose"],
         allow_delegation=False
     )
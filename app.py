@@ -1,8 +1,15 @@
 """
 MAD System - Multi-Agent Debate Streamlit Interface
 """
+import threading
+from typing import Optional
+
 import streamlit as st
 from workflows.debate_flow import run_debate
+from workflows.tournament_flow import run_tournament
+from utils.cancellation import CancelToken, DebateCancelled
+from utils.result_store import get_result_store
+from utils.scheduler import get_scheduler
 import config
 
 # Page configuration
@@ -64,6 +71,149 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+
+def watch_session(cancel_token: CancelToken) -> None:
+    """Cancel the debate once this browser session disconnects (tab closed or navigated away)."""
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    runtime = get_instance()
+
+    def watch():
+        while not cancel_token.wait(1.0):
+            if not runtime.is_active_session(ctx.session_id):
+                cancel_token.cancel("session ended")
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def session_tenant() -> str:
+    """Scheduler tenant for this browser session, so one busy session cannot hold every UI slot."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return "default"
+
+    ctx = get_script_run_ctx()
+    return f"session-{ctx.session_id}" if ctx else "default"
+
+
+def start_cancellable_run() -> CancelToken:
+    """Cancel this session's previous debate, if still running, and return a token for the new one."""
+    previous = st.session_state.get("cancel_token")
+    if previous:
+        previous.cancel("superseded by a new debate")
+
+    cancel_token = CancelToken()
+    st.session_state["cancel_token"] = cancel_token
+    watch_session(cancel_token)
+    return cancel_token
+
+
+# Transcript sections: result key -> expander label
+OUTPUT_LABELS = {
+    "advocate": "🟢 **Advocate** — The case FOR your proposal",
+    "advocates": "🟢 **Advocate** — The case FOR: {option}",
+    "critic": "🔴 **Critic** — Risks and concerns",
+    "contrarian": "🟠 **Contrarian** — Alternative approaches",
+    "advocate_response": "🟢 **Advocate Response** — Addressing concerns",
+    "critic_response": "🔴 **Critic Response** — Final assessment",
+    "domain_expert": "🟣 **Domain Expert** — Reality check"
+}
+
+
+def remember_result(results: dict) -> None:
+    """Hand finished results to the result store; the session keeps only the handle."""
+    handle = get_result_store().put(results)
+    handles = [h for h in st.session_state.get("result_handles", []) if h != handle] + [handle]
+    st.session_state["result_handles"] = handles[-config.RESULT_STORE_CONFIG["session_history"]:]
+    st.session_state["current_result"] = handle
+
+
+def show_history_choice():
+    st.session_state["current_result"] = st.session_state["history_choice"]
+
+
+def render_output(store, handle: str, key: str, preview: str, chars: int,
+                  round_number: Optional[int] = None, option: Optional[str] = None):
+    """Show an output's preview; its full text is loaded from the store only behind a toggle."""
+    if chars <= len(preview):
+        st.markdown(preview)
+    elif st.toggle("Show full text", key=f"full:{handle}:{round_number}:{key}:{option}"):
+        st.markdown(store.text(handle, key, round_number, option))
+    else:
+        st.markdown(preview + "...")
+
+
+def render_results(handle: str):
+    """Render a stored debate; transcript sections load their full text only when asked for."""
+    store = get_result_store()
+    summary = store.summary(handle)
+    if summary is None:
+        st.info("These results are no longer available. Start a new debate.")
+        return
+
+    result_tab1, result_tab2, result_tab3, result_tab4 = st.tabs([
+        "📋 Executive Summary",
+        "💬 Full Debate",
+        "🎯 Strategic Options",
+        "⚖️ Final Verdict"
+    ])
+
+    with result_tab1:
+        st.markdown("### Your Question")
+        st.info(summary["question"])
+
+        st.markdown("### Key Takeaways")
+        # Show first portion of judgment as summary
+        if summary["judgment_chars"] > len(summary["judgment_preview"]):
+            st.markdown(summary["judgment_preview"] + "...")
+            st.caption("*See 'Final Verdict' tab for complete analysis*")
+        else:
+            st.markdown(summary["judgment_preview"])
+
+    with result_tab2:
+        st.markdown("### Complete Debate Transcript")
+        st.caption("Click each section to expand and read the full argument.")
+
+        for round_data in summary["rounds"]:
+            st.markdown(f"#### Round {round_data['round']}: {round_data['phase']}")
+
+            for output in round_data["outputs"]:
+                label = OUTPUT_LABELS.get(output["key"])
+                if not label:
+                    continue
+                with st.expander(label.format(option=output["option"])):
+                    render_output(
+                        store, handle, output["key"], output["preview"], output["chars"],
+                        round_data["round"], output["option"]
+                    )
+
+            st.markdown("---")
+
+    with result_tab3:
+        st.markdown("### Synthesized Strategic Options")
+        st.caption("The best ideas from all perspectives, combined into actionable options.")
+        if summary.get("synthesis_chars"):
+            render_output(store, handle, "synthesis", summary["synthesis_preview"], summary["synthesis_chars"])
+        else:
+            st.markdown("No synthesis available")
+
+    with result_tab4:
+        st.markdown("### Final Judgment")
+        st.caption("An impartial evaluation of all arguments and a recommendation.")
+        if summary["judgment_chars"]:
+            render_output(store, handle, "judgment", summary["judgment_preview"], summary["judgment_chars"])
+        else:
+            st.markdown("No judgment available")
+
+
 # ============================================
 # SIDEBAR - Clean Settings
 # ============================================
@@ -73,18 +223,64 @@ with st.sidebar:
     domain = st.text_input(
         "Domain Context",
         value="general business strategy",
-        help="Optional: Specify a domain (e.g., 'healthcare', 'fintech', 'retail')"
+        help="Optional: Specify a domain (e.g., 'healthcare', 'fintech', 'retail'); join several with ' + ' or ';' for one expert each"
+    )
+
+    tier_names = [tier["name"] for tier in config.MODEL_TIERS]
+    model_tier = st.selectbox(
+        "Model Tier",
+        options=["auto"] + tier_names,
+        help="'auto' routes each agent to a model based on question complexity"
+    )
+
+    max_cost = st.number_input(
+        "Max cost per debate (USD)",
+        min_value=0.0,
+        value=0.0,
+        step=0.01,
+        format="%.2f",
+        help="0 = no limit. Rounds, models and answer lengths are planned to stay under it"
+    )
+    max_latency = st.number_input(
+        "Max time per debate (seconds)",
+        min_value=0,
+        value=0,
+        step=10,
+        help="0 = no limit. Rounds, models and answer lengths are planned to stay under it"
     )
 
     st.markdown("---")
     st.markdown("### 🔧 Technical Info")
 
+    result_handles = st.session_state.get("result_handles", [])
+    if len(result_handles) > 1:
+        questions = {h: (get_result_store().summary(h) or {}).get("question", "(expired)") for h in result_handles}
+        st.selectbox(
+            "Recent debates",
+            options=result_handles[::-1],
+            format_func=lambda h: questions[h][:60],
+            key="history_choice",
+            on_change=show_history_choice
+        )
+
     with st.expander("View Active Models", expanded=False):
+        optional_agents = {"domain_expert": "enable_domain_expert", "judge_panel": "judge_panel"}
         for agent, settings in config.AGENT_MODELS.items():
-            if agent != "domain_expert" or config.DEBATE_CONFIG.get("enable_domain_expert"):
+            if agent not in optional_agents or config.DEBATE_CONFIG.get(optional_agents[agent]):
                 st.caption(f"**{agent.replace('_', ' ').title()}**")
                 st.code(f"{settings['provider']}/{settings['model']}", language=None)
 
+    scheduler = get_scheduler()
+    if scheduler:
+        with st.expander("Scheduler Queues", expanded=False):
+            metrics = scheduler.metrics()
+            for priority, stats in metrics["classes"].items():
+                st.caption(
+                    f"**{priority.title()}**: {stats['queued']} queued, "
+                    f"wait p50 {stats['wait_p50_s']:.2f}s / p95 {stats['wait_p95_s']:.2f}s ({stats['calls']} calls)"
+                )
+            st.json(metrics["providers"], expanded=False)
+
 # ============================================
 # MAIN CONTENT
 # ============================================
@@ -109,6 +305,15 @@ with main_tab1:
         label_visibility="collapsed"
     )
 
+    with st.expander("⚔️ Compare several options (tournament mode)"):
+        options_text = st.text_area(
+            "Options, one per line",
+            placeholder="Build our own AI solution\nBuy an existing one\nPartner with a vendor",
+            height=100,
+            help="With two or more options, one shared analysis is run and the options are compared side by side"
+        )
+    options = [line.strip() for line in options_text.splitlines() if line.strip()]
+
     # Example questions
     with st.expander("💡 Example questions to try"):
         st.markdown("""
@@ -139,87 +344,76 @@ with main_tab1:
                 progress_bar.progress(progress)
                 status_text.info(f"⏳ {description}")
 
+            cancel_token = start_cancellable_run()
+
             try:
                 with st.spinner("🎭 AI agents are debating your question... This takes 2-4 minutes."):
-                    results = run_debate(
-                        question=question,
-                        domain=domain,
-                        on_step_complete=update_progress
-                    )
+                    if len(options) >= 2:
+                        results = run_tournament(
+                            question=question,
+                            options=options,
+                            domain=domain,
+                            on_step_complete=update_progress,
+                            model_tier=None if model_tier == "auto" else model_tier,
+                            cancel_token=cancel_token,
+                            tenant=session_tenant(),
+                            priority="interactive"
+                        )
+                    else:
+                        results = run_debate(
+                            question=question,
+                            domain=domain,
+                            on_step_complete=update_progress,
+                            model_tier=None if model_tier == "auto" else model_tier,
+                            cancel_token=cancel_token,
+                            tenant=session_tenant(),
+                            priority="interactive",
+                            max_cost_usd=max_cost or None,
+                            max_latency_s=max_latency or None
+                        )
 
                 status_text.empty()
                 progress_bar.empty()
                 st.success("✅ Debate Complete! Review the results below.")
 
-                # Results tabs
-                result_tab1, result_tab2, result_tab3, result_tab4 = st.tabs([
-                    "📋 Executive Summary",
-                    "💬 Full Debate",
-                    "🎯 Strategic Options",
-                    "⚖️ Final Verdict"
-                ])
-
-                with result_tab1:
-                    st.markdown("### Your Question")
-                    st.info(results["question"])
-
-                    st.markdown("### Key Takeaways")
-                    judgment = results.get("judgment", "")
-                    # Show first portion of judgment as summary
-                    if len(judgment) > 2000:
-                        st.markdown(judgment[:2000] + "...")
-                        st.caption("*See 'Final Verdict' tab for complete analysis*")
-                    else:
-                        st.markdown(judgment)
-
-                with result_tab2:
-                    st.markdown("### Complete Debate Transcript")
-                    st.caption("Click each section to expand and read the full argument.")
-
-                    for round_data in results.get("rounds", []):
-                        st.markdown(f"#### Round {round_data['round']}: {round_data['phase']}")
-
-                        if "advocate" in round_data:
-                            with st.expander("🟢 **Advocate** — The case FOR your proposal"):
-                                st.markdown(round_data["advocate"])
-
-                        if "critic" in round_data:
-                            with st.expander("🔴 **Critic** — Risks and concerns"):
-                                st.markdown(round_data["critic"])
-
-                        if "contrarian" in round_data:
-                            with st.expander("🟠 **Contrarian** — Alternative approaches"):
-                                st.markdown(round_data["contrarian"])
-
-                        if "advocate_response" in round_data:
-                            with st.expander("🟢 **Advocate Response** — Addressing concerns"):
-                                st.markdown(round_data["advocate_response"])
-
-                        if "critic_response" in round_data:
-                            with st.expander("🔴 **Critic Response** — Final assessment"):
-                                st.markdown(round_data["critic_response"])
-
-                        if "domain_expert" in round_data:
-                            with st.expander("🟣 **Domain Expert** — Reality check"):
-                                st.markdown(round_data["domain_expert"])
-
-                        st.markdown("---")
+                reused = results.get("reused_phases", {})
+                if reused:
+                    labels = [
+                        f"{key.split(':')[0].replace('_', ' ').title()} ({key.split(':')[1].replace('_', ' ')})"
+                        + (" — similar question" if how == "fuzzy" else "")
+                        for key, how in reused.items()
+                    ]
+                    st.caption("♻️ Reused from an earlier run with the same inputs: " + ", ".join(labels))
+
+                budget = results.get("budget")
+                if budget:
+                    planned, actual = budget["planned"], budget["actual"]
+                    st.caption(
+                        f"💰 Budget: planned ${planned['cost_usd']:.4f} / {planned['latency_s']:.0f}s, "
+                        f"actual ${actual['cost_usd']:.4f} / {actual['latency_s']:.0f}s"
+                        + (f" — reduced to fit: {', '.join(planned['moves'])}" if planned["moves"] else "")
+                    )
 
-                with result_tab3:
-                    st.markdown("### Synthesized Strategic Options")
-                    st.caption("The best ideas from all perspectives, combined into actionable options.")
-                    st.markdown(results.get("synthesis", "No synthesis available"))
+                remember_result(results)
 
-                with result_tab4:
-                    st.markdown("### Final Judgment")
-                    st.caption("An impartial evaluation of all arguments and a recommendation.")
-                    st.markdown(results.get("judgment", "No judgment available"))
+            except DebateCancelled as e:
+                status_text.empty()
+                progress_bar.empty()
+                st.warning(f"Debate stopped ({e}).")
 
             except Exception as e:
                 st.error(f"Something went wrong: {str(e)}")
                 with st.expander("Technical details"):
                     st.exception(e)
 
+            finally:
+                # Stops the session watcher; a no-op for an already cancelled debate
+                cancel_token.cancel("finished")
+
+    # Results persist across reruns (e.g. expanding a section) through the session's handle
+    if st.session_state.get("current_result"):
+        render_results(st.session_state["current_result"])
+
 # ============================================
 # TAB 2: HOW IT WORKS
 # ============================================
@@ -0,0 +1,63 @@
+"""
+Benchmark helpers - percentiles, summaries, plain-text tables and offline run settings
+"""
+import math
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def summarize(values: list) -> dict:
+    """p50/p95/max summary of a list of latencies."""
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "max": round(max(values), 3) if values else 0.0
+    }
+
+
+def format_table(rows: list, columns: list) -> str:
+    """Render dict rows as an aligned plain-text table."""
+    cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+    widths = [max([len(column)] + [len(r[i]) for r in cells]) for i, column in enumerate(columns)]
+    lines = ["  ".join(column.ljust(widths[i]) for i, column in enumerate(columns))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines += ["  ".join(value.ljust(widths[i]) for i, value in enumerate(r)) for r in cells]
+    return "\n".join(lines)
+
+
+def simulated_agent_models(agent_models: dict = None, simulator=None, output_tokens: int = 600) -> dict:
+    """
+    Offline copies of per-agent model settings backed by the simulated provider.
+
+    Each agent keeps its provider/model identity (for concurrency limits and reporting);
+    simulated generation speed comes from config.MODEL_STATS.
+    """
+    import config
+
+    simulated = {}
+    for agent_name, settings in (agent_models or config.AGENT_MODELS).items():
+        stats = config.MODEL_STATS.get(f"{settings['provider']}/{settings['model']}", {})
+        simulated[agent_name] = dict(
+            settings,
+            provider="simulated",
+            simulates=settings["provider"],
+            output_tokens=settings.get("output_tokens", output_tokens),
+            tokens_per_second=stats.get("tokens_per_second", 100.0),
+            simulator=simulator
+        )
+    return simulated
+
+
+def offline_benchmark_config() -> None:
+    """Keep a benchmark run from retuning the adaptive output budgets or recording traces."""
+    import config
+
+    config.BUDGET_CONFIG["adaptive"] = False
+    config.TRACE_CONFIG["enabled"] = False
@@ -0,0 +1,289 @@
+"""
+Configuration Sweep - Latency, tokens, cost and completeness across agent/debate configurations
+
+Expands a grid of per-agent choices (provider/model, temperature, max output tokens) and
+debate shapes (domain expert on/off, rounds) into configurations, runs every
+configuration over the benchmark questions (the questions of one configuration run in
+parallel) and reports per configuration:
+
+    - end-to-end debate latency p50/p95
+    - prompt and output tokens per debate
+    - estimated cost per debate (config.MODEL_STATS prices)
+    - structural completeness: the share of required numbered sections present
+      in each output, averaged over all outputs
+
+and marks the Pareto frontier over cost, p95 latency and completeness.
+
+Responses come from the simulated provider (speeds from MODEL_STATS), from recorded
+traces (benchmarks/replay.py's format: each model's recorded latencies and output
+sizes), or from the real providers (--responses live). Simulated and recorded agents
+write their natural length and are cut off at the max-token cap like a real model, so
+tight caps cost completeness. Temperature only matters for live runs. Configurations
+run one after another because the debate shape lives in the global config.
+
+Usage:
+    python -m benchmarks.config_sweep --compression 50
+    python -m benchmarks.config_sweep --grid sweep.json --responses recorded --traces logs/debate_traces.jsonl
+"""
+import argparse
+import itertools
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, simulated_agent_models, summarize
+from benchmarks.questions import BENCHMARK_QUESTIONS
+from utils.context_guard import limits_key
+from utils.debate_export import OUTPUT_AGENTS
+from utils.llm_factory import estimate_call_cost
+from utils.sections import section_completeness
+from utils.simulated_llm import SimulatedProvider
+from utils.trace_recorder import load_traces
+from workflows.debate_flow import run_debate
+
+# Alternatives to the choices config.py records as ad-hoc swaps
+DEFAULT_GRID = {
+    "agents": {
+        "critic": {"model": ["groq/llama-3.3-70b-versatile", "openai/gpt-4o"]},
+        "contrarian": {"model": ["groq/llama-3.1-8b-instant", "groq/llama-3.3-70b-versatile"]},
+        "synthesizer": {"max_tokens": [900, 600]}
+    },
+    "shape": {
+        "domain_expert": [False, True],
+        "rounds": [2, 1]
+    }
+}
+
+
+def expand_grid(grid: dict) -> list:
+    """
+    Every combination of a grid's choices.
+
+    Args:
+        grid: {"agents": {agent: {"model": ["provider/model", ...], "temperature": [...],
+            "max_tokens": [...]}}, "shape": {"domain_expert": [...], "rounds": [...]}}
+
+    Returns:
+        Configurations as {"agents": {agent: {setting: value}}, "shape": {...}, "label": str}
+    """
+    axes = [
+        (("agents", agent_name, setting), values)
+        for agent_name, settings in grid.get("agents", {}).items()
+        for setting, values in settings.items()
+    ] + [(("shape", name), values) for name, values in grid.get("shape", {}).items()]
+
+    configurations = []
+    for choice in itertools.product(*(values for _, values in axes)):
+        configuration = {"agents": {}, "shape": {}}
+        labels = []
+        for (path, _), value in zip(axes, choice):
+            if path[0] == "agents":
+                configuration["agents"].setdefault(path[1], {})[path[2]] = value
+                labels.append(f"{path[1]}.{path[2]}={value}")
+            else:
+                configuration["shape"][path[1]] = value
+                labels.append(f"{path[1]}={value}")
+        configuration["label"] = " ".join(labels)
+        configurations.append(configuration)
+    return configurations
+
+
+def agent_models_for(configuration: dict) -> dict:
+    """config.AGENT_MODELS with a configuration's model and temperature choices applied."""
+    agent_models = {name: dict(settings) for name, settings in config.AGENT_MODELS.items()}
+    for agent_name, choices in configuration["agents"].items():
+        if "model" in choices:
+            provider, _, model = choices["model"].partition("/")
+            agent_models[agent_name].update(provider=provider, model=model)
+        if "temperature" in choices:
+            agent_models[agent_name]["temperature"] = choices["temperature"]
+    return agent_models
+
+
+def apply_shape(configuration: dict) -> None:
+    """Set a configuration's debate shape and output caps in the global config."""
+    shape = configuration["shape"]
+    if "domain_expert" in shape:
+        config.DEBATE_CONFIG["enable_domain_expert"] = shape["domain_expert"]
+    if "rounds" in shape:
+        config.DEBATE_CONFIG["max_rounds"] = shape["rounds"]
+    for agent_name, choices in configuration["agents"].items():
+        if "max_tokens" in choices:
+            config.OUTPUT_BUDGETS[agent_name] = {
+                phase: choices["max_tokens"] for phase in config.OUTPUT_BUDGETS.get(agent_name, {})
+            }
+
+
+def recorded_profiles(traces: list) -> dict:
+    """Recorded {"latency_s", "output_tokens"} of every successful call, per model key."""
+    profiles = {}
+    for trace in traces:
+        for call in trace["calls"]:
+            if "error" not in call and call.get("output_tokens"):
+                profiles.setdefault(call["model"], []).append(
+                    {"latency_s": call["latency_s"], "output_tokens": call["output_tokens"]}
+                )
+    return profiles
+
+
+def debate_models(agent_models: dict, args, simulator: SimulatedProvider, profiles: dict, index: int) -> dict:
+    """Per-debate agent settings for the chosen response source."""
+    if args.responses == "live":
+        return agent_models
+    simulated = simulated_agent_models(agent_models, simulator=simulator, output_tokens=args.output_tokens)
+    for settings in simulated.values():
+        settings["truncate"] = True
+        recorded = profiles.get(limits_key(settings))
+        if recorded:
+            # Each debate starts at a different point of the model's recorded calls
+            offset = index * 7 % len(recorded)
+            settings["profiles"] = deque(recorded[offset:] + recorded[:offset])
+    return simulated
+
+
+def debate_cost(results: dict, agent_models: dict) -> float:
+    """Estimated dollar cost of a debate from its counted tokens."""
+    cost = 0.0
+    for key, usage in results["token_usage"].items():
+        agent_name = key.split(":")[0]
+        if agent_name in agent_models and "prompt_tokens" in usage:
+            cost += estimate_call_cost(
+                limits_key(agent_models[agent_name]), usage["prompt_tokens"], usage.get("output_tokens", 0)
+            )["cost_usd"]
+    return cost
+
+
+def completeness(results: dict) -> float:
+    """Mean share of required numbered sections present across a debate's outputs."""
+    scores = []
+    outputs = [(key, value) for round_data in results["rounds"] for key, value in round_data.items()]
+    outputs += [("synthesis", results.get("synthesis")), ("judgment", results.get("judgment"))]
+    for key, text in outputs:
+        if key in OUTPUT_AGENTS and isinstance(text, str):
+            scores.append(section_completeness(text, *OUTPUT_AGENTS[key]))
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def run_configuration(configuration: dict, questions: list, args, profiles: dict) -> dict:
+    """Run every question under one configuration (in parallel) and summarize it."""
+    apply_shape(configuration)
+    agent_models = agent_models_for(configuration)
+    scale = args.compression if args.responses != "live" else 1.0
+    simulator = SimulatedProvider(time_scale=1 / scale, seed=0)
+
+    def run(index: int) -> dict:
+        item = questions[index]
+        started = time.time()
+        results = run_debate(
+            question=item["question"],
+            domain=item["domain"],
+            agent_models=debate_models(agent_models, args, simulator, profiles, index),
+            reuse_phases=False
+        )
+        usage = [u for u in results["token_usage"].values() if "prompt_tokens" in u]
+        return {
+            "latency_s": (time.time() - started) * scale,
+            "prompt_tokens": sum(u["prompt_tokens"] for u in usage),
+            "output_tokens": sum(u.get("output_tokens", 0) for u in usage),
+            "cost_usd": debate_cost(results, agent_models),
+            "completeness": completeness(results)
+        }
+
+    with ThreadPoolExecutor(max_workers=len(questions)) as executor:
+        samples = list(executor.map(run, range(len(questions))))
+
+    latency = summarize([sample["latency_s"] for sample in samples])
+    count = len(samples)
+    return {
+        "label": configuration["label"],
+        "configuration": {key: value for key, value in configuration.items() if key != "label"},
+        "debates": count,
+        "p50_s": latency["p50"],
+        "p95_s": latency["p95"],
+        "prompt_tokens": round(sum(s["prompt_tokens"] for s in samples) / count),
+        "output_tokens": round(sum(s["output_tokens"] for s in samples) / count),
+        "cost_usd": round(sum(s["cost_usd"] for s in samples) / count, 5),
+        "completeness": round(sum(s["completeness"] for s in samples) / count, 3)
+    }
+
+
+def pareto_frontier(rows: list) -> list:
+    """Rows no other row beats on cost, p95 latency and completeness at once."""
+    def dominates(a: dict, b: dict) -> bool:
+        no_worse = a["cost_usd"] <= b["cost_usd"] and a["p95_s"] <= b["p95_s"] and a["completeness"] >= b["completeness"]
+        better = a["cost_usd"] < b["cost_usd"] or a["p95_s"] < b["p95_s"] or a["completeness"] > b["completeness"]
+        return no_worse and better
+
+    return [row for row in rows if not any(dominates(other, row) for other in rows if other is not row)]
+
+
+def sweep(grid: dict, questions: list, args, profiles: dict) -> list:
+    """Run every configuration of the grid (or a random sample of them) and mark the frontier."""
+    configurations = expand_grid(grid)
+    if args.sample and args.sample < len(configurations):
+        configurations = random.Random(args.seed).sample(configurations, args.sample)
+
+    debate_config = dict(config.DEBATE_CONFIG)
+    output_budgets = {name: dict(budgets) for name, budgets in config.OUTPUT_BUDGETS.items()}
+
+    def restore() -> None:
+        # Each configuration starts from the configured baseline
+        config.DEBATE_CONFIG.update(debate_config)
+        config.OUTPUT_BUDGETS.clear()
+        config.OUTPUT_BUDGETS.update({name: dict(budgets) for name, budgets in output_budgets.items()})
+
+    rows = []
+    try:
+        for number, configuration in enumerate(configurations, 1):
+            rows.append(run_configuration(configuration, questions, args, profiles))
+            print(f"[{number}/{len(configurations)}] {configuration['label']}")
+            restore()
+    finally:
+        restore()
+
+    frontier = pareto_frontier(rows)
+    for row in rows:
+        row["pareto"] = "*" if row in frontier else ""
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep agent/debate configurations for a latency/cost Pareto frontier")
+    parser.add_argument("--grid", default=None, help="JSON grid file (default: DEFAULT_GRID)")
+    parser.add_argument("--responses", choices=["simulated", "recorded", "live"], default="simulated")
+    parser.add_argument("--traces", default=config.TRACE_CONFIG["path"], help="Recorded traces for --responses recorded")
+    parser.add_argument("--limit", type=int, default=None, help="Number of benchmark questions")
+    parser.add_argument("--sample", type=int, default=None, help="Run a random sample of this many configurations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-tokens", type=int, default=700, help="Simulated natural output length")
+    parser.add_argument("--compression", type=float, default=50.0, help="Simulated provider speed-up")
+    parser.add_argument("--json", default=None, help="Write the full report to this JSON file")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    # Sweeps must not save every configuration's debates to the library either
+    config.LIBRARY_CONFIG["enabled"] = False
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as grid_file:
+            grid = json.load(grid_file)
+    profiles = recorded_profiles(load_traces(args.traces)) if args.responses == "recorded" else {}
+
+    rows = sweep(grid, BENCHMARK_QUESTIONS[:args.limit], args, profiles)
+    rows.sort(key=lambda row: (row["cost_usd"], row["p95_s"]))
+    print()
+    print(format_table(rows, [
+        "pareto", "cost_usd", "p50_s", "p95_s", "prompt_tokens", "output_tokens", "completeness", "label"
+    ]))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump({"grid": grid, "responses": args.responses, "rows": rows}, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
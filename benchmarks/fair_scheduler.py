@@ -0,0 +1,98 @@
+"""
+Fair Scheduler Benchmark - Interactive latency while a batch tenant floods the providers
+
+Runs simulated debates for an interactive tenant while a batch tenant submits many
+debates at once, first with plain first-come-first-served provider limits and then
+through the weighted fair scheduler (utils.scheduler) with the same per-provider
+concurrency. Reports interactive and batch debate latency and the scheduler's
+per-tenant queue wait.
+
+Usage:
+    python -m benchmarks.fair_scheduler --interactive 4 --batch 24 --provider-limit 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, simulated_agent_models, summarize
+from benchmarks.questions import BENCHMARK_QUESTIONS
+from utils.scheduler import get_scheduler
+from utils.simulated_llm import SimulatedProvider
+from workflows.debate_flow import run_debate
+
+PROVIDERS = ["openai", "groq", "google", "ollama"]
+
+
+def run_mix(interactive: int, batch: int, provider_limit: int, compression: float, scheduled: bool) -> dict:
+    """
+    Run the interactive and batch debates concurrently.
+
+    With scheduled=False the simulated provider enforces the concurrency limit itself
+    (FIFO); with scheduled=True the scheduler does and the simulator is unbounded.
+
+    Returns:
+        Dictionary of debate latencies (seconds, uncompressed) per tenant
+    """
+    limits = {provider: provider_limit for provider in PROVIDERS}
+    config.SCHEDULER_CONFIG["enabled"] = scheduled
+    config.SCHEDULER_CONFIG["provider_concurrency"] = dict(limits, default=provider_limit)
+    simulator = SimulatedProvider(time_scale=1 / compression, concurrency=None if scheduled else limits, seed=0)
+    agent_models = simulated_agent_models(simulator=simulator)
+    latencies = {"interactive": [], "batch": []}
+
+    def run(job: tuple) -> None:
+        tenant, index, delay = job
+        time.sleep(delay)
+        item = BENCHMARK_QUESTIONS[index % len(BENCHMARK_QUESTIONS)]
+        started = time.time()
+        run_debate(
+            question=item["question"],
+            domain=item["domain"],
+            agent_models=agent_models,
+            reuse_phases=False,
+            tenant=tenant,
+            priority="interactive" if tenant == "interactive" else "batch"
+        )
+        latencies[tenant].append((time.time() - started) * compression)
+
+    # The batch flood starts first; interactive debates arrive once it has filled the queues
+    jobs = [("batch", index, 0.0) for index in range(batch)]
+    jobs += [("interactive", index, 0.5 + index * 0.2) for index in range(interactive)]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        list(executor.map(run, jobs))
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare interactive latency with and without fair scheduling")
+    parser.add_argument("--interactive", type=int, default=4, help="Interactive debates")
+    parser.add_argument("--batch", type=int, default=24, help="Batch debates submitted at once")
+    parser.add_argument("--provider-limit", type=int, default=4, help="Concurrent calls per provider")
+    parser.add_argument("--compression", type=float, default=50.0, help="Simulated provider speed-up")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    config.SCHEDULER_CONFIG["tenants"] = {"batch": {"weight": 1.0, "max_concurrency": args.batch * 4}}
+
+    rows = []
+    for scheduled in (False, True):
+        latencies = run_mix(args.interactive, args.batch, args.provider_limit, args.compression, scheduled)
+        for tenant, values in latencies.items():
+            row = {"mode": "fair scheduler" if scheduled else "fifo", "tenant": tenant, "debates": len(values)}
+            row.update({f"{key}_s": value for key, value in summarize(values).items()})
+            rows.append(row)
+
+    print(format_table(rows, ["mode", "tenant", "debates", "p50_s", "p95_s", "max_s"]))
+
+    metrics = get_scheduler().metrics()
+    print("\nScheduler queue wait per tenant (compressed seconds):")
+    print(format_table(
+        [dict(tenant=name, **values) for name, values in metrics["tenants"].items()],
+        ["tenant", "calls", "wait_p50_s", "wait_p95_s"]
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Judge Panel Benchmark - Latency and agreement of the judge panel vs. the single judge
+
+Runs each benchmark question through a debate with the single full judge, then judges
+the same transcript again with the parallel small-model panel. Reports
+judgment latency per mode and how often the panel agrees with the full judge on decision
+readiness and on whether each participant's arguments mostly survived.
+
+Usage:
+    python -m benchmarks.judge_panel [--simulated] [--limit N]
+"""
+import argparse
+import re
+from typing import Optional
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, simulated_agent_models, summarize
+from benchmarks.questions import BENCHMARK_QUESTIONS
+from utils.context_guard import fit_context
+from utils.llm_factory import get_llm
+from utils.output_budget import get_output_budget
+from utils.sections import parse_sections
+from workflows.debate_flow import run_debate
+from workflows.judge_panel import PANEL_SLICES, run_judge_panel
+
+SURVIVED_WORDS = re.compile(r"surviv|held up|withstood|well[- ]supported|strong", re.IGNORECASE)
+FAILED_WORDS = re.compile(r"\bfail|refuted|did not hold|collapsed|weak|unsupported", re.IGNORECASE)
+
+
+def decision_ready(judgment: str) -> Optional[bool]:
+    """Read the DECISION READINESS verdict (section 5) as True/False, or None if unclear."""
+    sections = {section["number"]: section["body"] for section in parse_sections(judgment)}
+    text = sections.get(5, "").lower()
+    if re.search(r"\bnot (yet )?ready\b|^\s*no\b", text):
+        return False
+    if re.search(r"\bready\b|^\s*yes\b", text):
+        return True
+    return None
+
+
+def full_judge_verdicts(judgment: str) -> dict:
+    """Per participant, whether the single judge's scorecard says their arguments mostly survived."""
+    sections = {section["number"]: section["body"] for section in parse_sections(judgment)}
+    scorecard = sections.get(2, "")
+    verdicts = {}
+
+    for slice_name, (label, _) in PANEL_SLICES.items():
+        lines = [line for line in scorecard.splitlines() if label.lower() in line.lower()]
+        survived = sum(len(SURVIVED_WORDS.findall(line)) for line in lines)
+        failed = sum(len(FAILED_WORDS.findall(line)) for line in lines)
+        verdicts[slice_name] = None if survived == failed else survived > failed
+
+    return verdicts
+
+
+def panel_verdicts(panel: dict) -> dict:
+    """Per participant, whether the panel judged their arguments mostly survived."""
+    return {
+        slice_name: None if summary["survived"] == summary["failed"] else summary["survived"] > summary["failed"]
+        for slice_name, summary in panel.items()
+    }
+
+
+def compare(questions: list, agent_models: Optional[dict] = None) -> list:
+    """Judge each question's debate both ways and return one comparison row per question."""
+    models = agent_models or config.AGENT_MODELS
+
+    def llm_for(agent_name: str, phase: str):
+        return get_llm(agent_name, models[agent_name], max_tokens=get_output_budget(agent_name, phase))
+
+    def guarded_context(agent, agent_name: str, phase: str, build) -> str:
+        # Panel prompts are degraded to fit the small model, as inside run_debate
+        return fit_context(build, agent, agent_name, models[agent_name], get_output_budget(agent_name, phase))[0]
+
+    if config.DEBATE_CONFIG["judge_panel"]:
+        raise ValueError("The comparison needs debates judged by the single judge (DEBATE_CONFIG['judge_panel'] = False)")
+
+    rows = []
+    for item in questions:
+        # The debate's own judgment phase is the single-judge run
+        results = run_debate(item["question"], item["domain"], agent_models=agent_models, reuse_phases=False)
+        full_judgment = results["judgment"]
+        full_latency = results["timings"]["judgment"]
+
+        panel = run_judge_panel(results, llm_for, guarded_context)
+
+        full_verdicts = full_judge_verdicts(full_judgment)
+        panel_slices = panel_verdicts(panel["panel"])
+        comparable = [
+            (full_verdicts[name], panel_slices.get(name)) for name in PANEL_SLICES
+            if full_verdicts[name] is not None and panel_slices.get(name) is not None
+        ]
+        full_ready, panel_ready = decision_ready(full_judgment), decision_ready(panel["judgment"])
+        if full_ready is not None and panel_ready is not None:
+            comparable.append((full_ready, panel_ready))
+
+        rows.append({
+            "question": item["question"][:48],
+            "full_s": round(full_latency, 2),
+            "panel_s": panel["latency_s"],
+            "speedup": round(full_latency / panel["latency_s"], 2) if panel["latency_s"] else None,
+            "agreement": round(sum(a == b for a, b in comparable) / len(comparable), 2) if comparable else None,
+            "compared": len(comparable)
+        })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the judge panel with the single judge")
+    parser.add_argument("--simulated", action="store_true", help="Use the offline simulated provider")
+    parser.add_argument("--limit", type=int, default=None, help="Number of benchmark questions")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    config.DEBATE_CONFIG["judge_panel"] = False
+
+    agent_models = simulated_agent_models() if args.simulated else None
+    rows = compare(BENCHMARK_QUESTIONS[:args.limit], agent_models)
+    print(format_table(rows, list(rows[0].keys())))
+
+    full = summarize([row["full_s"] for row in rows])
+    panel = summarize([row["panel_s"] for row in rows])
+    agreement = [row["agreement"] for row in rows if row["agreement"] is not None]
+    print(f"\nFull judge latency  p50 {full['p50']}s  p95 {full['p95']}s")
+    print(f"Judge panel latency p50 {panel['p50']}s  p95 {panel['p95']}s")
+    if agreement:
+        print(f"Mean agreement with full judge: {sum(agreement) / len(agreement):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Model Affinity Benchmark - Throughput and model swaps for a fully local deployment
+
+Runs many simulated debates at once with every agent on one local provider serving two
+models (e.g. two Ollama models, only one of which fits in memory), first with plain
+fair queuing and then with the scheduler's model affinity grouping. Reports debate
+throughput and latency, simulated model swaps and the scheduler's model switches.
+
+Usage:
+    python -m benchmarks.model_affinity --debates 16 --swap-s 8 --compression 200
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, simulated_agent_models, summarize
+from benchmarks.questions import BENCHMARK_QUESTIONS
+from utils.scheduler import get_scheduler, reset_scheduler
+from utils.simulated_llm import SimulatedProvider
+from workflows.debate_flow import run_debate
+
+# Agents split across two local models, as in a single-GPU Ollama deployment
+LOCAL_MODELS = {
+    "advocate": "llama3.1",
+    "critic": "qwen2.5",
+    "contrarian": "llama3.1",
+    "domain_expert": "qwen2.5",
+    "synthesizer": "llama3.1",
+    "judge": "qwen2.5",
+    "judge_panel": "qwen2.5"
+}
+
+
+def local_agent_models(simulator: SimulatedProvider, tokens_per_second: float) -> dict:
+    """Simulated per-agent settings with every agent on the local provider."""
+    agent_models = {
+        agent_name: dict(settings, provider="ollama", model=LOCAL_MODELS.get(agent_name, "llama3.1"))
+        for agent_name, settings in config.AGENT_MODELS.items()
+    }
+    simulated = simulated_agent_models(agent_models, simulator=simulator)
+    for settings in simulated.values():
+        settings["tokens_per_second"] = tokens_per_second
+    return simulated
+
+
+def run_level(debates: int, affinity: bool, args) -> dict:
+    """Run `debates` concurrent debates with model affinity on or off."""
+    config.SCHEDULER_CONFIG["model_affinity"] = affinity
+    # A fresh scheduler per run so switch counts and wait metrics are not mixed
+    reset_scheduler()
+    simulator = SimulatedProvider(
+        time_scale=1 / args.compression,
+        seed=0,
+        resident_models={"ollama": args.resident},
+        swap_s=args.swap_s
+    )
+    agent_models = local_agent_models(simulator, args.tokens_per_second)
+
+    def run(index: int) -> float:
+        # Staggered arrivals, so debates are in different phases (and models) at any moment
+        time.sleep(index * args.arrival_s / args.compression)
+        item = BENCHMARK_QUESTIONS[index % len(BENCHMARK_QUESTIONS)]
+        started = time.time()
+        run_debate(
+            question=item["question"],
+            domain=item["domain"],
+            agent_models=agent_models,
+            reuse_phases=False
+        )
+        return (time.time() - started) * args.compression
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=debates) as executor:
+        latencies = list(executor.map(run, range(debates)))
+    elapsed = (time.time() - started) * args.compression
+
+    latency = summarize(latencies)
+    return {
+        "affinity": "on" if affinity else "off",
+        "debates": debates,
+        "debates_per_min": round(debates / elapsed * 60, 2),
+        "p50_s": latency["p50"],
+        "p95_s": latency["p95"],
+        "model_swaps": simulator.swaps().get("ollama", 0),
+        "model_switches": get_scheduler().metrics()["providers"].get("ollama", {}).get("model_switches", 0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure model affinity grouping on a local two-model deployment")
+    parser.add_argument("--debates", default="4,16", help="Comma-separated concurrent debate counts")
+    parser.add_argument("--slots", type=int, default=2, help="Concurrent calls the local provider serves")
+    parser.add_argument("--resident", type=int, default=1, help="Models the local provider keeps loaded")
+    parser.add_argument("--swap-s", type=float, default=8.0, help="Seconds to swap a model in")
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="Local generation speed")
+    parser.add_argument("--arrival-s", type=float, default=6.0, help="Seconds between debate arrivals")
+    parser.add_argument("--compression", type=float, default=200.0, help="Simulated provider speed-up")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    config.SCHEDULER_CONFIG["enabled"] = True
+    config.SCHEDULER_CONFIG["provider_concurrency"] = dict(config.SCHEDULER_CONFIG["provider_concurrency"], ollama=args.slots)
+    # Local models have small context windows; keep the guard from degrading simulated prompts
+    config.CONTEXT_GUARD_CONFIG["enabled"] = False
+
+    rows = []
+    for debates in [int(value) for value in args.debates.split(",")]:
+        config.SCHEDULER_CONFIG["default_tenant"] = {"weight": 1.0, "max_concurrency": debates * 2}
+        for affinity in (False, True):
+            rows.append(run_level(debates, affinity, args))
+
+    print(format_table(rows, [
+        "debates", "affinity", "debates_per_min", "p50_s", "p95_s", "model_swaps", "model_switches"
+    ]))
+
+
+if __name__ == "__main__":
+    main()
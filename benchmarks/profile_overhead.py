@@ -0,0 +1,84 @@
+"""
+Orchestration Overhead Benchmark - Local (non-LLM) cost per debate phase vs. concurrency
+
+Runs simulated debates with run_debate(profile=True) at increasing concurrency and reports,
+per phase, the mean wall time not spent waiting on the provider (Crew/Task construction,
+prompt templating, logging), CPU time and allocations. A speedscope flamegraph of one
+debate is written to config.PROFILE_CONFIG["output_dir"].
+
+Usage:
+    python -m benchmarks.profile_overhead --concurrency 1,4,8 --compression 100
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, simulated_agent_models
+from benchmarks.questions import BENCHMARK_QUESTIONS
+from utils.simulated_llm import SimulatedProvider
+from workflows.debate_flow import run_debate
+
+PHASE_COLUMNS = ["wall_s", "network_wait_s", "overhead_s", "cpu_s", "alloc_peak_kb"]
+
+
+def profile_level(concurrency: int, compression: float) -> list:
+    """Run `concurrency` simulated debates at once and return their profiles."""
+    simulator = SimulatedProvider(time_scale=1 / compression, seed=0)
+
+    def run(index: int) -> dict:
+        item = BENCHMARK_QUESTIONS[index % len(BENCHMARK_QUESTIONS)]
+        results = run_debate(
+            question=item["question"],
+            domain=item["domain"],
+            agent_models=simulated_agent_models(simulator=simulator),
+            profile=True,
+            reuse_phases=False
+        )
+        return results["profile"]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(run, range(concurrency)))
+
+
+def mean_rows(profiles: list, concurrency: int) -> list:
+    """Average each phase's profile columns across debates."""
+    rows = []
+    phases = [row["phase"] for row in profiles[0]["phases"]] + ["total"]
+    for phase in phases:
+        matching = [
+            row for profile in profiles
+            for row in profile["phases"] + [profile["total"]] if row["phase"] == phase
+        ]
+        row = {"debates": concurrency, "phase": phase}
+        for column in PHASE_COLUMNS:
+            row[column] = round(sum(r[column] for r in matching) / len(matching), 4)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile local orchestration overhead per debate phase")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated concurrent debate counts")
+    parser.add_argument("--compression", type=float, default=100.0, help="Simulated provider speed-up")
+    parser.add_argument("--no-allocations", action="store_true", help="Skip tracemalloc (faster, less detail)")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    config.PROFILE_CONFIG["track_allocations"] = not args.no_allocations
+
+    rows = []
+    flamegraph = None
+    for level in [int(value) for value in args.concurrency.split(",")]:
+        # Only the first level samples stacks; one sampler per concurrent debate would skew the rest
+        if flamegraph:
+            config.PROFILE_CONFIG["sample_interval_s"] = None
+        profiles = profile_level(level, args.compression)
+        flamegraph = flamegraph or profiles[0]["speedscope_path"]
+        rows.extend(mean_rows(profiles, level))
+
+    print(format_table(rows, ["debates", "phase"] + PHASE_COLUMNS))
+    print(f"\nFlamegraph (open at https://www.speedscope.app): {flamegraph}")
+
+
+if __name__ == "__main__":
+    main()
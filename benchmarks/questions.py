@@ -0,0 +1,29 @@
+"""
+Benchmark question set - fixed strategic questions used across benchmarks
+"""
+
+BENCHMARK_QUESTIONS = [
+    {"question": "Should we build our own AI solution or buy an existing one?", "domain": "general business strategy"},
+    {"question": "Is now the right time to raise funding, or should we bootstrap longer?", "domain": "startups"},
+    {"question": "Should we prioritize mobile app development or focus on web first?", "domain": "consumer software"},
+    {"question": "Should we hire specialists or train our existing team?", "domain": "general business strategy"},
+    {"question": "Is vertical integration the right strategy for our supply chain?", "domain": "retail operations"},
+    {
+        "question": (
+            "Should we expand into European markets this year, given our current team of 50 "
+            "and $2M runway, or focus on strengthening our US presence first?"
+        ),
+        "domain": "fintech"
+    },
+    {
+        "question": (
+            "Should our hospital network move patient records to a cloud EHR within 18 months "
+            "while keeping HIPAA audit findings at zero?"
+        ),
+        "domain": "healthcare"
+    },
+    {
+        "question": "Should we replace our in-house payments stack with a PSP to cut costs by 20%?",
+        "domain": "fintech"
+    }
+]
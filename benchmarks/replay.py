@@ -0,0 +1,234 @@
+"""
+Trace Replay - Plays recorded debate traces back against the orchestrator offline
+
+Every replayed debate runs the real run_debate pipeline, but each agent talks to a
+SimulatedLLM that reproduces the recorded output sizes and latencies. Arrivals and
+provider latencies are compressed by the chosen factor (1x, 10x, 100x); reported times
+are scaled back to trace time. Local CrewAI overhead is not compressed, so at high
+compression it is over-represented in the scaled-back numbers. Each replayed question is
+padded to the recorded question length, so prompts keep their recorded size. The
+process-wide scheduler is switched off: provider limits come from --concurrency, and
+every waiting call shows up in the reported provider wait.
+
+Usage:
+    python -m benchmarks.replay logs/debate_traces.jsonl --compression 10 --users 1,2,4,8
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import config
+from benchmarks.common import format_table, offline_benchmark_config, summarize
+from utils.simulated_llm import SimulatedProvider
+from utils.trace_recorder import load_traces
+from workflows.debate_flow import run_debate
+
+
+def build_agent_models(trace: dict, simulator: SimulatedProvider) -> dict:
+    """Simulated per-agent model settings replaying one trace's recorded calls."""
+    agent_models = {}
+
+    for agent_name, settings in config.AGENT_MODELS.items():
+        calls = [call for call in trace["calls"] if call["agent"] == agent_name and "error" not in call]
+        model = calls[0]["model"] if calls else f"{settings['provider']}/{settings['model']}"
+        provider, _, model_name = model.partition("/")
+
+        agent_models[agent_name] = {
+            "provider": "simulated",
+            "simulates": provider,
+            "model": model_name or provider,
+            "temperature": settings.get("temperature", 0.7),
+            "profiles": deque(
+                {"latency_s": call["latency_s"], "output_tokens": call["output_tokens"]} for call in calls
+            ),
+            "simulator": simulator
+        }
+
+    return agent_models
+
+
+def replay_question(trace: dict) -> str:
+    """Stand-in question with the recorded question's word count."""
+    words = f"Replayed debate {trace['debate_id']}:".split()
+    padding = max(trace.get("question_words", 0) - len(words), 0)
+    return " ".join(words + ["option"] * padding)
+
+
+def replay(
+    traces: list,
+    compression: float = 10.0,
+    users: int = 1,
+    workers: Optional[int] = None,
+    provider_concurrency: Optional[dict] = None,
+    seed: Optional[int] = 0
+) -> dict:
+    """
+    Replay traces against run_debate with a simulated provider.
+
+    Args:
+        traces: Traces from utils.trace_recorder.load_traces
+        compression: Time compression factor (10 = ten times faster than recorded)
+        users: Concurrent user streams; each replays the whole trace, staggered in time
+        workers: Max debates the orchestrator runs at once (default: unbounded)
+        provider_concurrency: Max in-flight calls per provider, e.g. {"openai": 8}
+        seed: Seed for latency jitter
+
+    Returns:
+        Report dict with throughput, queueing delay and per-phase latency distributions
+        (all times in trace seconds)
+    """
+    simulator = SimulatedProvider(time_scale=1 / compression, concurrency=provider_concurrency, seed=seed)
+    first_arrival = traces[0]["arrival"]
+    span = max(traces[-1]["arrival"] - first_arrival, 1.0)
+    # Each user replays the trace as a cycle with the trace's mean gap between its last and
+    # first arrival, so wrapping a staggered stream never moves the last debate onto the first
+    period = span + span / max(len(traces) - 1, 1)
+
+    jobs = []
+    for user in range(users):
+        stagger = user * period / users
+        for trace in traces:
+            jobs.append(((trace["arrival"] - first_arrival + stagger) % period, trace))
+    jobs.sort(key=lambda job: job[0])
+
+    samples = []
+    lock = threading.Lock()
+    replay_started = time.perf_counter()
+
+    def run(scheduled: float, trace: dict):
+        started = time.perf_counter() - replay_started
+        results = run_debate(
+            question=replay_question(trace),
+            domain=trace.get("domain", "general business strategy"),
+            agent_models=build_agent_models(trace, simulator),
+            reuse_phases=False
+        )
+        finished = time.perf_counter() - replay_started
+        with lock:
+            samples.append({
+                "queue_delay": (started - scheduled) * compression,
+                "latency": (finished - started) * compression,
+                "finished": finished * compression,
+                "timings": {phase: t * compression for phase, t in results["timings"].items()}
+            })
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=workers or len(jobs)) as executor:
+        for offset, trace in jobs:
+            scheduled = offset / compression
+            delay = scheduled - (time.perf_counter() - replay_started)
+            if delay > 0:
+                time.sleep(delay)
+            futures.append((trace, executor.submit(run, scheduled, trace)))
+
+    # Failed debates are reported, not silently left out of the latency figures
+    failures = [
+        {"debate_id": trace["debate_id"], "error": repr(future.exception())}
+        for trace, future in futures if future.exception()
+    ]
+
+    wall = max(sample["finished"] for sample in samples) if samples else 0.0
+    phases = sorted({phase for sample in samples for phase in sample["timings"]})
+
+    return {
+        "users": users,
+        "workers": workers,
+        "compression": compression,
+        "debates": len(samples),
+        "failures": failures,
+        "wall_s": round(wall, 2),
+        "throughput_per_min": round(len(samples) / wall * 60, 3) if wall else 0.0,
+        "queue_delay_s": summarize([sample["queue_delay"] for sample in samples]),
+        "provider_wait_s": summarize(simulator.waits()),
+        "debate_latency_s": summarize([sample["latency"] for sample in samples]),
+        "phase_latency_s": {
+            phase: summarize([s["timings"][phase] for s in samples if phase in s["timings"]])
+            for phase in phases
+        }
+    }
+
+
+def find_saturation(traces: list, user_levels: list, **replay_kwargs) -> dict:
+    """
+    Replay at increasing user counts and find where throughput stops scaling.
+
+    The saturation point is the first user level whose throughput gain over the
+    previous level is under 10% of the added load.
+
+    Returns:
+        Dictionary with the per-level "reports" and the "saturation_users" level (or None)
+    """
+    reports = []
+    saturation = None
+
+    for users in user_levels:
+        report = replay(traces, users=users, **replay_kwargs)
+        if reports and saturation is None:
+            previous = reports[-1]
+            load_gain = users / previous["users"] - 1
+            throughput_gain = report["throughput_per_min"] / max(previous["throughput_per_min"], 1e-9) - 1
+            if throughput_gain < 0.1 * load_gain:
+                saturation = users
+        reports.append(report)
+
+    return {"reports": reports, "saturation_users": saturation}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded debate traces offline")
+    parser.add_argument("traces", nargs="?", default=config.TRACE_CONFIG["path"])
+    parser.add_argument("--compression", type=float, default=10.0)
+    parser.add_argument("--users", default="1,2,4,8", help="Comma-separated concurrent user levels")
+    parser.add_argument("--workers", type=int, default=None, help="Max concurrent debates")
+    parser.add_argument("--concurrency", default="", help="Provider limits, e.g. openai=8,groq=4")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    offline_benchmark_config()
+    # Provider limits are simulated; the real scheduler would queue calls again, unreported
+    config.SCHEDULER_CONFIG["enabled"] = False
+
+    concurrency = dict(
+        (name, int(limit)) for name, limit in (item.split("=") for item in args.concurrency.split(",") if item)
+    )
+    result = find_saturation(
+        load_traces(args.traces),
+        [int(level) for level in args.users.split(",")],
+        compression=args.compression,
+        workers=args.workers,
+        provider_concurrency=concurrency
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    rows = [{
+        "users": r["users"],
+        "debates": r["debates"],
+        "failed": len(r["failures"]),
+        "throughput/min": r["throughput_per_min"],
+        "queue p95 s": r["queue_delay_s"]["p95"],
+        "provider wait p95 s": r["provider_wait_s"]["p95"],
+        "debate p50 s": r["debate_latency_s"]["p50"],
+        "debate p95 s": r["debate_latency_s"]["p95"]
+    } for r in result["reports"]]
+    print(format_table(rows, list(rows[0].keys())))
+
+    print("\nPer-phase latency (p50 / p95 s) at highest load:")
+    for phase, stats in result["reports"][-1]["phase_latency_s"].items():
+        print(f"  {phase:<14} {stats['p50']:>8} / {stats['p95']}")
+
+    print(f"\nSaturation point: {result['saturation_users'] or 'not reached'} users")
+
+    failures = [failure for r in result["reports"] for failure in r["failures"]]
+    if failures:
+        print(f"\n{len(failures)} replayed debates failed, e.g. {failures[0]['debate_id']}: {failures[0]['error']}")
+
+
+if __name__ == "__main__":
+    main()
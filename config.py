@@ -45,12 +45,259 @@ AGENT_MODELS = {
         "provider": "groq",
         "model": "llama-3.3-70b-versatile",
         "temperature": 0.4
+    },
+    "judge_panel": {
+        "provider": "groq",
+        "model": "llama-3.1-8b-instant",  # Fast per-slice judges (DEBATE_CONFIG["judge_panel"])
+        "temperature": 0.3
     }
 }
 
 # Debate Configuration
 DEBATE_CONFIG = {
-    "max_rounds": 2,  # Number of adversarial rounds
+    "max_rounds": 2,  # 1 = opening positions only, 2 = plus the adversarial exchange
     "enable_domain_expert": False,  # Disabled - Ollama EC2 port not open
-    "verbose": True
+    "judge_panel": False,  # Parallel small-model panel instead of the single judge
+    "verbose": False  # CrewAI console output (full prompts and outputs); events go to EVENT_LOG_CONFIG
+}
+
+# Model tier ladder for complexity-aware routing (cheapest -> most capable)
+MODEL_TIERS = [
+    {"name": "fast", "provider": "groq", "model": "llama-3.1-8b-instant"},
+    {"name": "balanced", "provider": "groq", "model": "llama-3.3-70b-versatile"},
+    {"name": "premium", "provider": "openai", "model": "gpt-4o"}
+]
+
+# Approximate price (USD per 1M tokens), generation speed and context limits per model
+MODEL_STATS = {
+    "openai/gpt-4o": {
+        "input_per_1m": 2.50,
+        "output_per_1m": 10.00,
+        "tokens_per_second": 90,
+        "context_window": 128000
+    },
+    "groq/llama-3.3-70b-versatile": {
+        "input_per_1m": 0.59,
+        "output_per_1m": 0.79,
+        "tokens_per_second": 275,
+        "context_window": 131072,
+        "request_token_limit": 12000  # Groq on-demand tokens-per-minute cap
+    },
+    "groq/llama-3.1-8b-instant": {
+        "input_per_1m": 0.05,
+        "output_per_1m": 0.08,
+        "tokens_per_second": 750,
+        "context_window": 131072,
+        "request_token_limit": 6000  # Groq on-demand tokens-per-minute cap
+    },
+    f"ollama/{OLLAMA_MODEL}": {
+        "input_per_1m": 0.0,
+        "output_per_1m": 0.0,
+        "tokens_per_second": 30,
+        "context_window": 4096  # Ollama's default num_ctx
+    }
+}
+
+# Router Configuration
+ROUTER_CONFIG = {
+    "enabled": True,
+    # Minimum question score needed to reach each tier
+    "thresholds": {"balanced": 0.3, "premium": 0.6},
+    # Tier shift per agent: judging/synthesis need more capability than brainstorming
+    "agent_bias": {
+        "advocate": 0,
+        "critic": 0,
+        "contrarian": -1,
+        "synthesizer": 1,
+        "judge": 1
+    },
+    # Agents never routed below this tier
+    "min_tier": {
+        "synthesizer": "balanced",
+        "judge": "balanced"
+    },
+    # Domains where a wrong answer is expensive
+    "high_stakes_domains": [
+        "health", "medical", "pharma", "finance", "fintech", "bank", "insurance",
+        "legal", "law", "regulat", "compliance", "government", "security", "energy"
+    ],
+    # Agents whose prompts never include the domain: routed on the question alone
+    "domain_blind_agents": ["advocate", "critic", "contrarian"],
+    # Typical tokens per call, used for cost/latency estimates
+    "expected_tokens": {"input": 2500, "output": 800},
+    "log_path": "logs/routing_decisions.jsonl"
+}
+
+# Output budgets (max output tokens) per agent and debate phase
+OUTPUT_BUDGETS = {
+    "advocate": {"initial": 700, "response": 500},
+    "critic": {"initial": 700, "response": 500},
+    "contrarian": {"initial": 600},
+    "domain_expert": {"reality_check": 700},
+    "synthesizer": {"synthesis": 900},
+    "judge": {"judgment": 900},
+    "judge_panel": {"scorecard": 400, "overview": 600}
+}
+
+# Output Budget Configuration
+BUDGET_CONFIG = {
+    "enabled": True,
+    "adaptive": True,  # Tune budgets from how much of each output later phases reference
+    "min_tokens": 250,
+    "max_tokens": 1500,
+    "step": 0.1,  # Fractional budget change per adaptation
+    "low_reference_rate": 0.15,  # Shrink below this
+    "high_reference_rate": 0.35,  # Grow above this
+    "state_path": "logs/output_budgets.json",
+    "report_path": "logs/budget_report.jsonl"
+}
+
+# Cost/latency budget planner (run_debate(max_cost_usd=..., max_latency_s=...), utils/budget_planner.py)
+PLANNER_CONFIG = {
+    "prompt_tokens": 700,  # Task instructions and agent backstory per call, before embedded outputs
+    "call_overhead_s": 1.0,  # Time to first token plus CrewAI round trip per call
+    "default_tokens_per_second": 100,  # For models missing from MODEL_STATS
+    "headroom": 0.1,  # Plan to 90% of each budget
+    "output_scales": [1.0, 0.8, 0.6, 0.45],  # Output cap multipliers, tried in order
+    # Quality cost of each degradation; the planner takes the most overrun removed per unit
+    "move_penalty": {
+        "shrink_outputs": 1.0,
+        "downgrade": 1.0,
+        "drop_reality_check": 2.0,
+        "drop_response": 3.0
+    },
+    # Downgrade penalty multiplier per agent (judging/synthesis quality matters most)
+    "agent_weight": {
+        "contrarian": 0.5,
+        "synthesizer": 2.0,
+        "judge": 2.0,
+        "judge_panel": 1.5
+    }
+}
+
+# Pre-flight context checks: prompts are counted locally before every call and degraded to fit
+CONTEXT_GUARD_CONFIG = {
+    "enabled": True,
+    "default_context_window": 8192,  # For models missing from MODEL_STATS
+    "prompt_overhead_tokens": 600,  # Task instructions and CrewAI format scaffolding around the context
+    "truncate_chars": 1200  # Per-output cap at the last degradation level
+}
+
+# Retries for streamed provider calls (utils/streaming_llm.py), used by cancellable debates
+STREAMING_CONFIG = {
+    "max_retries": 3,  # Retries of a call that failed before its first chunk (rate limits, outages)
+    "backoff_s": 1.0,  # First retry delay; doubles per attempt, with jitter
+    "max_backoff_s": 30.0
+}
+
+# Trace recording for offline load replay (benchmarks/replay.py)
+TRACE_CONFIG = {
+    "enabled": False,
+    "path": "logs/debate_traces.jsonl"
+}
+
+# Admission control for LLM calls shared by all debates in the process (utils/scheduler.py)
+SCHEDULER_CONFIG = {
+    "enabled": True,
+    "provider_concurrency": {  # Max in-flight calls per provider (size these to your rate limits)
+        "openai": 16,
+        "groq": 8,
+        "google": 8,
+        "ollama": 2,
+        "default": 4
+    },
+    "priority_classes": ["interactive", "api", "batch"],  # Highest first
+    "class_max_share": {  # Share of a provider's slots each class may fill
+        "interactive": 1.0,
+        "api": 0.9,
+        "batch": 0.6
+    },
+    "default_tenant": {"weight": 1.0, "max_concurrency": 12},
+    "model_affinity": True,  # Serve queued calls for an already-active model back-to-back
+    "affinity_slack": 8000,  # Max fair-queuing lead (virtual prompt tokens) a same-model call may skip
+    "tenants": {}  # Per-tenant overrides, e.g. {"research": {"weight": 2.0, "max_concurrency": 24}}
+}
+
+# Reuse of agent outputs whose exact inputs were seen before (utils/phase_cache.py)
+PHASE_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": "data/phase_cache",
+    "max_age_days": 30,
+    "fuzzy_question_reuse": False,  # Also reuse outputs for a near-identical question
+    "fuzzy_threshold": 0.97  # Minimum question similarity (difflib ratio); typo-level edits only
+}
+
+# Structured event log (utils/event_log.py): queue-backed, rotating JSONL, no console output
+EVENT_LOG_CONFIG = {
+    "enabled": True,
+    "path": "logs/events.jsonl",
+    "level": "INFO",  # DEBUG adds one event per LLM call
+    "debate_sample_rate": 1.0,  # Fraction of debates logged below WARNING (sampled per debate)
+    "include_text": False,  # Include full agent outputs in agent_output events
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5
+}
+
+# Orchestration profiling for run_debate(profile=True) (utils/profiler.py)
+PROFILE_CONFIG = {
+    "output_dir": "logs/profiles",
+    "sample_interval_s": 0.005,  # Stack sampling period for the flamegraph
+    "track_allocations": True  # tracemalloc; slows Python code noticeably while profiling
+}
+
+# Bulk debates as provider batch jobs (workflows/bulk_flow.py, utils/batch_provider.py)
+BULK_CONFIG = {
+    "batch_endpoints": {  # Providers with an OpenAI-format batch API -> base URL (None = OpenAI's)
+        "openai": None,
+        "groq": "https://api.groq.com/openai/v1"
+    },
+    "batch_discount": {"openai": 0.5, "groq": 0.5},  # Price reduction for batched calls, for cost estimates
+    "completion_window": "24h",
+    "poll_interval_s": 60,
+    "max_wait_hours": 26,  # Give up (and cancel) after this; unfinished calls count as failed
+    "max_retries": 1,  # Resubmissions of calls a batch job failed
+    "max_requests_per_batch": 50000,  # OpenAI's per-file request limit
+    "direct_concurrency": 4,  # In-flight calls per job for providers without a batch API
+    "batch_dir": "data/batches",  # Batch input/output JSONL files
+    "results_path": "data/bulk/results.jsonl",
+    "local_turnaround_s": 0.0,  # File-based stand-in provider: seconds before a job completes
+    "local_output_tokens": 600  # File-based stand-in provider: answer length cap
+}
+
+# Debate library (stored results) and analytics export
+LIBRARY_CONFIG = {
+    "enabled": False,  # Save every debate's results as JSON in library_dir
+    "library_dir": "data/debates",
+    "export_dir": "data/exports"
+}
+
+# Debate results shown in the app (utils/result_store.py): sessions hold handles, the process holds the text
+RESULT_STORE_CONFIG = {
+    "memory_cap_mb": 64,  # Serialized results kept in memory across all sessions; older ones spill to disk
+    "spill_dir": "data/session_results",  # gzip-compressed JSON, one file per debate
+    "spill_max_age_hours": 72,  # Spill files older than this are deleted at startup
+    "max_index_entries": 5000,  # In-memory previews kept for listing and collapsed sections
+    "index_cap_mb": 8,  # Serialized size of those previews, capped apart from memory_cap_mb
+    "preview_chars": 280,  # Preview shown in a collapsed transcript section
+    "summary_chars": 2000,  # Judgment excerpt on the summary tab
+    "session_history": 10  # Recent debates selectable per session
+}
+
+# Multi-domain expert panel (workflows/domain_panel.py): run_debate(domain="fintech + EU regulation")
+DOMAIN_PANEL_CONFIG = {
+    "max_domains": 4,  # Extra domains beyond this are dropped with a warning
+    "relevant_sections": 2,  # Debater sections each expert sees beyond the opening one
+    "duplicate_threshold": 0.6  # Word-overlap (Jaccard) above which a merged sentence is dropped as a repeat
+}
+
+# Retrieval index feeding the domain expert (utils/retrieval.py)
+RETRIEVAL_CONFIG = {
+    "enabled": True,  # Used only for domains that have an index
+    "index_dir": "data/indexes",
+    "top_k": 6,
+    "chunk_words": 180,
+    "overlap_words": 30,
+    "bm25_k1": 1.2,
+    "bm25_b": 0.75,
+    "embedding_model": None  # e.g. "all-MiniLM-L6-v2" (requires sentence-transformers)
 }
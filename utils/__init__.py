@@ -1,3 +1,3 @@
-from utils.llm_factory import get_llm
+from utils.llm_factory import get_llm, route_models
 
-__all__ = ["get_llm"]
+__all__ = ["get_llm", "route_models"]
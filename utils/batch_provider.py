@@ -0,0 +1,307 @@
+"""
+Batch Provider - Submits many chat calls as one provider batch job
+
+Bulk (nightly) debates do not need low latency, so each phase's calls are compiled into
+batch jobs in the OpenAI batch format (one JSONL line per /v1/chat/completions request)
+and collected when the provider has processed them, at the provider's batch discount.
+
+Backends share one interface: submit(requests) returns a job id and poll(job_id)
+returns None while the job is pending, then {custom_id: {"content", "prompt_tokens",
+"output_tokens"} or {"error"}}.
+
+    OpenAIBatchBackend - OpenAI's Batch API (and OpenAI-compatible ones such as Groq's)
+    LocalBatchBackend  - file-based stand-in that writes and reads the same JSONL
+                         formats locally, for testing without a provider account
+    DirectBackend      - providers without a batch endpoint (Ollama, Gemini, simulated):
+                         calls are sent one by one in the background at the
+                         scheduler's "batch" priority
+"""
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from utils.llm_factory import get_llm, model_key
+from utils.scheduler import get_scheduler
+from utils.simulated_llm import synthesize_output
+from utils.tokens import count_tokens
+import config
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+# Batch job states that will not change any more
+FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchJobError(RuntimeError):
+    """Raised when a batch job ends without output (failed, expired or cancelled)."""
+
+
+def task_messages(task) -> list:
+    """Chat messages for a CrewAI task: the agent's persona as system prompt, the task as user prompt."""
+    agent = task.agent
+    return [
+        {"role": "system", "content": f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"},
+        {
+            "role": "user",
+            "content": (
+                f"{task.description}\n\nThis is the expected criteria for your final answer: {task.expected_output}\n"
+                "You MUST return the actual complete content as the final answer, not a summary."
+            )
+        }
+    ]
+
+
+def final_answer(text: str) -> str:
+    """Strip a ReAct-style "Final Answer:" preamble, as CrewAI does for crew outputs."""
+    return text.split("Final Answer:", 1)[-1].strip() if "Final Answer:" in text else text.strip()
+
+
+def batch_line(request: dict) -> dict:
+    """One request in the OpenAI batch input format."""
+    settings = request["settings"]
+    body = {
+        "model": settings["model"],
+        "messages": request["messages"],
+        "temperature": settings.get("temperature", 0.7)
+    }
+    if request.get("max_tokens"):
+        body["max_tokens"] = request["max_tokens"]
+    return {"custom_id": request["custom_id"], "method": "POST", "url": CHAT_ENDPOINT, "body": body}
+
+
+def parse_output_lines(lines) -> dict:
+    """Parse OpenAI batch output (or error) JSONL lines into per-request outcomes."""
+    outcomes = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code", 200) != 200:
+            error = entry.get("error") or response.get("body", {}).get("error") or response.get("status_code")
+            outcomes[entry["custom_id"]] = {"error": str(error)}
+            continue
+        body = response["body"]
+        usage = body.get("usage", {})
+        outcomes[entry["custom_id"]] = {
+            "content": final_answer(body["choices"][0]["message"]["content"] or ""),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0)
+        }
+    return outcomes
+
+
+def _write_jsonl(path: str, entries) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as jsonl_file:
+        for entry in entries:
+            jsonl_file.write(json.dumps(entry) + "\n")
+
+
+class OpenAIBatchBackend:
+    """
+    OpenAI Batch API client (also Groq's OpenAI-compatible batch endpoint).
+
+    Args:
+        provider: Provider name ("openai", "groq")
+        api_key: Provider API key
+        base_url: API base URL (None for OpenAI)
+        batch_dir: Directory for the uploaded input files
+    """
+
+    uses_batch_pricing = True
+
+    def __init__(self, provider: str, api_key: Optional[str], base_url: Optional[str] = None, batch_dir: Optional[str] = None):
+        try:
+            from openai import OpenAI
+        except ImportError as e:
+            raise ImportError("Batch submission requires the openai package: pip install openai") from e
+        self.provider = provider
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.batch_dir = batch_dir or config.BULK_CONFIG["batch_dir"]
+
+    def submit(self, requests: list) -> str:
+        path = os.path.join(self.batch_dir, f"{self.provider}_{uuid.uuid4().hex}.input.jsonl")
+        _write_jsonl(path, (batch_line(request) for request in requests))
+        with open(path, "rb") as input_file:
+            uploaded = self.client.files.create(file=input_file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=CHAT_ENDPOINT,
+            completion_window=config.BULK_CONFIG["completion_window"]
+        )
+        return batch.id
+
+    def poll(self, job_id: str) -> Optional[dict]:
+        batch = self.client.batches.retrieve(job_id)
+        if batch.status not in FINAL_STATES:
+            return None
+        outcomes = {}
+        # Expired and cancelled jobs still return the requests that finished
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                outcomes.update(parse_output_lines(self.client.files.content(file_id).text.splitlines()))
+        if not outcomes:
+            raise BatchJobError(f"{self.provider} batch {job_id} ended {batch.status} without output")
+        return outcomes
+
+    def cancel(self, job_id: str) -> None:
+        self.client.batches.cancel(job_id)
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for a batch provider.
+
+    submit() writes <job>.input.jsonl; once turnaround_s has passed, poll() "processes"
+    the file by writing <job>.output.jsonl with synthetic section-formatted answers (see
+    utils.simulated_llm) and token usage, then parses it like real batch output.
+
+    Args:
+        provider: Provider being stood in for (used in job ids)
+        batch_dir: Directory for the job files
+        turnaround_s: Seconds before a submitted job completes
+        output_tokens: Answer length when a request has no max_tokens
+    """
+
+    uses_batch_pricing = True
+
+    def __init__(
+        self,
+        provider: str,
+        batch_dir: Optional[str] = None,
+        turnaround_s: Optional[float] = None,
+        output_tokens: Optional[int] = None
+    ):
+        settings = config.BULK_CONFIG
+        self.provider = provider
+        self.batch_dir = batch_dir or settings["batch_dir"]
+        self.turnaround_s = settings["local_turnaround_s"] if turnaround_s is None else turnaround_s
+        self.output_tokens = output_tokens or settings["local_output_tokens"]
+
+    def _path(self, job_id: str, kind: str) -> str:
+        return os.path.join(self.batch_dir, f"{job_id}.{kind}.jsonl")
+
+    def submit(self, requests: list) -> str:
+        job_id = f"local_{self.provider}_{uuid.uuid4().hex}"
+        _write_jsonl(self._path(job_id, "input"), (batch_line(request) for request in requests))
+        return job_id
+
+    def poll(self, job_id: str) -> Optional[dict]:
+        input_path = self._path(job_id, "input")
+        output_path = self._path(job_id, "output")
+        if not os.path.exists(output_path):
+            if time.time() - os.path.getmtime(input_path) < self.turnaround_s:
+                return None
+            self._process(input_path, output_path)
+        with open(output_path, encoding="utf-8") as output_file:
+            return parse_output_lines(output_file)
+
+    def _process(self, input_path: str, output_path: str) -> None:
+        with open(input_path, encoding="utf-8") as input_file:
+            lines = [json.loads(line) for line in input_file if line.strip()]
+        outputs = []
+        for line in lines:
+            body = line["body"]
+            key = f"{self.provider}/{body['model']}"
+            tokens = min(body.get("max_tokens") or self.output_tokens, self.output_tokens)
+            content = synthesize_output(body["messages"][-1]["content"], tokens)
+            prompt_tokens = sum(count_tokens(message["content"], key) for message in body["messages"])
+            outputs.append({
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": line["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "model": body["model"],
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": count_tokens(content, key)}
+                    }
+                },
+                "error": None
+            })
+        temp_path = f"{output_path}.tmp"
+        _write_jsonl(temp_path, outputs)
+        os.replace(temp_path, output_path)
+
+    def cancel(self, job_id: str) -> None:
+        pass
+
+
+class DirectBackend:
+    """
+    Fallback for providers without a batch endpoint: sends a job's calls in the background.
+
+    Calls go through the shared scheduler at the "batch" priority class, so a bulk run
+    cannot crowd out interactive debates on the same provider.
+
+    Args:
+        tenant: Scheduler tenant the calls run under
+        concurrency: Calls in flight per job
+    """
+
+    uses_batch_pricing = False
+
+    def __init__(self, tenant: str = "default", concurrency: Optional[int] = None):
+        self.tenant = tenant
+        self.concurrency = concurrency or config.BULK_CONFIG["direct_concurrency"]
+        self._jobs = {}
+
+    def _call(self, request: dict) -> dict:
+        settings = request["settings"]
+        key = model_key(settings)
+        prompt_tokens = sum(count_tokens(message["content"], key) for message in request["messages"])
+        llm = get_llm(request["agent"], settings, max_tokens=request.get("max_tokens"))
+        scheduler = get_scheduler()
+        try:
+            if scheduler:
+                with scheduler.slot_for(settings, self.tenant, "batch", None)(prompt_tokens + (request.get("max_tokens") or 0)):
+                    content = final_answer(str(llm.call(request["messages"])))
+            else:
+                content = final_answer(str(llm.call(request["messages"])))
+        except Exception as e:
+            return {"error": str(e)}
+        return {"content": content, "prompt_tokens": prompt_tokens, "output_tokens": count_tokens(content, key)}
+
+    def submit(self, requests: list) -> str:
+        job_id = f"direct_{uuid.uuid4().hex}"
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._jobs[job_id] = (executor, [(request["custom_id"], executor.submit(self._call, request)) for request in requests])
+        executor.shutdown(wait=False)
+        return job_id
+
+    def poll(self, job_id: str) -> Optional[dict]:
+        _, futures = self._jobs[job_id]
+        if not all(future.done() for _, future in futures):
+            return None
+        del self._jobs[job_id]
+        return {custom_id: future.result() for custom_id, future in futures}
+
+    def cancel(self, job_id: str) -> None:
+        executor, _ = self._jobs.pop(job_id, (None, []))
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_batch_backend(provider: str, mode: str = "auto", tenant: str = "default"):
+    """
+    Backend for one provider's requests.
+
+    Args:
+        provider: Provider the requests target ("openai", "groq", "ollama", ...)
+        mode: "auto" (provider batch endpoints where config.BULK_CONFIG has one, direct
+            calls otherwise), "local" (file-based stand-in for every provider) or "direct"
+        tenant: Scheduler tenant for direct calls
+    """
+    if mode == "local":
+        return LocalBatchBackend(provider)
+    endpoints = config.BULK_CONFIG["batch_endpoints"]
+    if mode == "auto" and provider in endpoints:
+        api_key = {"openai": config.OPENAI_API_KEY, "groq": config.GROQ_API_KEY}.get(provider)
+        return OpenAIBatchBackend(provider, api_key, base_url=endpoints[provider])
+    return DirectBackend(tenant)
@@ -0,0 +1,358 @@
+"""
+Budget Planner - Fits a debate into a dollar and/or wall-clock budget
+
+Before a debate starts, plan_debate() estimates every call's cost and latency from
+config.MODEL_STATS (planned output caps plus the upstream outputs each prompt embeds)
+and, while the estimate is over budget, applies the cheapest degradation first:
+
+    - shrink output caps one step (PLANNER_CONFIG["output_scales"])
+    - move one agent down the config.MODEL_TIERS ladder
+    - drop an optional phase (domain expert reality check, then the Round 2 exchange)
+
+Each move is scored by how much overrun it removes per unit of quality penalty
+(PLANNER_CONFIG["move_penalty"]). During the debate, a BudgetTracker totals the actual
+spend per call and re-plans the remaining phases at every phase boundary, so an early
+phase that overruns is paid for by degrading later ones.
+"""
+import threading
+import time
+from typing import Optional
+
+import config
+from utils.context_guard import limits_key
+from utils.llm_factory import estimate_call_cost
+from utils.output_budget import DOWNSTREAM, OUTPUT_KEYS, get_output_budget
+
+PHASE_ORDER = ["initial", "response", "reality_check", "synthesis", "judgment"]
+
+# Phases the planner may drop, cheapest quality loss first
+OPTIONAL_PHASES = ["reality_check", "response"]
+
+
+def phase_calls(phase: str, experts: int = 1) -> list:
+    """(agent_name, budget phase) for every LLM call a debate phase makes (one domain expert per domain)."""
+    if phase == "initial":
+        return [("advocate", "initial"), ("critic", "initial"), ("contrarian", "initial")]
+    if phase == "response":
+        return [("advocate", "response"), ("critic", "response")]
+    if phase == "reality_check":
+        return [("domain_expert", "reality_check")] * experts
+    if phase == "synthesis":
+        return [("synthesizer", "synthesis")]
+    if config.DEBATE_CONFIG["judge_panel"]:
+        return [("judge_panel", "scorecard")] * 3 + [("judge_panel", "overview")]
+    return [("judge", "judgment")]
+
+
+def _base_cap(agent_name: str, phase: str) -> int:
+    return get_output_budget(agent_name, phase) or config.ROUTER_CONFIG["expected_tokens"]["output"]
+
+
+def _ladder_index(settings: dict) -> Optional[int]:
+    key = limits_key(settings)
+    for index, tier in enumerate(config.MODEL_TIERS):
+        if f"{tier['provider']}/{tier['model']}" == key:
+            return index
+    return None
+
+
+def _with_tier(settings: dict, tier: dict) -> dict:
+    # Simulated agents keep simulating, just a different model
+    if "simulates" in settings:
+        stats = config.MODEL_STATS.get(f"{tier['provider']}/{tier['model']}", {})
+        return dict(
+            settings,
+            simulates=tier["provider"],
+            model=tier["model"],
+            tokens_per_second=stats.get("tokens_per_second", settings.get("tokens_per_second", 100.0))
+        )
+    return dict(settings, provider=tier["provider"], model=tier["model"])
+
+
+def _input_tokens(plan: dict, agent_name: str, phase: str) -> int:
+    consumer = OUTPUT_KEYS.get((agent_name, phase), "judgment")
+    upstream = sum(
+        plan["output_caps"].get(f"{producer}:{producer_phase}", _base_cap(producer, producer_phase))
+        for (producer, producer_phase), consumers in DOWNSTREAM.items()
+        if consumer in consumers and producer_phase in plan["phases"]
+    )
+    return config.PLANNER_CONFIG["prompt_tokens"] + upstream
+
+
+def estimate_plan(plan: dict, phases: Optional[list] = None) -> dict:
+    """
+    Estimate the cost and latency of a plan's phases (all planned phases by default).
+
+    Calls within a phase run one after another, except the judge panel's and a
+    multi-domain expert panel's, which run concurrently.
+
+    Returns:
+        Dictionary with "cost_usd", "latency_s" and a "by_phase" breakdown
+    """
+    settings = config.PLANNER_CONFIG
+    by_phase = {}
+    for phase in phases if phases is not None else plan["phases"]:
+        cost, latencies = 0.0, []
+        for agent_name, budget_phase in phase_calls(phase, plan.get("domain_experts", 1)):
+            key = limits_key(plan["agent_models"][agent_name])
+            output = plan["output_caps"][f"{agent_name}:{budget_phase}"]
+            estimate = estimate_call_cost(key, _input_tokens(plan, agent_name, budget_phase), output)
+            if key not in config.MODEL_STATS:
+                estimate["latency_s"] = output / settings["default_tokens_per_second"]
+            cost += estimate["cost_usd"]
+            latencies.append(settings["call_overhead_s"] + estimate["latency_s"])
+        concurrent = (phase == "judgment" and config.DEBATE_CONFIG["judge_panel"]) or phase == "reality_check"
+        latency = max(latencies) if concurrent else sum(latencies)
+        by_phase[phase] = {"cost_usd": round(cost, 6), "latency_s": round(latency, 2)}
+
+    return {
+        "cost_usd": round(sum(p["cost_usd"] for p in by_phase.values()), 6),
+        "latency_s": round(sum(p["latency_s"] for p in by_phase.values()), 2),
+        "by_phase": by_phase
+    }
+
+
+def _apply_scale(plan: dict, phases: list) -> None:
+    scale = config.PLANNER_CONFIG["output_scales"][plan["output_scale"]]
+    for phase in phases:
+        for agent_name, budget_phase in phase_calls(phase):
+            cap = max(int(_base_cap(agent_name, budget_phase) * scale), config.BUDGET_CONFIG["min_tokens"])
+            plan["output_caps"][f"{agent_name}:{budget_phase}"] = cap
+
+
+def _moves(plan: dict, remaining: list) -> list:
+    moves = []
+    if plan["output_scale"] < len(config.PLANNER_CONFIG["output_scales"]) - 1:
+        moves.append(("shrink_outputs", None))
+    for agent_name in sorted({agent for phase in remaining for agent, _ in phase_calls(phase)}):
+        index = _ladder_index(plan["agent_models"][agent_name])
+        if index:
+            moves.append(("downgrade", agent_name))
+    for phase in OPTIONAL_PHASES:
+        if phase in remaining:
+            moves.append(("drop", phase))
+    return moves
+
+
+def _apply(plan: dict, move: tuple, remaining: list) -> dict:
+    kind, target = move
+    plan = dict(plan, agent_models=dict(plan["agent_models"]), output_caps=dict(plan["output_caps"]))
+    if kind == "shrink_outputs":
+        plan["output_scale"] += 1
+        _apply_scale(plan, remaining)
+    elif kind == "downgrade":
+        tier = config.MODEL_TIERS[_ladder_index(plan["agent_models"][target]) - 1]
+        plan["agent_models"][target] = _with_tier(plan["agent_models"][target], tier)
+    else:
+        plan["phases"] = [phase for phase in plan["phases"] if phase != target]
+    return plan
+
+
+def _penalty(move: tuple) -> float:
+    kind, target = move
+    penalties = config.PLANNER_CONFIG["move_penalty"]
+    if kind == "downgrade":
+        return penalties["downgrade"] * config.PLANNER_CONFIG["agent_weight"].get(target, 1.0)
+    if kind == "drop":
+        return penalties[f"drop_{target}"]
+    return penalties[kind]
+
+
+def _overrun(estimate: dict, max_cost_usd: Optional[float], max_latency_s: Optional[float]) -> float:
+    # Relative amount by which an estimate exceeds the budgets (less planning headroom)
+    target = 1.0 - config.PLANNER_CONFIG["headroom"]
+    overrun = 0.0
+    if max_cost_usd is not None:
+        overrun += max(0.0, estimate["cost_usd"] / max(max_cost_usd * target, 1e-9) - 1.0)
+    if max_latency_s is not None:
+        overrun += max(0.0, estimate["latency_s"] / max(max_latency_s * target, 1e-9) - 1.0)
+    return overrun
+
+
+def plan_debate(
+    agent_models: dict,
+    max_cost_usd: Optional[float] = None,
+    max_latency_s: Optional[float] = None,
+    base_plan: Optional[dict] = None,
+    remaining: Optional[list] = None,
+    domain_experts: int = 1
+) -> dict:
+    """
+    Choose the debate shape, a model per agent and output caps that fit the budgets.
+
+    Args:
+        agent_models: Per-agent model settings to start from (each agent's ceiling)
+        max_cost_usd: Dollar budget for the phases being planned (None = unlimited)
+        max_latency_s: Wall-clock budget in seconds for the phases being planned (None = unlimited)
+        base_plan: Existing plan to re-plan from (keeps its choices for completed phases)
+        remaining: Phases still to run when re-planning (default: every planned phase)
+        domain_experts: Domain experts in the reality check (one per domain)
+
+    Returns:
+        Plan dict with "phases", "agent_models", "output_caps", "output_scale", the
+        "estimate" for the planned phases, the degradation "moves" taken and "feasible"
+    """
+    if base_plan is None:
+        phases = [phase for phase in PHASE_ORDER
+                  if (phase != "reality_check" or config.DEBATE_CONFIG["enable_domain_expert"])
+                  and (phase != "response" or config.DEBATE_CONFIG["max_rounds"] >= 2)]
+        plan = {
+            "phases": phases,
+            "agent_models": dict(agent_models),
+            "output_caps": {},
+            "output_scale": 0,
+            "domain_experts": domain_experts
+        }
+        _apply_scale(plan, phases)
+    else:
+        plan = dict(base_plan, moves=[])
+    remaining = list(remaining if remaining is not None else plan["phases"])
+
+    moves = []
+    estimate = estimate_plan(plan, remaining)
+    overrun = _overrun(estimate, max_cost_usd, max_latency_s)
+
+    while overrun > 0:
+        best = None
+        for move in _moves(plan, remaining):
+            candidate = _apply(plan, move, remaining)
+            candidate_remaining = [phase for phase in remaining if phase in candidate["phases"]]
+            candidate_estimate = estimate_plan(candidate, candidate_remaining)
+            gain = (overrun - _overrun(candidate_estimate, max_cost_usd, max_latency_s)) / _penalty(move)
+            if gain > 0 and (best is None or gain > best[0]):
+                best = (gain, move, candidate, candidate_remaining, candidate_estimate)
+        if best is None:
+            break
+        _, move, plan, remaining, estimate = best
+        moves.append(f"{move[0]}:{move[1]}" if move[1] else move[0])
+        overrun = _overrun(estimate, max_cost_usd, max_latency_s)
+
+    plan["estimate"] = estimate
+    plan["moves"] = moves
+    plan["feasible"] = overrun <= 0
+    return plan
+
+
+class BudgetTracker:
+    """
+    Enforces a debate budget: InstrumentedLLM listener for actual spend, plus re-planning
+    of the remaining phases at each phase boundary.
+
+    Args:
+        agent_models: Per-agent model settings to plan from
+        max_cost_usd: Dollar budget for the whole debate (None = unlimited)
+        max_latency_s: Wall-clock budget for the whole debate in seconds (None = unlimited)
+        started_at: Debate start time (time.time())
+        domain_experts: Domain experts in the reality check (one per domain)
+    """
+
+    def __init__(
+        self,
+        agent_models: dict,
+        max_cost_usd: Optional[float] = None,
+        max_latency_s: Optional[float] = None,
+        started_at: Optional[float] = None,
+        domain_experts: int = 1
+    ):
+        self.max_cost_usd = max_cost_usd
+        self.max_latency_s = max_latency_s
+        self.started_at = started_at or time.time()
+        self.plan = plan_debate(agent_models, max_cost_usd, max_latency_s, domain_experts=domain_experts)
+        self.initial_plan = self.plan
+        self.replans = []
+        self.spent_usd = 0.0
+        self.spent_by_phase = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, record: dict) -> None:
+        # Agents the plan does not cover (e.g. the judge panel) are priced at their configured model
+        settings = self.plan["agent_models"].get(record["agent"]) or config.AGENT_MODELS.get(record["agent"])
+        key = limits_key(settings) if settings else record["model"]
+        cost = estimate_call_cost(key, record["prompt_tokens"], record.get("output_tokens", 0))["cost_usd"]
+        phase = "judgment" if record["agent"] in ("judge", "judge_panel") else record["phase"]
+        # Concurrent phases report calls from several worker threads
+        with self._lock:
+            self.spent_usd += cost
+            self.spent_by_phase[phase] = self.spent_by_phase.get(phase, 0.0) + cost
+
+    def planned(self, phase: str) -> bool:
+        return phase in self.plan["phases"]
+
+    def output_cap(self, agent_name: str, phase: str) -> Optional[int]:
+        return self.plan["output_caps"].get(f"{agent_name}:{phase}")
+
+    def checkpoint(self, completed: list) -> bool:
+        """
+        Re-plan the phases not yet run against what is left of the budget.
+
+        Args:
+            completed: Phases already finished
+
+        Returns:
+            True when the plan changed
+        """
+        remaining = [phase for phase in self.plan["phases"] if phase not in completed]
+        cost_left = None if self.max_cost_usd is None else self.max_cost_usd - self.spent_usd
+        time_left = None if self.max_latency_s is None else self.max_latency_s - (time.time() - self.started_at)
+
+        estimate = estimate_plan(self.plan, remaining)
+        over_cost = cost_left is not None and estimate["cost_usd"] > cost_left
+        over_time = time_left is not None and estimate["latency_s"] > time_left
+        if not (over_cost or over_time):
+            return False
+
+        plan = plan_debate(
+            self.plan["agent_models"],
+            None if cost_left is None else max(cost_left, 0.0),
+            None if time_left is None else max(time_left, 0.0),
+            base_plan=self.plan,
+            remaining=remaining
+        )
+        if not plan["moves"]:
+            # Nothing left to cut; the remaining phases run as planned
+            return False
+        self.replans.append({
+            "before_phase": remaining[0] if remaining else None,
+            "spent_usd": round(self.spent_usd, 6),
+            "elapsed_s": round(time.time() - self.started_at, 2),
+            "moves": plan["moves"],
+            "feasible": plan["feasible"]
+        })
+        self.plan = plan
+        return True
+
+    def report(self, timings: dict) -> dict:
+        """Planned vs. actual cost and latency, for results["budget"]."""
+        elapsed = time.time() - self.started_at
+        initial = self.initial_plan
+        return {
+            "limits": {"cost_usd": self.max_cost_usd, "latency_s": self.max_latency_s},
+            "planned": {
+                "cost_usd": initial["estimate"]["cost_usd"],
+                "latency_s": initial["estimate"]["latency_s"],
+                "by_phase": initial["estimate"]["by_phase"],
+                "phases": initial["phases"],
+                "models": {name: limits_key(settings) for name, settings in initial["agent_models"].items()},
+                "output_caps": initial["output_caps"],
+                "moves": initial["moves"],
+                "feasible": initial["feasible"]
+            },
+            "actual": {
+                "cost_usd": round(self.spent_usd, 6),
+                "latency_s": round(elapsed, 2),
+                "by_phase": {
+                    phase: {
+                        "cost_usd": round(self.spent_by_phase.get(phase, 0.0), 6),
+                        "latency_s": timings.get(phase)
+                    }
+                    for phase in PHASE_ORDER if phase in timings
+                },
+                "phases": [phase for phase in PHASE_ORDER if phase in timings],
+                "models": {name: limits_key(settings) for name, settings in self.plan["agent_models"].items()}
+            },
+            "replans": self.replans,
+            "within_budget": {
+                "cost": self.max_cost_usd is None or self.spent_usd <= self.max_cost_usd,
+                "latency": self.max_latency_s is None or elapsed <= self.max_latency_s
+            }
+        }
@@ -0,0 +1,73 @@
+"""
+Cancellation - Cooperative cancellation of in-flight debates
+
+A CancelToken is passed into run_debate and checked between phases and around every
+LLM call. LLMs that take the token themselves end their provider call on cancellation;
+other calls run on a worker thread while the caller waits on the token, so a cancelled
+debate stops waiting immediately instead of finishing phases nobody will read.
+"""
+import contextvars
+import threading
+from typing import Callable, Optional
+
+# How often a waiting call re-checks its token (seconds)
+POLL_INTERVAL = 0.05
+
+
+class DebateCancelled(Exception):
+    """Raised inside a debate once its cancel token has been triggered."""
+
+
+class CancelToken:
+    """Thread-safe flag shared by the code that starts a debate and the debate itself."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Request cancellation; the debate stops at its next check."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise DebateCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise DebateCancelled(self.reason)
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning early (True) when cancelled."""
+        return self._event.wait(timeout)
+
+    def run(self, func: Callable, *args, **kwargs):
+        """
+        Run func on a worker thread and return its result, or raise DebateCancelled as
+        soon as the token is cancelled. A cancelled call's result is discarded.
+        """
+        self.raise_if_cancelled()
+
+        outcome = {}
+        done = threading.Event()
+        context = contextvars.copy_context()
+
+        def worker():
+            try:
+                outcome["result"] = context.run(func, *args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=worker, daemon=True).start()
+
+        while not done.wait(POLL_INTERVAL):
+            self.raise_if_cancelled()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
@@ -0,0 +1,178 @@
+"""
+Context Guard - Pre-flight token checks that keep every prompt inside its model's limits
+
+Prompts are counted locally (utils.tokens.count_tokens) before they are sent. A prompt
+that would not fit the model's context window (or the provider's per-request token cap)
+together with its output budget is degraded one level at a time:
+
+    0 full                     - prompt as written
+    1 drop_redundant_sections  - drop Round 1 sections later rounds supersede
+    2 summarize_older_rounds   - reduce outputs from earlier rounds to their key sentences
+    3 summarize_all_rounds     - reduce every embedded output to its key sentences
+    4 truncate                 - additionally cap each embedded output's length
+
+If even the last level does not fit, ContextBudgetError is raised instead of sending a
+call that is known to fail. Summaries are extractive and local, so degrading costs no
+extra LLM calls.
+"""
+import re
+import threading
+from typing import Callable, Optional
+
+import config
+from utils.sections import parse_sections
+from utils.tokens import count_tokens
+
+DEGRADATION_LEVELS = (
+    "full",
+    "drop_redundant_sections",
+    "summarize_older_rounds",
+    "summarize_all_rounds",
+    "truncate"
+)
+
+# Round 1 sections whose content the Round 2 exchange restates or answers
+REDUNDANT_SECTIONS = {
+    "advocate": {"ANTICIPATED OBJECTIONS", "CALL TO ACTION"},
+    "critic": {"BURDEN OF PROOF"},
+    "contrarian": {"UNEXPLORED QUESTIONS"}
+}
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class ContextBudgetError(RuntimeError):
+    """Raised when a prompt cannot fit its model's limits even fully degraded."""
+
+
+def limits_key(agent_config: dict) -> str:
+    """MODEL_STATS key whose limits apply; simulated models use the provider they simulate."""
+    return f"{agent_config.get('simulates', agent_config['provider'])}/{agent_config['model']}"
+
+
+def context_limit(agent_config: dict) -> int:
+    """Largest prompt + output token count one call to this model may use."""
+    stats = config.MODEL_STATS.get(limits_key(agent_config), {})
+    limit = stats.get("context_window", config.CONTEXT_GUARD_CONFIG["default_context_window"])
+    if stats.get("request_token_limit"):
+        limit = min(limit, stats["request_token_limit"])
+    return limit
+
+
+def drop_redundant_sections(text: str, agent_name: str) -> str:
+    """Remove the agent's redundant numbered sections, keeping everything else verbatim."""
+    redundant = REDUNDANT_SECTIONS.get(agent_name)
+    sections = parse_sections(text)
+    if not redundant or not sections:
+        return text
+
+    kept = [s for s in sections if s["title"] not in redundant]
+    if len(kept) == len(sections):
+        return text
+    return "\n\n".join(f"({s['number']}) {s['title']}: {s['body']}" for s in kept)
+
+
+def summarize_text(text: str, sentences: int = 2) -> str:
+    """Extractive summary: the first sentences of each numbered section (or of the whole text)."""
+    sections = parse_sections(text)
+    if not sections:
+        return " ".join(SENTENCE_END.split(" ".join(text.split()))[:sentences * 2])
+
+    return "\n".join(
+        f"({s['number']}) {s['title']}: " + " ".join(SENTENCE_END.split(" ".join(s["body"].split()))[:sentences])
+        for s in sections
+    )
+
+
+def condense(text: str, agent_name: str, level: int, older: bool = False) -> str:
+    """
+    Degrade one embedded agent output to the given level.
+
+    Args:
+        text: The agent output
+        agent_name: Agent that wrote it (selects its redundant sections)
+        level: Index into DEGRADATION_LEVELS
+        older: Whether the output comes from an earlier round than the newest one in the prompt
+
+    Returns:
+        The (possibly) shortened output
+    """
+    if not text or level == 0:
+        return text
+
+    text = drop_redundant_sections(text, agent_name)
+    if level >= 3 or (level >= 2 and older):
+        text = summarize_text(text)
+    if level >= 4:
+        limit = config.CONTEXT_GUARD_CONFIG["truncate_chars"]
+        if len(text) > limit:
+            text = text[:limit].rsplit(" ", 1)[0] + " [...]"
+    return text
+
+
+def fit_context(
+    build: Callable[[int], str],
+    agent,
+    agent_name: str,
+    agent_config: dict,
+    max_output: Optional[int] = None
+) -> tuple:
+    """
+    Build the transcript context of a task prompt at the least degraded level that fits the model.
+
+    Task instructions around the context are covered by prompt_overhead_tokens; the exact
+    prompt is checked again at call time by InstrumentedLLM.
+
+    Args:
+        build: Callable(level) returning the context at that degradation level
+        agent: The CrewAI agent that will run the task (its role/goal/backstory count too)
+        agent_name: Agent name used for the report
+        agent_config: The agent's model settings
+        max_output: Output token budget reserved for the response
+
+    Returns:
+        (context, report) where report has preflight_tokens, limit and degradation
+
+    Raises:
+        ContextBudgetError: If no level fits
+    """
+    key = limits_key(agent_config)
+    limit = context_limit(agent_config)
+    fixed = count_tokens(" ".join([agent.role, agent.goal, agent.backstory]), key)
+    reserved = config.CONTEXT_GUARD_CONFIG["prompt_overhead_tokens"] + (max_output or 0)
+
+    if not config.CONTEXT_GUARD_CONFIG["enabled"]:
+        context = build(0)
+        return context, {
+            "preflight_tokens": fixed + count_tokens(context, key),
+            "limit": limit,
+            "degradation": DEGRADATION_LEVELS[0]
+        }
+
+    for level, name in enumerate(DEGRADATION_LEVELS):
+        context = build(level)
+        prompt_tokens = fixed + count_tokens(context, key)
+        if prompt_tokens + reserved <= limit:
+            return context, {"preflight_tokens": prompt_tokens, "limit": limit, "degradation": name}
+
+    raise ContextBudgetError(
+        f"{agent_name} needs {prompt_tokens + reserved} tokens but {key} allows {limit}, even fully degraded"
+    )
+
+
+class TokenLedger:
+    """InstrumentedLLM listener that totals counted tokens per agent and phase."""
+
+    def __init__(self):
+        self.usage = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, record: dict) -> None:
+        key = f"{record['agent']}:{record['phase']}"
+        with self._lock:
+            entry = self.usage.setdefault(key, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0})
+            entry["calls"] += 1
+            entry["prompt_tokens"] += record["prompt_tokens"]
+            entry["output_tokens"] += record.get("output_tokens", 0)
+            if "queue_wait_s" in record:
+                entry["queue_wait_s"] = round(entry.get("queue_wait_s", 0.0) + record["queue_wait_s"], 4)
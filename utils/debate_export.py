@@ -0,0 +1,259 @@
+"""
+Debate Export - Stores debate results and exports them as partitioned Parquet/Arrow
+
+Debates are saved one JSON file each under the library directory. The exporter streams
+them into a columnar dataset partitioned by date and domain, with one row per agent
+output (parsed sections, token counts and phase timings). Exports are append-only and
+incremental: a manifest records exported debate ids, so each run only writes new debates.
+
+Requires pyarrow (optional dependency): pip install pyarrow
+
+Usage:
+    python -m utils.debate_export [library_dir] [export_dir] [--format parquet|arrow]
+"""
+import argparse
+import json
+import os
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+import config
+from utils.sections import parse_sections, section_completeness
+from utils.tokens import estimate_tokens
+
+# Result key of each agent output -> (agent, phase)
+OUTPUT_AGENTS = {
+    "advocate": ("advocate", "initial"),
+    "critic": ("critic", "initial"),
+    "contrarian": ("contrarian", "initial"),
+    "advocate_response": ("advocate", "response"),
+    "critic_response": ("critic", "response"),
+    "domain_expert": ("domain_expert", "reality_check"),
+    "synthesis": ("synthesizer", "synthesis"),
+    "judgment": ("judge", "judgment")
+}
+
+MANIFEST_NAME = "_exported.json"
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (value or "unknown").lower()).strip("-") or "unknown"
+
+
+def save_debate(results: dict, library_dir: Optional[str] = None) -> str:
+    """
+    Store a debate's results in the library as <library_dir>/<date>/<debate_id>.json.
+
+    Returns:
+        Path of the written file
+    """
+    library_dir = library_dir or config.LIBRARY_CONFIG["library_dir"]
+    debate_id = results.get("debate_id") or uuid.uuid4().hex
+    started_at = results.get("started_at", time.time())
+    date = datetime.fromtimestamp(started_at, tz=timezone.utc).strftime("%Y-%m-%d")
+
+    directory = os.path.join(library_dir, date)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{debate_id}.json")
+
+    with open(path, "w", encoding="utf-8") as debate_file:
+        json.dump(dict(results, debate_id=debate_id, started_at=started_at), debate_file)
+
+    return path
+
+
+def iter_debate_files(library_dir: str, skip_ids: Optional[set] = None) -> Iterator[tuple]:
+    """Yield (debate_id, path) for stored debates not in skip_ids, oldest date first."""
+    skip_ids = skip_ids or set()
+    if not os.path.isdir(library_dir):
+        return
+
+    for date in sorted(os.listdir(library_dir)):
+        directory = os.path.join(library_dir, date)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            debate_id, ext = os.path.splitext(name)
+            if ext == ".json" and debate_id not in skip_ids:
+                yield debate_id, os.path.join(directory, name)
+
+
+def debate_rows(results: dict) -> list:
+    """
+    Flatten one debate into rows, one per agent output.
+
+    Returns:
+        List of row dicts matching export_schema()
+    """
+    started_at = results.get("started_at", 0.0)
+    base = {
+        "debate_id": results.get("debate_id", ""),
+        "date": datetime.fromtimestamp(started_at, tz=timezone.utc).strftime("%Y-%m-%d"),
+        "domain": _slug(results.get("domain", "")),
+        "started_at": float(started_at),
+        "question": results.get("question", ""),
+        "mode": results.get("mode", "debate")
+    }
+    models = results.get("models", {})
+    # Debates saved before per-phase models were recorded only have the router's choice
+    routed = results.get("routing", {}).get("models", {})
+    timings = results.get("timings", {})
+
+    outputs = []
+    for round_data in results.get("rounds", []):
+        for key, value in round_data.items():
+            if key in OUTPUT_AGENTS and isinstance(value, str):
+                outputs.append((round_data.get("round", 0), key, value, None))
+        for option, case in round_data.get("advocates", {}).items():
+            outputs.append((round_data.get("round", 0), "advocate", case, option))
+    for key in ("synthesis", "judgment"):
+        if results.get(key):
+            outputs.append((None, key, results[key], None))
+
+    rows = []
+    for round_number, key, text, option in outputs:
+        agent_name, phase = OUTPUT_AGENTS[key]
+        sections = parse_sections(text)
+        rows.append(dict(
+            base,
+            round=round_number,
+            phase=phase,
+            agent=agent_name,
+            option=option,
+            model=models.get(f"{agent_name}:{phase}") or routed.get(agent_name),
+            text=text,
+            output_tokens=estimate_tokens(text),
+            phase_latency_s=timings.get(phase),
+            section_count=len(sections),
+            completeness=section_completeness(text, agent_name, phase),
+            sections=[{"number": s["number"], "title": s["title"], "body": s["body"]} for s in sections]
+        ))
+
+    return rows
+
+
+def export_schema():
+    """Arrow schema of the exported dataset."""
+    import pyarrow as pa
+
+    section = pa.struct([("number", pa.int32()), ("title", pa.string()), ("body", pa.string())])
+    return pa.schema([
+        ("debate_id", pa.string()),
+        ("date", pa.string()),
+        ("domain", pa.string()),
+        ("started_at", pa.float64()),
+        ("question", pa.string()),
+        ("mode", pa.string()),
+        ("round", pa.int32()),
+        ("phase", pa.string()),
+        ("agent", pa.string()),
+        ("option", pa.string()),
+        ("model", pa.string()),
+        ("text", pa.string()),
+        ("output_tokens", pa.int32()),
+        ("phase_latency_s", pa.float64()),
+        ("section_count", pa.int32()),
+        ("completeness", pa.float64()),
+        ("sections", pa.list_(section))
+    ])
+
+
+def _load_manifest(export_dir: str) -> set:
+    path = os.path.join(export_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as manifest_file:
+        return set(json.load(manifest_file))
+
+
+def _save_manifest(export_dir: str, exported: set) -> None:
+    path = os.path.join(export_dir, MANIFEST_NAME)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(sorted(exported), manifest_file)
+    os.replace(temp_path, path)
+
+
+def export_library(
+    library_dir: Optional[str] = None,
+    export_dir: Optional[str] = None,
+    file_format: str = "parquet",
+    batch_size: int = 500
+) -> dict:
+    """
+    Incrementally export stored debates to a dataset partitioned by date and domain.
+
+    Args:
+        library_dir: Directory of stored debate JSON files
+        export_dir: Root of the partitioned dataset (date=.../domain=.../part-*.parquet)
+        file_format: "parquet" or "arrow" (Arrow IPC / Feather v2)
+        batch_size: Debates buffered in memory per written batch
+
+    Returns:
+        Dictionary with the number of debates and rows exported in this run
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Debate export requires pyarrow: pip install pyarrow") from e
+
+    library_dir = library_dir or config.LIBRARY_CONFIG["library_dir"]
+    export_dir = export_dir or config.LIBRARY_CONFIG["export_dir"]
+    os.makedirs(export_dir, exist_ok=True)
+
+    schema = export_schema()
+    partitioning = ds.partitioning(pa.schema([("date", pa.string()), ("domain", pa.string())]), flavor="hive")
+    exported = _load_manifest(export_dir)
+    run_id = uuid.uuid4().hex[:12]
+    totals = {"debates": 0, "rows": 0}
+
+    def flush(rows: list, debate_ids: list, batch_number: int) -> None:
+        if rows:
+            ds.write_dataset(
+                pa.Table.from_pylist(rows, schema=schema),
+                export_dir,
+                format="ipc" if file_format == "arrow" else "parquet",
+                partitioning=partitioning,
+                basename_template=f"part-{run_id}-{batch_number}-{{i}}.{file_format}",
+                existing_data_behavior="overwrite_or_ignore"
+            )
+        # Only mark debates exported once their rows are safely on disk
+        exported.update(debate_ids)
+        _save_manifest(export_dir, exported)
+        totals["debates"] += len(debate_ids)
+        totals["rows"] += len(rows)
+
+    rows, debate_ids, batch_number = [], [], 0
+    for debate_id, path in iter_debate_files(library_dir, skip_ids=exported):
+        with open(path, encoding="utf-8") as debate_file:
+            rows.extend(debate_rows(json.load(debate_file)))
+        debate_ids.append(debate_id)
+
+        if len(debate_ids) >= batch_size:
+            flush(rows, debate_ids, batch_number)
+            rows, debate_ids, batch_number = [], [], batch_number + 1
+
+    if debate_ids:
+        flush(rows, debate_ids, batch_number)
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored debates to partitioned Parquet/Arrow")
+    parser.add_argument("library_dir", nargs="?", default=config.LIBRARY_CONFIG["library_dir"])
+    parser.add_argument("export_dir", nargs="?", default=config.LIBRARY_CONFIG["export_dir"])
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    totals = export_library(args.library_dir, args.export_dir, args.format, args.batch_size)
+    print(f"Exported {totals['debates']} new debates ({totals['rows']} rows) to {args.export_dir}")
+
+
+if __name__ == "__main__":
+    main()
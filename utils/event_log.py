@@ -0,0 +1,134 @@
+"""
+Event Log - Non-blocking structured debate events written as rotating JSONL
+
+Debate code emits events (debate/phase starts, agent outputs with token counts, LLM
+calls, errors) through a logging.QueueHandler. A single QueueListener thread formats
+them as JSON lines and writes them to a size-rotated file, so worker threads never
+block on disk or console I/O. Events below WARNING are sampled per debate, keeping
+every sampled debate complete; warnings and errors are always kept.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import zlib
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+import config
+
+LOGGER_NAME = "mad.events"
+
+_setup_lock = threading.Lock()
+_configured = False
+_listener: Optional[QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats an event record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "event": getattr(record, "event", record.getMessage())
+        }
+        event.update(getattr(record, "fields", {}))
+        return json.dumps(event, default=str)
+
+
+class DebateSampler(logging.Filter):
+    """Keeps all events of a sampled fraction of debates, plus every WARNING or worse."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        debate_id = getattr(record, "fields", {}).get("debate_id", "")
+        return zlib.crc32(debate_id.encode()) / 0xFFFFFFFF < self.rate
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+def get_event_logger() -> logging.Logger:
+    """
+    The event logger, configured on first use from config.EVENT_LOG_CONFIG.
+
+    Returns:
+        A logger that never propagates to the root (console) handlers
+    """
+    global _configured, _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _configured:
+        return logger
+
+    with _setup_lock:
+        if _configured:
+            return logger
+        _configured = True
+
+        settings = config.EVENT_LOG_CONFIG
+        logger.propagate = False
+        if not settings["enabled"]:
+            logger.disabled = True
+            return logger
+
+        os.makedirs(os.path.dirname(settings["path"]) or ".", exist_ok=True)
+        file_handler = RotatingFileHandler(
+            settings["path"],
+            maxBytes=settings["max_bytes"],
+            backupCount=settings["backup_count"],
+            encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        events = queue.SimpleQueue()
+        handler = QueueHandler(events)
+        handler.addFilter(DebateSampler(settings["debate_sample_rate"]))
+        logger.addHandler(handler)
+        logger.setLevel(settings["level"])
+
+        _listener = QueueListener(events, file_handler)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+    return logger
+
+
+def log_event(event: str, level: int = logging.INFO, **fields) -> None:
+    """
+    Emit one structured event (a no-op below the configured level).
+
+    Args:
+        event: Event name, e.g. "agent_output"
+        level: logging level
+        **fields: JSON-serializable event fields (include debate_id for sampling)
+    """
+    logger = get_event_logger()
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"event": event, "fields": fields})
+
+
+class EventLogListener:
+    """InstrumentedLLM listener that logs every LLM call of one debate."""
+
+    def __init__(self, debate_id: str):
+        self.debate_id = debate_id
+
+    def record_call(self, record: dict) -> None:
+        fields = {key: value for key, value in record.items() if key != "started_at"}
+        if "error" in record:
+            log_event("llm_error", logging.ERROR, debate_id=self.debate_id, **fields)
+        else:
+            log_event("llm_call", logging.DEBUG, debate_id=self.debate_id, **fields)
+
@@ -0,0 +1,114 @@
+"""
+Instrumented LLM - Wraps a CrewAI LLM and reports every call to listeners
+
+Each call is reported as a dict with the agent, debate phase, model, prompt/output
+token counts, latency and start time. Listeners are plain callables, so tracing
+and other per-call bookkeeping can be layered on without touching the agents.
+Given a context limit, the prompt is checked before it is sent and calls that could
+not fit are refused with ContextBudgetError. Given a cancel token, calls stop as soon
+as the debate is cancelled: LLMs that take the token themselves (streaming and
+simulated ones) end their provider call, others are only no longer waited for.
+Given a slot factory (e.g. from utils.scheduler), each call holds a provider slot
+while it runs.
+"""
+import time
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Optional
+
+from crewai.llms.base_llm import BaseLLM
+
+from utils.cancellation import CancelToken
+from utils.context_guard import ContextBudgetError
+from utils.tokens import count_tokens
+
+
+def _prompt_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(message.get("content", "")) for message in messages or [])
+
+
+class InstrumentedLLM(BaseLLM):
+    """CrewAI-compatible LLM that delegates to another LLM and reports each call."""
+
+    def __init__(
+        self,
+        inner: BaseLLM,
+        agent_name: str,
+        phase: str,
+        listeners: Optional[list] = None,
+        model: Optional[str] = None,
+        context_limit: Optional[int] = None,
+        max_output: Optional[int] = None,
+        cancel_token: Optional[CancelToken] = None,
+        slot: Optional[Callable[[float], ContextManager]] = None
+    ):
+        super().__init__(model=model or inner.model, temperature=getattr(inner, "temperature", None))
+        self.inner = inner
+        self.agent_name = agent_name
+        self.phase = phase
+        self.listeners: list[Callable[[dict], None]] = list(listeners or [])
+        self.context_limit = context_limit
+        self.max_output = max_output
+        self.cancel_token = cancel_token
+        self.slot = slot
+        # Streaming and simulated LLMs end their provider call when the debate is cancelled
+        if cancel_token and hasattr(inner, "cancel_token"):
+            inner.cancel_token = cancel_token
+
+    def call(self, messages, *args, **kwargs):
+        # CrewAI sets stop words on the LLM it was given; keep the wrapped LLM in sync
+        if getattr(self, "stop", None):
+            self.inner.stop = self.stop
+
+        record = {
+            "agent": self.agent_name,
+            "phase": self.phase,
+            "model": self.model,
+            "prompt_tokens": count_tokens(_prompt_text(messages), self.model),
+            "started_at": time.time()
+        }
+        started = time.perf_counter()
+
+        timing = {}
+        try:
+            needed = record["prompt_tokens"] + (self.max_output or 0)
+            if self.context_limit and needed > self.context_limit:
+                raise ContextBudgetError(
+                    f"{self.agent_name} {self.phase} call needs {needed} tokens but {self.model} allows {self.context_limit}"
+                )
+            if self.cancel_token and not hasattr(self.inner, "cancel_token"):
+                # The worker holds the slot, so an abandoned call keeps it until it really ends
+                response = self.cancel_token.run(self._call_in_slot, needed, timing, messages, *args, **kwargs)
+            else:
+                response = self._call_in_slot(needed, timing, messages, *args, **kwargs)
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        else:
+            record["output_tokens"] = count_tokens(str(response), self.model)
+            return response
+        finally:
+            if self.slot and "granted" in timing:
+                # Time spent queued for a provider slot is reported apart from call latency
+                queued = timing["granted"] - started
+                record["queue_wait_s"] = round(queued, 4)
+                record["started_at"] += queued
+                started += queued
+            record["latency_s"] = round(time.perf_counter() - started, 4)
+            for listener in self.listeners:
+                listener(record)
+
+    def _call_in_slot(self, needed: int, timing: dict, messages, *args, **kwargs):
+        with self.slot(needed) if self.slot else nullcontext():
+            timing["granted"] = time.perf_counter()
+            return self.inner.call(messages, *args, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
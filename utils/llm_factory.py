@@ -1,13 +1,45 @@
 """
 LLM Factory - Creates LLM instances for CrewAI v1.x
 Uses CrewAI's native LLM class with LiteLLM model strings
-Supports: OpenAI, Google Gemini, Groq, Ollama
+Supports: OpenAI, Google Gemini, Groq, Ollama (plus an offline "simulated" provider)
+Cancellable debates get StreamingLLM instances instead, which call LiteLLM directly
+
+Also hosts the complexity-aware model router, which picks a tier from
+config.MODEL_TIERS per agent based on cheap local heuristics over the question.
 """
+import json
+import os
+import re
+import time
+from typing import Optional
+
 from crewai import LLM
+from utils.context_guard import context_limit
+from utils.simulated_llm import SimulatedLLM
+from utils.streaming_llm import StreamingLLM
 import config
 
 
-def get_llm(agent_name: str) -> LLM:
+# LiteLLM model-string prefix per provider
+LITELLM_PREFIXES = {"openai": "openai", "google": "gemini", "groq": "groq", "ollama": "ollama"}
+
+
+def _credentials(provider: str) -> dict:
+    if provider == "ollama":
+        return {"base_url": config.OLLAMA_BASE_URL}
+    return {"api_key": {
+        "openai": config.OPENAI_API_KEY,
+        "google": config.GOOGLE_API_KEY,
+        "groq": config.GROQ_API_KEY
+    }[provider]}
+
+
+def get_llm(
+    agent_name: str,
+    agent_config: Optional[dict] = None,
+    max_tokens: Optional[int] = None,
+    streaming: bool = False
+) -> LLM:
     """
     Get the appropriate LLM instance for an agent based on configuration.
 
@@ -19,11 +51,15 @@ def get_llm(agent_name: str) -> LLM:
 
     Args:
         agent_name: Name of the agent (advocate, critic, contrarian, domain_expert, synthesizer, judge)
+        agent_config: Optional model settings overriding config.AGENT_MODELS (e.g. from route_models)
+        max_tokens: Optional cap on output tokens (see utils.output_budget)
+        streaming: Return a StreamingLLM, whose calls stop generating when a cancel
+            token fires, instead of CrewAI's LLM (see utils.streaming_llm)
 
     Returns:
         CrewAI LLM instance configured for the agent
     """
-    agent_config = config.AGENT_MODELS.get(agent_name)
+    agent_config = agent_config or config.AGENT_MODELS.get(agent_name)
 
     if not agent_config:
         raise ValueError(f"Unknown agent: {agent_name}")
@@ -32,41 +68,210 @@ def get_llm(agent_name: str) -> LLM:
     model = agent_config["model"]
     temperature = agent_config.get("temperature", 0.7)
 
-    # Build LiteLLM model string based on provider
-    if provider == "openai":
-        model_string = f"openai/{model}"
-        return LLM(
-            model=model_string,
+    if provider == "simulated":
+        # Offline stand-in for load replays and benchmarks (see utils.simulated_llm)
+        return SimulatedLLM(
+            model=model,
+            provider_name=agent_config.get("simulates", "simulated"),
+            profiles=agent_config.get("profiles"),
+            output_tokens=agent_config.get("output_tokens", 600),
+            tokens_per_second=agent_config.get("tokens_per_second", 100.0),
+            simulator=agent_config.get("simulator"),
+            max_tokens=max_tokens,
             temperature=temperature,
-            api_key=config.OPENAI_API_KEY
+            truncate=agent_config.get("truncate", False)
         )
 
-    elif provider == "google":
-        model_string = f"gemini/{model}"
-        return LLM(
-            model=model_string,
-            temperature=temperature,
-            api_key=config.GOOGLE_API_KEY
-        )
+    if provider not in LITELLM_PREFIXES:
+        raise ValueError(f"Unknown provider: {provider}")
 
-    elif provider == "groq":
-        model_string = f"groq/{model}"
-        return LLM(
+    # Build LiteLLM model string based on provider
+    model_string = f"{LITELLM_PREFIXES[provider]}/{model}"
+    if streaming:
+        return StreamingLLM(
             model=model_string,
             temperature=temperature,
-            api_key=config.GROQ_API_KEY
+            max_tokens=max_tokens,
+            context_window=context_limit(agent_config),
+            **_credentials(provider)
         )
+    return LLM(
+        model=model_string,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **_credentials(provider)
+    )
 
-    elif provider == "ollama":
-        model_string = f"ollama/{model}"
-        return LLM(
-            model=model_string,
-            temperature=temperature,
-            base_url=config.OLLAMA_BASE_URL
-        )
 
-    else:
-        raise ValueError(f"Unknown provider: {provider}")
+# ============================================
+# COMPLEXITY-AWARE MODEL ROUTING
+# ============================================
+
+CONSTRAINT_WORDS = (
+    "given", "must", "within", "budget", "deadline", "constraint", "without",
+    "while", "unless", "only if", "runway", "headcount", "quarter", "months", "years"
+)
+
+
+def score_question(question: str, domain: str = "general business strategy") -> dict:
+    """
+    Score a question's complexity and stakes with cheap local heuristics.
+
+    Args:
+        question: The strategic question to debate
+        domain: Domain context for the debate
+
+    Returns:
+        Dictionary with "complexity", "stakes" and combined "score", each in [0, 1]
+    """
+    text = question.lower()
+    words = len(text.split())
+    numbers = len(re.findall(r"[$€£]?\d[\d,.]*\s*[%kmb]?", text))
+    constraints = sum(1 for word in CONSTRAINT_WORDS if word in text)
+    options = len(re.findall(r"\b(or|vs\.?|versus)\b", text))
+
+    complexity = min(1.0, (
+        min(words / 80, 1.0) * 0.4
+        + min(constraints / 4, 1.0) * 0.3
+        + min(options / 2, 1.0) * 0.3
+    ))
+
+    domain_text = domain.lower()
+    high_stakes = any(marker in domain_text or marker in text
+                      for marker in config.ROUTER_CONFIG["high_stakes_domains"])
+    stakes = min(1.0, (0.6 if high_stakes else 0.0) + min(numbers / 4, 1.0) * 0.4)
+
+    return {
+        "complexity": round(complexity, 3),
+        "stakes": round(stakes, 3),
+        "score": round(max(complexity, stakes, 0.6 * complexity + 0.4 * stakes), 3)
+    }
+
+
+def _tier_index(name: str) -> int:
+    for index, tier in enumerate(config.MODEL_TIERS):
+        if tier["name"] == name:
+            return index
+    raise ValueError(f"Unknown model tier: {name}")
+
+
+def model_key(agent_config: dict) -> str:
+    """Provider-qualified model name used as the key in config.MODEL_STATS (e.g. "openai/gpt-4o")."""
+    return f"{agent_config['provider']}/{agent_config['model']}"
+
+
+def estimate_call_cost(key: str, input_tokens: int, output_tokens: int) -> dict:
+    """
+    Estimate the dollar cost and generation latency of one call from config.MODEL_STATS.
+
+    Returns:
+        Dictionary with "cost_usd" and "latency_s" (0.0 when the model has no stats)
+    """
+    stats = config.MODEL_STATS.get(key)
+    if not stats:
+        return {"cost_usd": 0.0, "latency_s": 0.0}
+
+    cost = (input_tokens * stats["input_per_1m"] + output_tokens * stats["output_per_1m"]) / 1_000_000
+    return {
+        "cost_usd": cost,
+        "latency_s": output_tokens / stats["tokens_per_second"]
+    }
+
+
+def route_models(
+    question: str,
+    domain: str = "general business strategy",
+    tier_override: Optional[str] = None
+) -> dict:
+    """
+    Pick a model per agent from config.MODEL_TIERS based on question complexity.
+
+    An agent's model in config.AGENT_MODELS acts as its ceiling; agents whose
+    configured model is not on the ladder (e.g. a local Ollama model) are left as-is.
+    Agents in ROUTER_CONFIG["domain_blind_agents"] are scored without the domain, so a
+    domain-only change keeps their models and their phase cache entries.
+
+    Args:
+        question: The strategic question to debate
+        domain: Domain context for the debate
+        tier_override: Optional tier name forcing every laddered agent onto that tier
+
+    Returns:
+        Dictionary with "agent_models" (agent -> model settings) and a "decision" record
+    """
+    router = config.ROUTER_CONFIG
+    scores = score_question(question, domain)
+    # Agents whose prompts never see the domain are routed on the question alone
+    question_scores = score_question(question, "")
+    ladder_keys = [model_key(tier) for tier in config.MODEL_TIERS]
+
+    def base_tier(score: float) -> int:
+        if tier_override:
+            return _tier_index(tier_override)
+        base_index = 0
+        for index, tier in enumerate(config.MODEL_TIERS):
+            if score >= router["thresholds"].get(tier["name"], 0.0):
+                base_index = index
+        return base_index
+
+    expected = router["expected_tokens"]
+    agent_models = {}
+    agents = {}
+    baseline = {"cost_usd": 0.0, "latency_s": 0.0}
+    routed = {"cost_usd": 0.0, "latency_s": 0.0}
+
+    for agent_name, configured in config.AGENT_MODELS.items():
+        chosen = dict(configured)
+        configured_key = model_key(configured)
+
+        if configured_key in ladder_keys:
+            blind = agent_name in router["domain_blind_agents"]
+            base_index = base_tier((question_scores if blind else scores)["score"])
+            if tier_override:
+                index = base_index
+            else:
+                ceiling = ladder_keys.index(configured_key)
+                floor = _tier_index(router["min_tier"].get(agent_name, config.MODEL_TIERS[0]["name"]))
+                index = base_index + router["agent_bias"].get(agent_name, 0)
+                index = max(min(index, ceiling), min(floor, ceiling))
+            tier = config.MODEL_TIERS[index]
+            chosen["provider"] = tier["provider"]
+            chosen["model"] = tier["model"]
+            agents[agent_name] = tier["name"]
+        else:
+            agents[agent_name] = "fixed"
+
+        agent_models[agent_name] = chosen
+
+        for totals, key in ((baseline, configured_key), (routed, model_key(chosen))):
+            estimate = estimate_call_cost(key, expected["input"], expected["output"])
+            totals["cost_usd"] += estimate["cost_usd"]
+            totals["latency_s"] += estimate["latency_s"]
+
+    decision = {
+        "timestamp": time.time(),
+        "question_words": len(question.split()),
+        "domain": domain,
+        "override": tier_override,
+        "scores": scores,
+        "tiers": agents,
+        "models": {name: model_key(settings) for name, settings in agent_models.items()},
+        "estimated_cost_usd": round(routed["cost_usd"], 6),
+        "estimated_savings_usd": round(baseline["cost_usd"] - routed["cost_usd"], 6),
+        "estimated_latency_savings_s": round(baseline["latency_s"] - routed["latency_s"], 2)
+    }
+
+    return {"agent_models": agent_models, "decision": decision}
+
+
+def record_routing_decision(decision: dict, path: Optional[str] = None) -> None:
+    """Append a routing decision (plus any observed outcome fields) to the JSONL log."""
+    path = path or config.ROUTER_CONFIG["log_path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write(json.dumps(decision) + "\n")
 
 
 def test_all_connections():
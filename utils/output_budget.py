@@ -0,0 +1,294 @@
+"""
+Output Budgets - Per-agent, per-phase output length limits
+
+Budgets start from config.OUTPUT_BUDGETS and are enforced twice: as the provider
+max_tokens and as word limits in the task prompt. When adaptive budgets are enabled,
+each debate nudges a budget down if later phases barely reference that output, and
+up if they lean on it heavily or the output was cut off at the limit. Outputs reused
+from the phase cache leave their budgets unchanged.
+"""
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+import config
+from utils.sections import EXPECTED_SECTIONS, section_completeness
+from utils.tokens import estimate_tokens, tokens_to_words
+
+# Later outputs that consume each (agent, phase) output
+DOWNSTREAM = {
+    ("advocate", "initial"): ["advocate_response", "critic_response", "domain_expert", "synthesis", "judgment"],
+    ("critic", "initial"): ["advocate_response", "critic_response", "domain_expert", "synthesis", "judgment"],
+    ("contrarian", "initial"): ["advocate_response", "critic_response", "domain_expert", "synthesis", "judgment"],
+    ("advocate", "response"): ["domain_expert", "synthesis", "judgment"],
+    ("critic", "response"): ["domain_expert", "synthesis", "judgment"],
+    ("domain_expert", "reality_check"): ["synthesis", "judgment"],
+    ("synthesizer", "synthesis"): ["judgment"],
+    ("judge", "judgment"): []
+}
+
+# Where each (agent, phase) output lives in the flattened debate results
+OUTPUT_KEYS = {
+    ("advocate", "initial"): "advocate",
+    ("critic", "initial"): "critic",
+    ("contrarian", "initial"): "contrarian",
+    ("advocate", "response"): "advocate_response",
+    ("critic", "response"): "critic_response",
+    ("domain_expert", "reality_check"): "domain_expert",
+    ("synthesizer", "synthesis"): "synthesis",
+    ("judge", "judgment"): "judgment"
+}
+
+# The LENGTH instruction length_guidance appends to task prompts
+LENGTH_PATTERN = re.compile(r"LENGTH: Keep your [^\n]*")
+
+STOPWORDS = {
+    "the", "and", "for", "that", "this", "with", "are", "our", "but", "not", "you", "your",
+    "will", "can", "from", "have", "has", "its", "was", "were", "they", "their", "what",
+    "which", "would", "could", "should", "into", "than", "then", "more", "most", "also"
+}
+
+
+# Serializes read-modify-write updates of the adaptive budget state from concurrent debates
+_state_lock = threading.Lock()
+
+
+def _load_state() -> dict:
+    path = config.BUDGET_CONFIG["state_path"]
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        # An unreadable state file falls back to the configured budgets
+        return {}
+
+
+# Budget state as last read from disk, reused until the file changes: (path, mtime, state)
+_state_cache = (None, None, {})
+
+
+def _cached_state() -> dict:
+    # Budget lookups run for every agent LLM, so the file is only re-read when its mtime moves
+    global _state_cache
+    path = config.BUDGET_CONFIG["state_path"]
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached_path, cached_mtime, state = _state_cache
+    if (cached_path, cached_mtime) != (path, mtime):
+        state = _load_state()
+        _state_cache = (path, mtime, state)
+    return state
+
+
+def _save_state(state: dict) -> None:
+    # Written to a temp file and swapped in, so readers never see a partial file
+    path = config.BUDGET_CONFIG["state_path"]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as state_file:
+        json.dump(state, state_file, indent=2)
+    os.replace(temp_path, path)
+
+
+def configured_budget(agent_name: str, phase: str) -> Optional[int]:
+    """
+    Get the configured (not adapted) max output tokens for an agent in a phase.
+
+    Returns:
+        Token budget, or None when budgets are disabled or none is configured
+    """
+    if not config.BUDGET_CONFIG["enabled"]:
+        return None
+
+    budget = config.OUTPUT_BUDGETS.get(agent_name, {}).get(phase)
+    return None if budget is None else int(budget)
+
+
+def get_output_budget(agent_name: str, phase: str) -> Optional[int]:
+    """
+    Get the max output tokens for an agent in a phase.
+
+    Returns:
+        Token budget, or None when budgets are disabled or none is configured
+    """
+    budget = configured_budget(agent_name, phase)
+    if budget is None:
+        return None
+
+    if config.BUDGET_CONFIG["adaptive"]:
+        budget = _cached_state().get(f"{agent_name}:{phase}", budget)
+
+    return int(budget)
+
+
+def length_guidance(agent_name: str, phase: str, budget: Optional[int] = None) -> str:
+    """
+    Build the LENGTH instruction appended to a task prompt.
+
+    Args:
+        agent_name: Agent the task is for
+        phase: Debate phase ("initial", "response", "reality_check", "synthesis", "judgment")
+        budget: Token budget (looked up when omitted)
+
+    Returns:
+        Prompt text with total and per-section word limits, or "" when unbudgeted
+    """
+    budget = budget or get_output_budget(agent_name, phase)
+    if not budget:
+        return ""
+
+    # Leave headroom so the model finishes before the hard max_tokens cut-off
+    words = tokens_to_words(int(budget * 0.85))
+    sections = EXPECTED_SECTIONS.get((agent_name, phase))
+
+    if sections:
+        return (
+            f"LENGTH: Keep your whole response under {words} words — "
+            f"roughly {words // sections} words per numbered section. Be dense, not exhaustive."
+        )
+    return f"LENGTH: Keep your response under {words} words. Be dense, not exhaustive."
+
+
+def _key_terms(text: str) -> set:
+    words = [w for w in re.findall(r"[a-z][a-z'-]{2,}", text.lower()) if w not in STOPWORDS]
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def reference_rate(output: str, later_outputs: list) -> float:
+    """Fraction of an output's content bigrams that reappear in later debate outputs."""
+    terms = _key_terms(output)
+    if not terms:
+        return 0.0
+
+    later_terms = set()
+    for text in later_outputs:
+        later_terms |= _key_terms(text)
+
+    return len(terms & later_terms) / len(terms)
+
+
+def _flatten_outputs(results: dict) -> dict:
+    outputs = {}
+    for round_data in results.get("rounds", []):
+        for key, value in round_data.items():
+            if isinstance(value, str) and key != "phase":
+                outputs[key] = value
+    for key in ("synthesis", "judgment"):
+        if results.get(key):
+            outputs[key] = results[key]
+    return outputs
+
+
+def update_budgets(results: dict) -> list:
+    """
+    Measure each output against its budget, adapt budgets and append a report row.
+
+    Args:
+        results: Debate results from run_debate (with "budgets" and "timings")
+
+    Returns:
+        List of report rows, one per budgeted output
+    """
+    budgets = results.get("budgets", {})
+    timings = results.get("timings", {})
+    outputs = _flatten_outputs(results)
+    settings = config.BUDGET_CONFIG
+    changes = {}
+    rows = []
+
+    for (agent_name, phase), output_key in OUTPUT_KEYS.items():
+        budget_key = f"{agent_name}:{phase}"
+        budget = budgets.get(budget_key)
+        output = outputs.get(output_key)
+        # Reused outputs were written under an earlier budget and say nothing about this one
+        if not budget or not output or budget_key in results.get("reused_phases", {}):
+            continue
+
+        later = [outputs[key] for key in DOWNSTREAM[(agent_name, phase)] if key in outputs]
+        output_tokens = estimate_tokens(output)
+        truncated = output_tokens >= budget * 0.95
+        rate = reference_rate(output, later) if later else None
+
+        new_budget = budget
+        if settings["adaptive"]:
+            heavily_used = rate is not None and rate > settings["high_reference_rate"]
+            barely_used = rate is not None and rate < settings["low_reference_rate"]
+            if truncated or (heavily_used and output_tokens >= budget * 0.8):
+                new_budget = budget * (1 + settings["step"])
+            elif barely_used or output_tokens < budget * 0.5:
+                new_budget = budget * (1 - settings["step"])
+            new_budget = int(min(max(new_budget, settings["min_tokens"]), settings["max_tokens"]))
+            changes[budget_key] = new_budget
+
+        rows.append({
+            "agent": agent_name,
+            "phase": phase,
+            "budget": budget,
+            "next_budget": new_budget,
+            "output_tokens": output_tokens,
+            "truncated": truncated,
+            "reference_rate": None if rate is None else round(rate, 3),
+            "completeness": section_completeness(output, agent_name, phase),
+            "phase_latency_s": timings.get(phase)
+        })
+
+    if changes:
+        with _state_lock:
+            state = _load_state()
+            state.update(changes)
+            _save_state(state)
+
+    if rows:
+        path = settings["report_path"]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as report_file:
+            for row in rows:
+                report_file.write(json.dumps(row) + "\n")
+
+    return rows
+
+
+def summarize_budget_report(path: Optional[str] = None) -> list:
+    """
+    Summarize the latency/quality trade-off observed at each budget setting.
+
+    Returns:
+        One dict per (agent, phase, budget) with run count and mean latency, output
+        tokens, reference rate, completeness and truncation rate
+    """
+    path = path or config.BUDGET_CONFIG["report_path"]
+    if not os.path.exists(path):
+        return []
+
+    groups = defaultdict(list)
+    with open(path, encoding="utf-8") as report_file:
+        for line in report_file:
+            row = json.loads(line)
+            groups[(row["agent"], row["phase"], row["budget"])].append(row)
+
+    def mean(values):
+        values = [v for v in values if v is not None]
+        return round(sum(values) / len(values), 3) if values else None
+
+    summary = []
+    for (agent_name, phase, budget), rows in sorted(groups.items()):
+        summary.append({
+            "agent": agent_name,
+            "phase": phase,
+            "budget": budget,
+            "runs": len(rows),
+            "mean_latency_s": mean([r["phase_latency_s"] for r in rows]),
+            "mean_output_tokens": mean([r["output_tokens"] for r in rows]),
+            "mean_reference_rate": mean([r["reference_rate"] for r in rows]),
+            "mean_completeness": mean([r["completeness"] for r in rows]),
+            "truncation_rate": mean([1.0 if r["truncated"] else 0.0 for r in rows])
+        })
+
+    return summary
@@ -0,0 +1,216 @@
+"""
+Phase Cache - Reuses agent outputs whose exact inputs were seen before
+
+Each agent output is stored under a hash of everything that produced it: the model
+settings and output budget, the agent's role/goal/backstory and the full task
+description (which embeds the question and every upstream output it depends on).
+The budget is the configured one and the prompt's LENGTH instruction is left out, so
+adaptive budgets (which move after most runs) do not invalidate earlier outputs.
+Because downstream prompts embed upstream outputs, dependencies follow automatically:
+changing only the domain changes the domain expert's backstory and task, so Rounds 1-2
+are reused while the domain expert, synthesizer and judge rerun.
+
+Optionally, a near-identical question can reuse outputs from an earlier run: a second
+key hashes the same inputs with the question blanked out, and a hit is accepted when
+the stored question is similar enough (PHASE_CACHE_CONFIG["fuzzy_threshold"]).
+"""
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+import config
+from utils.output_budget import LENGTH_PATTERN
+
+QUESTION_PLACEHOLDER = "\x00QUESTION\x00"
+
+
+def _digest(parts: list) -> str:
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _normalize(question: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+def question_similarity(a: str, b: str) -> float:
+    """Similarity of two questions in [0, 1], ignoring case, punctuation and whitespace."""
+    return difflib.SequenceMatcher(None, _normalize(a), _normalize(b)).ratio()
+
+
+class PhaseCache:
+    """
+    Disk-backed store of agent outputs keyed by input hashes.
+
+    Args:
+        cache_dir: Directory holding one JSON file per output plus the fuzzy-match index
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or config.PHASE_CACHE_CONFIG["cache_dir"]
+        self._lock = threading.Lock()
+
+    def keys(
+        self,
+        agent_name: str,
+        phase: str,
+        agent_config: dict,
+        max_tokens: Optional[int],
+        agent,
+        description: str,
+        question: str
+    ) -> tuple:
+        """
+        Hash the exact inputs of one agent task.
+
+        Args:
+            agent_name: Agent the task is for
+            phase: Debate phase
+            agent_config: Model settings the agent runs on
+            max_tokens: Configured output budget (utils.output_budget.configured_budget)
+            agent: CrewAI agent (role, goal and backstory are hashed)
+            description: Task description; its LENGTH instruction is not hashed
+            question: The debate question (blanked out for the template key)
+
+        Returns:
+            (exact key, question-independent template key)
+        """
+        parts = [
+            agent_name, phase,
+            agent_config["provider"], agent_config["model"], agent_config.get("temperature"), max_tokens,
+            agent.role, agent.goal, agent.backstory
+        ]
+        description = LENGTH_PATTERN.sub("", description)
+        exact = _digest(parts + [description])
+        template = _digest(parts + [description.replace(question, QUESTION_PLACEHOLDER)]) if question else exact
+        return exact, template
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _template_path(self, template: str) -> str:
+        return os.path.join(self.cache_dir, "templates", f"{template}.jsonl")
+
+    def _load(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        max_age = config.PHASE_CACHE_CONFIG["max_age_days"]
+        if max_age and time.time() - entry["created_at"] > max_age * 86400:
+            return None
+        return entry
+
+    def get(self, exact: str, template: str, question: str, fuzzy: Optional[bool] = None) -> tuple:
+        """
+        Look up an output.
+
+        Args:
+            exact: Exact input key
+            template: Question-independent key
+            question: The current question
+            fuzzy: Allow reuse for a near-identical question (default from config)
+
+        Returns:
+            (output, "exact" | "fuzzy") or (None, None) on a miss
+        """
+        entry = self._load(exact)
+        if entry:
+            return entry["output"], "exact"
+
+        fuzzy = config.PHASE_CACHE_CONFIG["fuzzy_question_reuse"] if fuzzy is None else fuzzy
+        if not fuzzy or template == exact:
+            return None, None
+
+        try:
+            with open(self._template_path(template), encoding="utf-8") as index_file:
+                candidates = [json.loads(line) for line in index_file if line.strip()]
+        except OSError:
+            return None, None
+
+        threshold = config.PHASE_CACHE_CONFIG["fuzzy_threshold"]
+        best = max(candidates, key=lambda c: question_similarity(c["question"], question), default=None)
+        if best and question_similarity(best["question"], question) >= threshold:
+            entry = self._load(best["key"])
+            if entry:
+                return entry["output"], "fuzzy"
+
+        return None, None
+
+    def put(self, exact: str, template: str, question: str, agent_name: str, phase: str, output: str) -> None:
+        """Store an output under its exact key and register it for fuzzy question matching."""
+        path = self._path(exact)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as entry_file:
+            json.dump({
+                "agent": agent_name,
+                "phase": phase,
+                "question": question,
+                "output": output,
+                "created_at": time.time()
+            }, entry_file)
+        os.replace(temp_path, path)
+
+        if template != exact:
+            index_path = self._template_path(template)
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with self._lock, open(index_path, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps({"question": question, "key": exact}) + "\n")
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """
+        Delete entries older than max_age_days (default from config) and drop them from the
+        fuzzy-match indexes.
+
+        Returns:
+            Number of entries deleted
+        """
+        max_age = (max_age_days or config.PHASE_CACHE_CONFIG["max_age_days"]) * 86400
+        removed = 0
+        if not max_age or not os.path.isdir(self.cache_dir):
+            return removed
+
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if shard == "templates" or not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                path = os.path.join(shard_dir, name)
+                if name.endswith(".json") and time.time() - os.path.getmtime(path) > max_age:
+                    os.remove(path)
+                    removed += 1
+
+        template_dir = os.path.join(self.cache_dir, "templates")
+        if removed and os.path.isdir(template_dir):
+            with self._lock:
+                for name in os.listdir(template_dir):
+                    path = os.path.join(template_dir, name)
+                    with open(path, encoding="utf-8") as index_file:
+                        lines = [line for line in index_file if line.strip()]
+                    kept = [line for line in lines if os.path.exists(self._path(json.loads(line)["key"]))]
+                    if not kept:
+                        os.remove(path)
+                    elif len(kept) < len(lines):
+                        temp_path = f"{path}.{threading.get_ident()}.tmp"
+                        with open(temp_path, "w", encoding="utf-8") as index_file:
+                            index_file.writelines(kept)
+                        os.replace(temp_path, path)
+        return removed
+
+
+_cache: Optional[PhaseCache] = None
+
+
+def get_phase_cache() -> PhaseCache:
+    """Shared PhaseCache for config.PHASE_CACHE_CONFIG["cache_dir"]; expired entries are pruned when it is created."""
+    global _cache
+    if _cache is None or _cache.cache_dir != config.PHASE_CACHE_CONFIG["cache_dir"]:
+        _cache = PhaseCache()
+        _cache.prune()
+    return _cache
@@ -0,0 +1,308 @@
+"""
+Debate Profiler - Splits each phase's wall time into local overhead vs. network wait
+
+For every phase of run_debate(profile=True) the profiler records wall time, process
+CPU time, orchestrator-thread CPU time and Python allocations (tracemalloc), plus the
+time covered by in-flight LLM calls (from InstrumentedLLM records). Wall time not
+covered by any call is local overhead: Crew/Task construction, prompt templating,
+logging and parsing.
+
+A background sampler captures Python stacks so the overhead can be inspected as a
+flamegraph. DebateProfiler.export() writes a speedscope file (https://www.speedscope.app):
+an evented timeline of phases, network waits and LLM calls, and one sampled profile
+per thread.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+import config
+
+# tracemalloc is process-wide; it stays on while any profiler that started it is running
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _merge_intervals(intervals: list) -> list:
+    """Union of possibly overlapping (start, end) intervals as sorted, disjoint [start, end] pairs."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _start_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+class _StackSampler:
+    """Samples the Python stacks of all other threads at a fixed interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.frames = []
+        self._frame_index = {}
+        self.samples = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="debate-profiler", daemon=True)
+
+    def _frame_id(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self._frame_index:
+            self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return self._frame_index[key]
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_id(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples.setdefault(names.get(ident, str(ident)), []).append(stack)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class DebateProfiler:
+    """
+    Per-phase profile of one debate.
+
+    Call begin(phase) at each phase boundary, register record_call as an InstrumentedLLM
+    listener, and call finish() at the end (or stop() when the debate fails). CPU and
+    allocation figures are process-wide, so with concurrent debates they include the
+    other debates' work.
+
+    Args:
+        debate_id: Debate being profiled (used in the export file name)
+        sample_interval: Stack sampling period in seconds (None = no flamegraph sampling)
+        track_allocations: Whether to trace Python allocations with tracemalloc
+    """
+
+    def __init__(
+        self,
+        debate_id: str,
+        sample_interval: Optional[float] = None,
+        track_allocations: Optional[bool] = None
+    ):
+        self.debate_id = debate_id
+        self.phases = []
+        self.calls = []
+        self._lock = threading.Lock()
+        self._current = None
+        self._stopped = False
+        self._track_allocations = (
+            config.PROFILE_CONFIG["track_allocations"] if track_allocations is None else track_allocations
+        )
+        interval = config.PROFILE_CONFIG["sample_interval_s"] if sample_interval is None else sample_interval
+        self._sampler = _StackSampler(interval) if interval else None
+
+        if self._track_allocations:
+            _start_tracing()
+        if self._sampler:
+            self._sampler.start()
+        self.started_at = time.time()
+
+    def _close_current(self):
+        phase = self._current
+        if phase is None:
+            return
+        phase["wall_s"] = time.time() - phase.pop("_start")
+        phase["cpu_s"] = time.process_time() - phase.pop("_cpu")
+        phase["orchestrator_cpu_s"] = time.thread_time() - phase.pop("_thread_cpu")
+        if self._track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            phase["alloc_net_kb"] = (current - phase["_mem"]) / 1024
+            phase["alloc_peak_kb"] = (peak - phase.pop("_mem")) / 1024
+        self.phases.append(phase)
+        self._current = None
+
+    def begin(self, phase: str) -> None:
+        """End the running phase (if any) and start measuring the next one."""
+        self._close_current()
+        if self._track_allocations:
+            tracemalloc.reset_peak()
+        self._current = {
+            "phase": phase,
+            "offset_s": time.time() - self.started_at,
+            "_start": time.time(),
+            "_cpu": time.process_time(),
+            "_thread_cpu": time.thread_time(),
+            "_mem": tracemalloc.get_traced_memory()[0] if self._track_allocations else 0
+        }
+
+    def record_call(self, record: dict) -> None:
+        """InstrumentedLLM listener: remember when each call was waiting on the provider."""
+        start = record["started_at"] - self.started_at
+        with self._lock:
+            self.calls.append({
+                "agent": record["agent"],
+                "phase": record["phase"],
+                "model": record["model"],
+                "start": start,
+                "end": start + record["latency_s"]
+            })
+
+    def stop(self) -> None:
+        """Stop stack sampling and allocation tracing; safe to call more than once."""
+        if self._stopped:
+            return
+        self._stopped = True
+        if self._sampler:
+            self._sampler.stop()
+        if self._track_allocations:
+            _stop_tracing()
+
+    def finish(self) -> dict:
+        """
+        Stop profiling and summarize.
+
+        Returns:
+            Dictionary with per-phase rows and a "total" row (seconds / KiB)
+        """
+        self._close_current()
+        self.stop()
+        self.duration_s = time.time() - self.started_at
+
+        rows = []
+        for phase in self.phases:
+            start, end = phase["offset_s"], phase["offset_s"] + phase["wall_s"]
+            windows = [(max(c["start"], start), min(c["end"], end)) for c in self.calls]
+            network = sum(b - a for a, b in _merge_intervals([w for w in windows if w[1] > w[0]]))
+            rows.append({
+                "phase": phase["phase"],
+                "wall_s": round(phase["wall_s"], 4),
+                "network_wait_s": round(network, 4),
+                "overhead_s": round(phase["wall_s"] - network, 4),
+                "cpu_s": round(phase["cpu_s"], 4),
+                "orchestrator_cpu_s": round(phase["orchestrator_cpu_s"], 4),
+                "alloc_net_kb": round(phase.get("alloc_net_kb", 0.0), 1),
+                "alloc_peak_kb": round(phase.get("alloc_peak_kb", 0.0), 1),
+                "calls": sum(1 for c in self.calls if start <= c["start"] < end)
+            })
+
+        total = {"phase": "total"}
+        for key in ("wall_s", "network_wait_s", "overhead_s", "cpu_s", "orchestrator_cpu_s", "alloc_net_kb", "calls"):
+            total[key] = round(sum(row[key] for row in rows), 4)
+        total["alloc_peak_kb"] = max((row["alloc_peak_kb"] for row in rows), default=0.0)
+
+        return {"phases": rows, "total": total}
+
+    def speedscope(self) -> dict:
+        """The profile in speedscope's file format."""
+        frames = list(self._sampler.frames) if self._sampler else []
+        named = {}
+
+        def frame(name: str) -> int:
+            if name not in named:
+                named[name] = len(frames)
+                frames.append({"name": name})
+            return named[name]
+
+        timeline = []
+        for phase in self.phases:
+            start, end = phase["offset_s"], phase["offset_s"] + phase["wall_s"]
+            events = [{"type": "O", "frame": frame(f"phase:{phase['phase']}"), "at": start}]
+            windows = [(max(c["start"], start), min(c["end"], end)) for c in self.calls]
+            for wait_start, wait_end in _merge_intervals([w for w in windows if w[1] > w[0]]):
+                events.append({"type": "O", "frame": frame("network wait"), "at": wait_start})
+                events.append({"type": "C", "frame": frame("network wait"), "at": wait_end})
+            events.append({"type": "C", "frame": frame(f"phase:{phase['phase']}"), "at": end})
+            timeline.extend(events)
+
+        profiles = [{
+            "type": "evented",
+            "name": "phases",
+            "unit": "seconds",
+            "startValue": 0.0,
+            "endValue": self.duration_s,
+            "events": timeline
+        }]
+
+        # Overlapping calls go to separate lanes so each lane's events nest properly
+        lanes = []
+        for call in sorted(self.calls, key=lambda c: c["start"]):
+            lane = next((lane for lane in lanes if lane[-1]["end"] <= call["start"]), None)
+            if lane is None:
+                lanes.append([call])
+            else:
+                lane.append(call)
+        for number, lane in enumerate(lanes):
+            events = []
+            for call in lane:
+                call_frame = frame(f"{call['agent']}:{call['phase']} ({call['model']})")
+                events.append({"type": "O", "frame": call_frame, "at": call["start"]})
+                events.append({"type": "C", "frame": call_frame, "at": call["end"]})
+            profiles.append({
+                "type": "evented",
+                "name": f"llm calls (lane {number + 1})",
+                "unit": "seconds",
+                "startValue": 0.0,
+                "endValue": self.duration_s,
+                "events": events
+            })
+
+        if self._sampler:
+            for thread_name, samples in self._sampler.samples.items():
+                profiles.append({
+                    "type": "sampled",
+                    "name": f"stacks: {thread_name}",
+                    "unit": "seconds",
+                    "startValue": 0.0,
+                    "endValue": len(samples) * self._sampler.interval,
+                    "samples": samples,
+                    "weights": [self._sampler.interval] * len(samples)
+                })
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+            "name": f"debate {self.debate_id}",
+            "exporter": "mad-debate-profiler"
+        }
+
+    def export(self, output_dir: Optional[str] = None) -> str:
+        """
+        Write the speedscope file.
+
+        Returns:
+            Path of the written file
+        """
+        output_dir = output_dir or config.PROFILE_CONFIG["output_dir"]
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{self.debate_id}.speedscope.json")
+        with open(path, "w", encoding="utf-8") as profile_file:
+            json.dump(self.speedscope(), profile_file)
+        return path
+
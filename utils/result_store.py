@@ -0,0 +1,247 @@
+"""
+Result Store - Bounded, spill-to-disk storage for debate results shown in the app
+
+Streamlit sessions keep only a handle (the debate id) in st.session_state. Full results
+live in a per-process LRU capped by serialized size; results pushed out of it are
+written to gzip-compressed JSON files and loaded back on demand. A small index of
+previews (question, first lines of each output, synthesis and judgment excerpts) stays in
+memory, so results can be rendered without loading the full text.
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import config
+from utils.event_log import log_event
+
+
+def _outline(results: dict, chars: int) -> list:
+    # Rounds with a short preview of each output, in display order
+    rounds = []
+    for round_data in results.get("rounds", []):
+        outputs = []
+        for key, value in round_data.items():
+            if isinstance(value, str) and key != "phase":
+                outputs.append({"key": key, "option": None, "preview": value[:chars], "chars": len(value)})
+            elif isinstance(value, dict):
+                outputs.extend(
+                    {"key": key, "option": option, "preview": text[:chars], "chars": len(text)}
+                    for option, text in value.items() if isinstance(text, str)
+                )
+        rounds.append({"round": round_data.get("round", 0), "phase": round_data.get("phase", ""), "outputs": outputs})
+    return rounds
+
+
+def _summarize(handle: str, results: dict, size: int) -> dict:
+    settings = config.RESULT_STORE_CONFIG
+    synthesis = results.get("synthesis") or ""
+    judgment = results.get("judgment") or ""
+    return {
+        "handle": handle,
+        "question": results.get("question", ""),
+        "created_at": results.get("started_at", 0.0),
+        "rounds": _outline(results, settings["preview_chars"]),
+        "synthesis_preview": synthesis[:settings["summary_chars"]],
+        "synthesis_chars": len(synthesis),
+        "judgment_preview": judgment[:settings["summary_chars"]],
+        "judgment_chars": len(judgment),
+        "size_bytes": size
+    }
+
+
+class ResultStore:
+    """
+    Process-wide store of debate results, shared by all sessions.
+
+    Args:
+        memory_cap_mb: Max serialized size of the results held in memory
+        spill_dir: Directory for compressed results evicted from memory
+    """
+
+    def __init__(self, memory_cap_mb: Optional[float] = None, spill_dir: Optional[str] = None):
+        settings = config.RESULT_STORE_CONFIG
+        self.memory_cap = int((memory_cap_mb or settings["memory_cap_mb"]) * 1024 * 1024)
+        self.spill_dir = spill_dir or settings["spill_dir"]
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # handle -> (results, serialized size)
+        self._resident_bytes = 0
+        self._index = OrderedDict()  # handle -> summary
+        self._index_bytes = 0
+        self.index_cap = int(settings["index_cap_mb"] * 1024 * 1024)
+        self._spilling = {}  # handle -> results evicted but not yet on disk
+        self.spills = 0
+        self.loads = 0
+
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.spill_dir, f"{handle}.json.gz")
+
+    def _spill(self, evicted: list) -> None:
+        # Called without the lock: compressing a large result must not block other sessions
+        for handle, results in evicted:
+            path = self._path(handle)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=6) as spill_file:
+                    json.dump(results, spill_file, default=str)
+                os.replace(temp_path, path)
+            except OSError as e:
+                # The result is lost, but later sessions must not keep it pinned in memory
+                log_event("result_spill_failed", logging.WARNING, handle=handle, error=str(e))
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            else:
+                with self._lock:
+                    self.spills += 1
+            finally:
+                with self._lock:
+                    self._spilling.pop(handle, None)
+
+    def _admit(self, handle: str, results: dict, size: int) -> list:
+        # Called with the lock held: insert as most recent and evict down to the cap.
+        # Returns the evicted (handle, results) still to be spilled once the lock is released.
+        if handle in self._resident:
+            self._resident_bytes -= self._resident.pop(handle)[1]
+        self._resident[handle] = (results, size)
+        self._resident_bytes += size
+        evicted = []
+        while self._resident_bytes > self.memory_cap and len(self._resident) > 1:
+            evicted_handle, (evicted_results, evicted_size) = self._resident.popitem(last=False)
+            self._resident_bytes -= evicted_size
+            if evicted_handle not in self._spilling and not os.path.exists(self._path(evicted_handle)):
+                self._spilling[evicted_handle] = evicted_results
+                evicted.append((evicted_handle, evicted_results))
+        return evicted
+
+    def put(self, results: dict) -> str:
+        """
+        Store a finished debate's results.
+
+        Returns:
+            Handle to keep in session state
+        """
+        handle = results.get("debate_id") or f"{time.time_ns():x}"
+        size = len(json.dumps(results, default=str))
+        with self._lock:
+            self._remember(_summarize(handle, results, size))
+            evicted = self._admit(handle, results, size)
+        self._spill(evicted)
+        return handle
+
+    def _remember(self, summary: dict) -> None:
+        # Called with the lock held: the index is bounded too (entries and size), oldest entries first out
+        self._forget(summary["handle"])
+        self._index[summary["handle"]] = summary
+        self._index_bytes += len(json.dumps(summary))
+        while len(self._index) > 1 and (
+            len(self._index) > config.RESULT_STORE_CONFIG["max_index_entries"] or self._index_bytes > self.index_cap
+        ):
+            self._forget(next(iter(self._index)))
+
+    def _forget(self, handle: str) -> None:
+        # Called with the lock held
+        summary = self._index.pop(handle, None)
+        if summary is not None:
+            self._index_bytes -= len(json.dumps(summary))
+
+    def summary(self, handle: str) -> Optional[dict]:
+        """Lightweight index entry (question, output previews), or None when unknown."""
+        with self._lock:
+            summary = self._index.get(handle)
+        if summary is None and self.get(handle) is not None:
+            with self._lock:
+                summary = self._index.get(handle)
+        return summary
+
+    def get(self, handle: str) -> Optional[dict]:
+        """Full results, loaded from disk if they were spilled (None when unknown)."""
+        with self._lock:
+            if handle in self._resident:
+                self._resident.move_to_end(handle)
+                return self._resident[handle][0]
+            if handle in self._spilling:
+                return self._spilling[handle]
+
+        try:
+            with gzip.open(self._path(handle), "rt", encoding="utf-8") as spill_file:
+                results = json.load(spill_file)
+        except (OSError, ValueError):
+            return None
+
+        size = len(json.dumps(results, default=str))
+        with self._lock:
+            self.loads += 1
+            evicted = self._admit(handle, results, size)
+            if handle not in self._index:
+                self._remember(_summarize(handle, results, size))
+        self._spill(evicted)
+        return results
+
+    def text(self, handle: str, key: str, round_number: Optional[int] = None, option: Optional[str] = None) -> str:
+        """
+        One output's full text.
+
+        Args:
+            handle: Result handle
+            key: Output key, e.g. "synthesis", or a round key such as "critic" or "advocates"
+            round_number: Round holding the key (None for top-level keys)
+            option: Tournament option, for per-option keys such as "advocates"
+        """
+        results = self.get(handle) or {}
+        if round_number is None:
+            value = results.get(key, "")
+        else:
+            rounds = [r for r in results.get("rounds", []) if r.get("round") == round_number]
+            value = rounds[0].get(key, "") if rounds else ""
+        if option is not None and isinstance(value, dict):
+            value = value.get(option, "")
+        return value if isinstance(value, str) else ""
+
+    def prune(self, max_age_hours: Optional[float] = None) -> int:
+        """Delete spill files older than max_age_hours (default from config) and their index entries; returns the count."""
+        max_age = (max_age_hours or config.RESULT_STORE_CONFIG["spill_max_age_hours"]) * 3600
+        removed = 0
+        if not os.path.isdir(self.spill_dir):
+            return removed
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            if name.endswith(".json.gz") and time.time() - os.path.getmtime(path) > max_age:
+                os.remove(path)
+                removed += 1
+                handle = name[:-len(".json.gz")]
+                with self._lock:
+                    if handle not in self._resident and handle not in self._spilling:
+                        self._forget(handle)
+        return removed
+
+    def stats(self) -> dict:
+        """Resident count and size, spills and disk loads so far."""
+        with self._lock:
+            return {
+                "resident": len(self._resident),
+                "resident_mb": round(self._resident_bytes / 1024 / 1024, 2),
+                "memory_cap_mb": round(self.memory_cap / 1024 / 1024, 2),
+                "indexed": len(self._index),
+                "index_mb": round(self._index_bytes / 1024 / 1024, 2),
+                "spills": self.spills,
+                "loads": self.loads
+            }
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """The process-wide ResultStore; old spill files are pruned when it is created."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore()
+            _store.prune()
+        return _store
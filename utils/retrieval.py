@@ -0,0 +1,416 @@
+"""
+Retrieval Index - Local per-domain document index for grounding the domain expert
+
+Reference documents (regulations, internal policies, playbooks) are chunked and indexed
+per domain on disk. Round 3 retrieves the top-k passages relevant to the current debate
+and hands them to the domain expert alone, instead of pasting whole documents into the
+question and inflating every phase's prompt.
+
+The index is built from immutable segments, each a set of memory-mapped numpy arrays:
+a BM25 inverted index in CSR layout plus, optionally, normalized embeddings from a local
+sentence-transformers model. Adding documents writes a new segment; changed or removed
+documents are masked out of their old segment until compact() rewrites the index.
+
+Usage:
+    python -m utils.retrieval index fintech docs/fintech/
+    python -m utils.retrieval search fintech "PSD2 strong customer authentication"
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+import config
+from utils.sections import parse_sections
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by", "at", "is",
+    "are", "be", "as", "it", "this", "that", "from", "we", "our", "should", "will", "can"
+}
+DOCUMENT_EXTENSIONS = (".txt", ".md", ".rst")
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_embedders = {}
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_text(text: str, chunk_words: int, overlap_words: int) -> list:
+    """Split text into overlapping chunks of roughly chunk_words words."""
+    words = text.split()
+    if not words:
+        return []
+
+    step = max(chunk_words - overlap_words, 1)
+    return [" ".join(words[start:start + chunk_words]) for start in range(0, max(len(words) - overlap_words, 1), step)]
+
+
+def _domain_slug(domain: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", domain.lower()).strip("-") or "general"
+
+
+def _embedder(model_name: str):
+    if model_name not in _embedders:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Embedding retrieval requires sentence-transformers: pip install sentence-transformers"
+            ) from e
+        _embedders[model_name] = SentenceTransformer(model_name)
+    return _embedders[model_name]
+
+
+class _Segment:
+    """One immutable, memory-mapped slice of the index."""
+
+    def __init__(self, path: str, deleted: list):
+        self.path = path
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as vocab_file:
+            self.vocab = json.load(vocab_file)
+        self.doc_ids = np.load(os.path.join(path, "doc_ids.npy"), mmap_mode="r")
+        self.tfs = np.load(os.path.join(path, "tfs.npy"), mmap_mode="r")
+        self.doc_len = np.load(os.path.join(path, "doc_len.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+
+        embeddings_path = os.path.join(path, "embeddings.npy")
+        self.embeddings = np.load(embeddings_path, mmap_mode="r") if os.path.exists(embeddings_path) else None
+
+        self.live = np.ones(len(self.doc_len), dtype=bool)
+        for start, end in deleted:
+            self.live[start:end] = False
+
+    def passage(self, local_id: int) -> dict:
+        with open(os.path.join(self.path, "chunks.jsonl"), "rb") as chunks_file:
+            chunks_file.seek(int(self.offsets[local_id]))
+            return json.loads(chunks_file.readline())
+
+
+class DomainIndex:
+    """
+    On-disk retrieval index for one domain.
+
+    Args:
+        domain: Domain name (e.g. "fintech"); stored under a slug directory
+        index_dir: Root directory for all domain indexes
+    """
+
+    def __init__(self, domain: str, index_dir: Optional[str] = None):
+        self.domain = domain
+        self.path = os.path.join(index_dir or config.RETRIEVAL_CONFIG["index_dir"], _domain_slug(domain))
+        self.manifest_path = os.path.join(self.path, "manifest.json")
+        self._lock = threading.Lock()
+        self._load()
+
+    # ----- persistence -----
+
+    def _load(self) -> None:
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as manifest_file:
+                self.manifest = json.load(manifest_file)
+        else:
+            self.manifest = {"next_segment": 0, "segments": {}, "sources": {}}
+        self._mtime = os.path.getmtime(self.manifest_path) if os.path.exists(self.manifest_path) else None
+        self.segments = {
+            name: _Segment(os.path.join(self.path, name), info["deleted"])
+            for name, info in self.manifest["segments"].items()
+        }
+        self._refresh_stats()
+
+    def _save_manifest(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(self.manifest, manifest_file)
+        os.replace(temp_path, self.manifest_path)
+        self._load()
+
+    def _refresh_stats(self) -> None:
+        live_lengths = [segment.doc_len[segment.live] for segment in self.segments.values()]
+        self.num_chunks = int(sum(len(lengths) for lengths in live_lengths))
+        total_length = float(sum(lengths.sum() for lengths in live_lengths))
+        self.avg_len = total_length / self.num_chunks if self.num_chunks else 1.0
+
+    def is_stale(self) -> bool:
+        """True when another process has updated the index since it was loaded."""
+        mtime = os.path.getmtime(self.manifest_path) if os.path.exists(self.manifest_path) else None
+        return mtime != self._mtime
+
+    # ----- indexing -----
+
+    def _write_segment(self, chunks: list) -> str:
+        settings = config.RETRIEVAL_CONFIG
+        name = f"seg-{self.manifest['next_segment']:05d}"
+        path = os.path.join(self.path, name)
+        os.makedirs(path, exist_ok=True)
+
+        postings = {}
+        doc_len = np.zeros(len(chunks), dtype=np.int32)
+        offsets = np.zeros(len(chunks), dtype=np.int64)
+
+        with open(os.path.join(path, "chunks.jsonl"), "wb") as chunks_file:
+            for local_id, chunk in enumerate(chunks):
+                offsets[local_id] = chunks_file.tell()
+                chunks_file.write((json.dumps(chunk) + "\n").encode("utf-8"))
+                counts = Counter(tokenize(chunk["text"]))
+                doc_len[local_id] = sum(counts.values())
+                for term, tf in counts.items():
+                    postings.setdefault(term, []).append((local_id, tf))
+
+        # CSR layout: vocab maps term -> [offset, doc frequency] into doc_ids/tfs
+        vocab, doc_ids, tfs = {}, [], []
+        for term, entries in postings.items():
+            vocab[term] = [len(doc_ids), len(entries)]
+            doc_ids.extend(local_id for local_id, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as vocab_file:
+            json.dump(vocab, vocab_file)
+        np.save(os.path.join(path, "doc_ids.npy"), np.asarray(doc_ids, dtype=np.int32))
+        np.save(os.path.join(path, "tfs.npy"), np.asarray(tfs, dtype=np.float32))
+        np.save(os.path.join(path, "doc_len.npy"), doc_len)
+        np.save(os.path.join(path, "offsets.npy"), offsets)
+
+        if settings["embedding_model"]:
+            embeddings = _embedder(settings["embedding_model"]).encode(
+                [chunk["text"] for chunk in chunks], normalize_embeddings=True, batch_size=64
+            )
+            np.save(os.path.join(path, "embeddings.npy"), np.asarray(embeddings, dtype=np.float32))
+
+        self.manifest["next_segment"] += 1
+        self.manifest["segments"][name] = {"size": len(chunks), "deleted": []}
+        return name
+
+    def _mark_deleted(self, source: str) -> None:
+        entry = self.manifest["sources"].pop(source, None)
+        if entry and entry["segment"] in self.manifest["segments"]:
+            self.manifest["segments"][entry["segment"]]["deleted"].append([entry["start"], entry["end"]])
+
+    def add_texts(self, documents: dict) -> dict:
+        """
+        Index documents given as {source_id: text}; unchanged documents are skipped.
+
+        Returns:
+            Dictionary with counts of "added", "updated", "unchanged" documents and new "chunks"
+        """
+        settings = config.RETRIEVAL_CONFIG
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "chunks": 0}
+
+        with self._lock:
+            pending, chunks = [], []
+            for source, text in documents.items():
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                previous = self.manifest["sources"].get(source)
+                if previous and previous["sha256"] == digest:
+                    stats["unchanged"] += 1
+                    continue
+
+                stats["updated" if previous else "added"] += 1
+                self._mark_deleted(source)
+                source_chunks = chunk_text(text, settings["chunk_words"], settings["overlap_words"])
+                pending.append((source, digest, len(chunks), len(chunks) + len(source_chunks)))
+                chunks.extend({"source": source, "text": chunk} for chunk in source_chunks)
+
+            if chunks:
+                segment = self._write_segment(chunks)
+                for source, digest, start, end in pending:
+                    self.manifest["sources"][source] = {
+                        "sha256": digest, "segment": segment, "start": start, "end": end
+                    }
+            if pending:
+                self._save_manifest()
+
+        stats["chunks"] = len(chunks)
+        return stats
+
+    def add_path(self, path: str) -> dict:
+        """Index a document file or every .txt/.md/.rst file under a directory."""
+        documents = {}
+        base = os.path.dirname(path) if os.path.isfile(path) else path
+        paths = [path] if os.path.isfile(path) else [
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in sorted(names) if name.endswith(DOCUMENT_EXTENSIONS)
+        ]
+        for file_path in paths:
+            with open(file_path, encoding="utf-8", errors="ignore") as document:
+                documents[os.path.relpath(file_path, base)] = document.read()
+        return self.add_texts(documents)
+
+    def remove(self, source: str) -> None:
+        """Drop a document from search results (space is reclaimed by compact())."""
+        with self._lock:
+            self._mark_deleted(source)
+            self._save_manifest()
+
+    def compact(self) -> None:
+        """Rewrite all live chunks into a single segment and delete the old ones."""
+        with self._lock:
+            chunks, ranges = [], {}
+            for source, entry in self.manifest["sources"].items():
+                segment = self.segments[entry["segment"]]
+                start = len(chunks)
+                chunks.extend(segment.passage(local_id) for local_id in range(entry["start"], entry["end"]))
+                ranges[source] = (entry["sha256"], start, len(chunks))
+
+            old_segments = list(self.manifest["segments"])
+            self.manifest["segments"] = {}
+            if chunks:
+                segment_name = self._write_segment(chunks)
+                self.manifest["sources"] = {
+                    source: {"sha256": digest, "segment": segment_name, "start": start, "end": end}
+                    for source, (digest, start, end) in ranges.items()
+                }
+            self._save_manifest()
+            for name in old_segments:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    # ----- search -----
+
+    def _bm25(self, segment: _Segment, terms: list) -> np.ndarray:
+        settings = config.RETRIEVAL_CONFIG
+        k1, b = settings["bm25_k1"], settings["bm25_b"]
+        scores = np.zeros(len(segment.doc_len), dtype=np.float32)
+
+        for term in terms:
+            entry = segment.vocab.get(term)
+            if not entry:
+                continue
+            df = sum(s.vocab.get(term, (0, 0))[1] for s in self.segments.values())
+            idf = math.log(1 + (self.num_chunks - df + 0.5) / (df + 0.5))
+            offset, count = entry
+            ids = segment.doc_ids[offset:offset + count]
+            tf = segment.tfs[offset:offset + count]
+            norm = k1 * (1 - b + b * segment.doc_len[ids] / self.avg_len)
+            scores[ids] += idf * tf * (k1 + 1) / (tf + norm)
+
+        scores[~segment.live] = 0.0
+        return scores
+
+    def search(self, query: str, k: Optional[int] = None) -> list:
+        """
+        Retrieve the top-k passages for a query.
+
+        Uses BM25, fused with embedding similarity (reciprocal rank fusion) when the
+        index was built with an embedding model.
+
+        Returns:
+            List of {"source", "text", "score"} dicts, best first
+        """
+        k = k or config.RETRIEVAL_CONFIG["top_k"]
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not self.segments or not terms:
+            return []
+
+        query_embedding = None
+        if config.RETRIEVAL_CONFIG["embedding_model"] and any(
+            s.embeddings is not None for s in self.segments.values()
+        ):
+            query_embedding = _embedder(config.RETRIEVAL_CONFIG["embedding_model"]).encode(
+                [query], normalize_embeddings=True
+            )[0]
+
+        # Candidate lists per ranking: (score, segment name, local id)
+        rankings = {"bm25": []}
+        if query_embedding is not None:
+            rankings["embedding"] = []
+
+        depth = k * 4
+        for name, segment in self.segments.items():
+            scores = self._bm25(segment, terms)
+            top = np.argpartition(-scores, min(depth, len(scores) - 1))[:depth]
+            rankings["bm25"].extend((float(scores[i]), name, int(i)) for i in top if scores[i] > 0)
+
+            if query_embedding is not None and segment.embeddings is not None:
+                similarity = np.asarray(segment.embeddings @ query_embedding)
+                similarity[~segment.live] = -1.0
+                top = np.argpartition(-similarity, min(depth, len(similarity) - 1))[:depth]
+                rankings["embedding"].extend((float(similarity[i]), name, int(i)) for i in top if segment.live[i])
+
+        if len(rankings) == 1:
+            fused = Counter({(name, local_id): score for score, name, local_id in rankings["bm25"]})
+        else:
+            fused = Counter()
+            for candidates in rankings.values():
+                for rank, (_, name, local_id) in enumerate(sorted(candidates, reverse=True)[:depth]):
+                    fused[(name, local_id)] += 1.0 / (60 + rank)
+
+        passages = []
+        for (name, local_id), score in fused.most_common(k):
+            passage = self.segments[name].passage(local_id)
+            passage["score"] = round(score, 4)
+            passages.append(passage)
+        return passages
+
+
+def get_index(domain: str) -> DomainIndex:
+    """Get the cached index for a domain, reloading it if it changed on disk."""
+    key = _domain_slug(domain)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.is_stale():
+            index = _indexes[key] = DomainIndex(domain)
+        return index
+
+
+def retrieve_passages(domain: str, query: str, k: Optional[int] = None) -> list:
+    """Top-k passages from a domain's index (empty if the domain has no index)."""
+    return get_index(domain).search(query, k)
+
+
+def debate_query(question: str, outputs: list, max_terms: int = 64) -> str:
+    """Build a retrieval query from the question plus each output's opening (thesis) section."""
+    parts = [question]
+    for text in outputs:
+        sections = parse_sections(text)
+        parts.append(sections[0]["body"] if sections else text[:400])
+    terms = list(dict.fromkeys(tokenize(" ".join(parts))))
+    return " ".join(terms[:max_terms])
+
+
+def format_passages(passages: list) -> str:
+    """Render retrieved passages as a numbered reference block for a prompt."""
+    return "\n\n".join(
+        f"[{i}] ({passage['source']}) {passage['text']}" for i, passage in enumerate(passages, 1)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage per-domain retrieval indexes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_cmd = commands.add_parser("index", help="Index a file or directory for a domain")
+    index_cmd.add_argument("domain")
+    index_cmd.add_argument("path")
+    search_cmd = commands.add_parser("search", help="Search a domain's index")
+    search_cmd.add_argument("domain")
+    search_cmd.add_argument("query")
+    search_cmd.add_argument("-k", type=int, default=None)
+    compact_cmd = commands.add_parser("compact", help="Merge a domain's segments")
+    compact_cmd.add_argument("domain")
+    args = parser.parse_args()
+
+    index = DomainIndex(args.domain)
+    if args.command == "index":
+        print(index.add_path(args.path))
+    elif args.command == "search":
+        print(format_passages(index.search(args.query, args.k)))
+    else:
+        index.compact()
+        print(f"Compacted index for {args.domain}: {index.num_chunks} chunks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+LLM Scheduler - Weighted fair queuing of LLM calls across tenants sharing provider quotas
+
+Every LLM call acquires one of its provider's concurrency slots before it is sent.
+When a provider is saturated, waiting calls are dispatched by:
+
+    1. Priority class, strictly (interactive > api > batch)
+    2. Within a class, weighted fair queuing across tenants: each call gets a virtual
+       finish tag (start + cost / tenant weight) and the smallest tag goes first
+    3. Skipping tenants at their concurrency cap
+
+Lower classes may only fill part of a provider's slots (class_max_share), so capacity
+is left for interactive calls arriving while a batch is running. Queue depth and wait
+time metrics are available from LLMScheduler.metrics().
+
+With model affinity on, a call for a model the provider is already serving (in flight
+or granted last) may go ahead of the fair-queuing choice within the same class, as long
+as its finish tag is at most affinity_slack behind. Calls for the same model then run
+back-to-back, which keeps local models (Ollama) loaded and provider connections warm.
+"""
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import config
+
+# How often a queued call re-checks its cancel token (seconds)
+CANCEL_POLL_INTERVAL = 0.1
+
+# Wait-time history is kept for this many (tenant, class) pairs, most recently active first
+MAX_TRACKED_TENANTS = 256
+
+
+class _Waiter:
+    __slots__ = ("provider", "model", "tenant", "priority", "finish", "seq", "enqueued_at", "granted")
+
+    def __init__(self, provider, model, tenant, priority, finish, seq):
+        self.provider = provider
+        self.model = model
+        self.tenant = tenant
+        self.priority = priority
+        self.finish = finish
+        self.seq = seq
+        self.enqueued_at = time.time()
+        self.granted = threading.Event()
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls, shared by all debates in the process.
+
+    Args:
+        settings: Scheduler settings (default config.SCHEDULER_CONFIG)
+    """
+
+    def __init__(self, settings: Optional[dict] = None):
+        self.settings = settings or config.SCHEDULER_CONFIG
+        self.classes = list(self.settings["priority_classes"])
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._waiting = {}
+        self._in_flight = {}
+        self._class_in_flight = {}
+        self._tenant_in_flight = {}
+        self._virtual_time = {}
+        self._tenant_finish = {}
+        self._waits = {}
+        self._model_in_flight = {}
+        self._last_model = {}
+        self._model_switches = {}
+
+    def _tenant(self, tenant: str) -> dict:
+        return dict(self.settings["default_tenant"], **self.settings["tenants"].get(tenant, {}))
+
+    def capacity(self, provider: str) -> int:
+        limits = self.settings["provider_concurrency"]
+        return limits.get(provider, limits.get("default", 4))
+
+    def _class_limit(self, provider: str, priority: str) -> int:
+        share = self.settings["class_max_share"].get(priority, 1.0)
+        return max(1, int(self.capacity(provider) * share))
+
+    def _eligible(self, waiter: _Waiter) -> bool:
+        provider, priority = waiter.provider, waiter.priority
+        if self._in_flight.get(provider, 0) >= self.capacity(provider):
+            return False
+        if self._class_in_flight.get((provider, priority), 0) >= self._class_limit(provider, priority):
+            return False
+        return self._tenant_in_flight.get(waiter.tenant, 0) < self._tenant(waiter.tenant)["max_concurrency"]
+
+    def _grant(self, waiter: _Waiter) -> None:
+        provider = waiter.provider
+        self._waiting[provider].remove(waiter)
+        self._in_flight[provider] = self._in_flight.get(provider, 0) + 1
+        self._class_in_flight[(provider, waiter.priority)] = self._class_in_flight.get((provider, waiter.priority), 0) + 1
+        self._tenant_in_flight[waiter.tenant] = self._tenant_in_flight.get(waiter.tenant, 0) + 1
+        self._virtual_time[provider] = max(self._virtual_time.get(provider, 0.0), waiter.finish)
+        if waiter.model is not None:
+            model_key = (provider, waiter.model)
+            self._model_in_flight[model_key] = self._model_in_flight.get(model_key, 0) + 1
+            if self._last_model.get(provider, waiter.model) != waiter.model:
+                self._model_switches[provider] = self._model_switches.get(provider, 0) + 1
+            self._last_model[provider] = waiter.model
+        key = (waiter.tenant, waiter.priority)
+        waits = self._waits.pop(key, None) or deque(maxlen=2000)
+        waits.append(time.time() - waiter.enqueued_at)
+        self._waits[key] = waits
+        if len(self._waits) > MAX_TRACKED_TENANTS:
+            del self._waits[next(iter(self._waits))]
+        waiter.granted.set()
+
+    def _order(self, waiter: _Waiter) -> tuple:
+        return self.classes.index(waiter.priority), waiter.finish, waiter.seq
+
+    def _pick(self, provider: str, candidates: list) -> _Waiter:
+        best = min(candidates, key=self._order)
+        if not self.settings["model_affinity"]:
+            return best
+        warm = {model for (name, model), count in self._model_in_flight.items() if name == provider and count}
+        warm.add(self._last_model.get(provider))
+        if best.model in warm:
+            return best
+        # Let a warm-model call in the same class jump ahead by a bounded amount of virtual time
+        limit = best.finish + self.settings["affinity_slack"]
+        grouped = [w for w in candidates if w.model in warm and w.priority == best.priority and w.finish <= limit]
+        return min(grouped, key=self._order) if grouped else best
+
+    def _dispatch(self, provider: str) -> None:
+        # Called with the lock held: grant free slots to the best eligible waiters
+        while self._in_flight.get(provider, 0) < self.capacity(provider):
+            candidates = [w for w in self._waiting.get(provider, []) if self._eligible(w)]
+            if not candidates:
+                return
+            self._grant(self._pick(provider, candidates))
+
+    def acquire(
+        self,
+        provider: str,
+        tenant: str = "default",
+        priority: str = "interactive",
+        cost: float = 1.0,
+        cancel_token=None,
+        model: Optional[str] = None
+    ) -> _Waiter:
+        """
+        Wait for a slot on the provider.
+
+        Args:
+            provider: Provider whose quota the call uses (e.g. "openai")
+            tenant: Tenant the call is billed to
+            priority: One of SCHEDULER_CONFIG["priority_classes"]
+            cost: Call size for fair queuing (e.g. prompt + output tokens)
+            cancel_token: Optional CancelToken; a cancelled debate leaves the queue
+            model: Model the call is for, used to group calls by model (model affinity)
+
+        Returns:
+            The granted ticket, to pass to release()
+        """
+        if priority not in self.classes:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        with self._lock:
+            start = max(self._virtual_time.get(provider, 0.0), self._tenant_finish.get((provider, tenant), 0.0))
+            finish = start + cost / self._tenant(tenant)["weight"]
+            self._tenant_finish[(provider, tenant)] = finish
+            waiter = _Waiter(provider, model, tenant, priority, finish, next(self._seq))
+            self._waiting.setdefault(provider, []).append(waiter)
+            self._dispatch(provider)
+
+        while not waiter.granted.wait(CANCEL_POLL_INTERVAL if cancel_token else None):
+            if cancel_token and cancel_token.cancelled:
+                with self._lock:
+                    if not waiter.granted.is_set():
+                        self._waiting[provider].remove(waiter)
+                        cancel_token.raise_if_cancelled()
+                break
+
+        return waiter
+
+    def release(self, waiter: _Waiter) -> None:
+        """Return a slot and hand it to the next waiting call."""
+        with self._lock:
+            provider = waiter.provider
+            self._in_flight[provider] -= 1
+            self._class_in_flight[(provider, waiter.priority)] -= 1
+            self._tenant_in_flight[waiter.tenant] -= 1
+            if not self._tenant_in_flight[waiter.tenant] and not any(
+                w.tenant == waiter.tenant for waiting in self._waiting.values() for w in waiting
+            ):
+                # An idle tenant's finish tags are already behind virtual time; per-session tenants come and go
+                del self._tenant_in_flight[waiter.tenant]
+                for key in [key for key in self._tenant_finish if key[1] == waiter.tenant]:
+                    del self._tenant_finish[key]
+            if waiter.model is not None:
+                self._model_in_flight[(provider, waiter.model)] -= 1
+            # A release can unblock waiters on any provider that were held back by their tenant cap
+            for name in list(self._waiting):
+                self._dispatch(name)
+
+    @contextmanager
+    def slot(self, provider: str, tenant: str = "default", priority: str = "interactive", cost: float = 1.0,
+             cancel_token=None, model: Optional[str] = None):
+        """Hold a provider slot for the duration of one call."""
+        waiter = self.acquire(provider, tenant, priority, cost, cancel_token, model)
+        try:
+            yield waiter
+        finally:
+            self.release(waiter)
+
+    def slot_for(self, agent_config: dict, tenant: str, priority: str, cancel_token=None) -> Callable:
+        """Slot factory (cost -> context manager) for one agent's calls, as used by InstrumentedLLM."""
+        provider = agent_config.get("simulates", agent_config["provider"])
+        return lambda cost: self.slot(provider, tenant, priority, cost, cancel_token, agent_config["model"])
+
+    def metrics(self) -> dict:
+        """
+        Current queue depth and in-flight calls per provider, plus wait-time percentiles.
+
+        Returns:
+            Dictionary with "providers", "tenants" and "classes" sections (wait times in seconds)
+        """
+        with self._lock:
+            providers = {
+                name: {
+                    "capacity": self.capacity(name),
+                    "in_flight": self._in_flight.get(name, 0),
+                    "queued": len(self._waiting.get(name, [])),
+                    "model_switches": self._model_switches.get(name, 0)
+                }
+                for name in set(self._waiting) | set(self._in_flight)
+            }
+            waits = {key: list(values) for key, values in self._waits.items()}
+            queued = [w for waiting in self._waiting.values() for w in waiting]
+            tenant_in_flight = dict(self._tenant_in_flight)
+
+        def summary(values: list) -> dict:
+            return {
+                "calls": len(values),
+                "wait_p50_s": round(_percentile(values, 50), 3),
+                "wait_p95_s": round(_percentile(values, 95), 3)
+            }
+
+        tenants = {}
+        for tenant in {key[0] for key in waits} | set(tenant_in_flight):
+            tenants[tenant] = dict(
+                summary([v for (t, _), values in waits.items() if t == tenant for v in values]),
+                in_flight=tenant_in_flight.get(tenant, 0),
+                queued=sum(1 for w in queued if w.tenant == tenant)
+            )
+
+        classes = {
+            priority: dict(
+                summary([v for (_, p), values in waits.items() if p == priority for v in values]),
+                queued=sum(1 for w in queued if w.priority == priority)
+            )
+            for priority in self.classes
+        }
+
+        return {"providers": providers, "tenants": tenants, "classes": classes}
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Optional[LLMScheduler]:
+    """The process-wide scheduler, or None when SCHEDULER_CONFIG is disabled."""
+    global _scheduler
+    if not config.SCHEDULER_CONFIG["enabled"]:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
+
+def reset_scheduler() -> None:
+    """Drop the process-wide scheduler so the next get_scheduler() starts fresh (e.g. between benchmark runs)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
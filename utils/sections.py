@@ -0,0 +1,54 @@
+"""
+Section Parsing - Splits agent outputs into their numbered OUTPUT FORMAT sections
+"""
+import re
+
+# Matches "(1) THESIS:", "1. THESIS:", "**1) THESIS**:" and similar headings
+SECTION_PATTERN = re.compile(
+    r"^[ \t#*]*\(?(\d{1,2})[).:]\)?[ \t*]*([A-Z][A-Z &/'-]*[A-Z])[ \t*]*(?::\**|$)",
+    re.MULTILINE
+)
+
+# Number of numbered sections each agent's output format requires, per phase
+EXPECTED_SECTIONS = {
+    ("advocate", "initial"): 4,
+    ("critic", "initial"): 4,
+    ("contrarian", "initial"): 4,
+    ("domain_expert", "reality_check"): 5,
+    ("synthesizer", "synthesis"): 5,
+    ("judge", "judgment"): 6
+}
+
+
+def parse_sections(text: str) -> list:
+    """
+    Split an agent output into numbered sections.
+
+    Args:
+        text: Raw agent output
+
+    Returns:
+        List of {"number", "title", "body"} dicts in output order (empty if no headings found)
+    """
+    matches = list(SECTION_PATTERN.finditer(text or ""))
+    sections = []
+
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        sections.append({
+            "number": int(match.group(1)),
+            "title": match.group(2).strip(),
+            "body": text[match.end():end].strip()
+        })
+
+    return sections
+
+
+def section_completeness(text: str, agent_name: str, phase: str) -> float:
+    """Fraction of the expected numbered sections present in an output (1.0 if none expected)."""
+    expected = EXPECTED_SECTIONS.get((agent_name, phase))
+    if not expected:
+        return 1.0
+
+    numbers = {section["number"] for section in parse_sections(text)}
+    return len(numbers & set(range(1, expected + 1))) / expected
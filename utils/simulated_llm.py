@@ -0,0 +1,209 @@
+"""
+Simulated LLM - Offline stand-in provider for load testing and benchmarks
+
+Generates well-formed agent output (the numbered OUTPUT FORMAT sections requested in
+the prompt) of a target length after a simulated latency, without any network calls.
+Latency and output size come from recorded call profiles when available, so the
+orchestrator can be replayed against real traffic shapes at compressed time.
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+from crewai.llms.base_llm import BaseLLM
+
+from utils.cancellation import DebateCancelled
+from utils.sections import SECTION_PATTERN
+from utils.tokens import CHARS_PER_TOKEN
+
+FILLER = (
+    "The evidence suggests a measured rollout with clear milestones, explicit owners "
+    "and a review point once early customer signals are in. "
+)
+
+
+class SimulatedProvider:
+    """
+    Shared state for simulated calls: time compression, provider concurrency limits and
+    model residency (local servers such as Ollama keep only a few models loaded).
+
+    Args:
+        time_scale: Multiplier applied to every simulated latency (0.1 = 10x compression)
+        concurrency: Max in-flight calls per provider, e.g. {"openai": 8, "groq": 4}
+        seed: Optional seed for reproducible latency jitter
+        resident_models: Models a provider keeps loaded, e.g. {"ollama": 1}; a call to any
+            other model first swaps it in, evicting the least recently used one
+        swap_s: Uncompressed seconds one model swap adds to a call
+    """
+
+    def __init__(
+        self,
+        time_scale: float = 1.0,
+        concurrency: Optional[dict] = None,
+        seed: Optional[int] = None,
+        resident_models: Optional[dict] = None,
+        swap_s: float = 0.0
+    ):
+        self.time_scale = time_scale
+        self._limits = {name: threading.Semaphore(limit) for name, limit in (concurrency or {}).items()}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._waits = []
+        self._resident_limits = resident_models or {}
+        self._resident = {}
+        self._swaps = {}
+        self.swap_s = swap_s
+
+    @contextmanager
+    def slot(self, provider: str, model: Optional[str] = None):
+        """
+        Hold one of a provider's concurrent call slots (unbounded when not configured).
+
+        Yields:
+            Uncompressed seconds the call spends swapping its model in (0.0 when resident)
+        """
+        limit = self._limits.get(provider)
+        started = time.perf_counter()
+        if limit:
+            limit.acquire()
+        with self._lock:
+            self._waits.append((time.perf_counter() - started) / self.time_scale)
+            swap = self._load(provider, model)
+        try:
+            yield swap
+        finally:
+            if limit:
+                limit.release()
+
+    def _load(self, provider: str, model: Optional[str]) -> float:
+        # Called with the lock held: LRU residency per provider
+        capacity = self._resident_limits.get(provider)
+        if not capacity or model is None:
+            return 0.0
+        resident = self._resident.setdefault(provider, [])
+        if model in resident:
+            resident.remove(model)
+            resident.append(model)
+            return 0.0
+        if len(resident) >= capacity:
+            resident.pop(0)
+        resident.append(model)
+        self._swaps[provider] = self._swaps.get(provider, 0) + 1
+        return self.swap_s
+
+    def swaps(self) -> dict:
+        """Model swaps per provider with residency limits (the first load of each model counts)."""
+        with self._lock:
+            return dict(self._swaps)
+
+    def waits(self) -> list:
+        """Time each call spent waiting for a provider slot, in uncompressed seconds."""
+        with self._lock:
+            return list(self._waits)
+
+    def jitter(self) -> float:
+        with self._lock:
+            return self._random.uniform(0.85, 1.15)
+
+
+class SimulatedLLM(BaseLLM):
+    """
+    CrewAI-compatible LLM that returns synthetic output after a simulated delay.
+
+    Args:
+        model: Model name being simulated (e.g. "gpt-4o")
+        provider_name: Provider being simulated, used for concurrency limits
+        profiles: Recorded call profiles ({"latency_s", "output_tokens"}) consumed in order;
+            pass a deque to share one queue across an agent's per-phase LLM instances
+        output_tokens: Output size when no profile is left
+        tokens_per_second: Generation speed when no profile is left
+        simulator: Shared SimulatedProvider (time compression, concurrency limits)
+        max_tokens: Output cap, as for a real provider
+        truncate: Write the uncapped output and cut it off at max_tokens, as a real model
+            does when it runs out of tokens (trailing sections go missing), instead of
+            writing every section shorter
+    """
+
+    # Set by InstrumentedLLM; a cancelled call releases its provider slot immediately
+    cancel_token = None
+
+    def __init__(
+        self,
+        model: str,
+        provider_name: str = "simulated",
+        profiles: Optional[list] = None,
+        output_tokens: int = 600,
+        tokens_per_second: float = 100.0,
+        simulator: Optional[SimulatedProvider] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        truncate: bool = False
+    ):
+        super().__init__(model=model, temperature=temperature)
+        self.provider_name = provider_name
+        self.profiles = profiles if isinstance(profiles, deque) else deque(profiles or [])
+        self.output_tokens = output_tokens
+        self.tokens_per_second = tokens_per_second
+        self.simulator = simulator or SimulatedProvider()
+        self.max_tokens = max_tokens
+        self.truncate = truncate
+
+    def _next_profile(self) -> dict:
+        try:
+            return self.profiles.popleft()
+        except IndexError:
+            pass
+        return {
+            "output_tokens": self.output_tokens,
+            "latency_s": self.output_tokens / self.tokens_per_second
+        }
+
+    def call(self, messages, *args, **kwargs):
+        profile = self._next_profile()
+
+        output_tokens = profile["output_tokens"]
+        if self.max_tokens:
+            output_tokens = min(output_tokens, self.max_tokens)
+        latency = profile["latency_s"] * output_tokens / max(profile["output_tokens"], 1)
+
+        with self.simulator.slot(self.provider_name, self.model) as swap_s:
+            delay = (latency * self.simulator.jitter() + swap_s) * self.simulator.time_scale
+            if self.cancel_token is None:
+                time.sleep(delay)
+            elif self.cancel_token.wait(delay):
+                raise DebateCancelled(self.cancel_token.reason)
+
+        prompt = messages if isinstance(messages, str) else str((messages or [{}])[-1].get("content", ""))
+        if self.truncate and output_tokens < profile["output_tokens"]:
+            text = synthesize_output(prompt, profile["output_tokens"])[:output_tokens * CHARS_PER_TOKEN]
+        else:
+            text = synthesize_output(prompt, output_tokens)
+        return "Thought: I now can give a great answer\nFinal Answer: " + text
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+def synthesize_output(prompt: str, output_tokens: int) -> str:
+    """Build filler text of roughly output_tokens tokens using the section headings the prompt asks for."""
+    headings = []
+    for match in SECTION_PATTERN.finditer(prompt):
+        if (match.group(1), match.group(2)) not in headings:
+            headings.append((match.group(1), match.group(2)))
+
+    target_chars = output_tokens * CHARS_PER_TOKEN
+    if not headings:
+        return (FILLER * (target_chars // len(FILLER) + 1))[:target_chars]
+
+    per_section = max(target_chars // len(headings), len(FILLER))
+    body = (FILLER * (per_section // len(FILLER) + 1))[:per_section]
+    return "\n\n".join(f"({number}) {title}: {body}" for number, title in headings)
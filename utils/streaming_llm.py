@@ -0,0 +1,153 @@
+"""
+Streaming LLM - Provider calls that stop generating when their debate is cancelled
+
+CrewAI's LLM has no way to abandon a request once it is sent, so a cancelled debate's
+in-flight calls keep generating (and billing) until the provider finishes them.
+StreamingLLM calls LiteLLM directly with stream=True and, as soon as its cancel token
+fires, closes the stream. Closing the stream drops the HTTP connection, which is what
+makes the provider stop generating. Calls that fail with a transient provider error
+before any output arrives are retried with exponential backoff
+(config.STREAMING_CONFIG), as CrewAI's LLM would retry them.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+import litellm
+from crewai.llms.base_llm import BaseLLM
+
+import config
+from utils.cancellation import POLL_INTERVAL, DebateCancelled
+from utils.event_log import log_event
+
+# Provider errors worth retrying: rate limits, timeouts, dropped connections and outages
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.Timeout,
+    litellm.APIConnectionError,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError
+)
+
+
+def _close_stream(stream) -> None:
+    # LiteLLM's stream wrapper holds the provider's stream, which holds the HTTP response;
+    # close whichever of them can be closed
+    for target in (stream, getattr(stream, "completion_stream", None), getattr(stream, "response", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class StreamingLLM(BaseLLM):
+    """
+    CrewAI-compatible LLM that streams a LiteLLM completion and can abandon it mid-generation.
+
+    Args:
+        model: LiteLLM model string (e.g. "openai/gpt-4o")
+        temperature: Sampling temperature
+        max_tokens: Output cap
+        api_key: Provider API key
+        base_url: Provider base URL (e.g. a local Ollama server)
+        context_window: Context window reported to CrewAI
+    """
+
+    # Set by InstrumentedLLM; a cancelled call closes its stream immediately
+    cancel_token = None
+
+    def __init__(
+        self,
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        context_window: int = 8192
+    ):
+        super().__init__(model=model, temperature=temperature)
+        self.max_tokens = max_tokens
+        self.api_key = api_key
+        self.base_url = base_url
+        self.context_window = context_window
+
+    def _close_on_cancel(self, stream, done: threading.Event) -> None:
+        # Watches the token while the call waits on the provider (including before the first chunk)
+        while not done.wait(POLL_INTERVAL):
+            if self.cancel_token.cancelled:
+                _close_stream(stream)
+                return
+
+    def call(self, messages, *args, **kwargs):
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        if self.cancel_token:
+            self.cancel_token.raise_if_cancelled()
+
+        params = {"model": self.model, "messages": messages, "stream": True}
+        for name, value in (
+            ("temperature", self.temperature),
+            ("max_tokens", self.max_tokens),
+            ("api_key", self.api_key),
+            ("api_base", self.base_url),
+            ("stop", getattr(self, "stop", None) or None)
+        ):
+            if value is not None:
+                params[name] = value
+
+        settings = config.STREAMING_CONFIG
+        for attempt in range(settings["max_retries"] + 1):
+            parts = []
+            try:
+                return self._stream(params, parts)
+            except RETRYABLE_ERRORS as e:
+                # Output already streamed was billed; only calls that produced nothing are retried
+                if parts or attempt == settings["max_retries"]:
+                    raise
+                delay = min(settings["backoff_s"] * 2 ** attempt, settings["max_backoff_s"]) * random.uniform(0.5, 1.0)
+                log_event(
+                    "llm_retry", logging.WARNING,
+                    model=self.model, attempt=attempt + 1, delay_s=round(delay, 2), error=str(e)
+                )
+                if self.cancel_token is None:
+                    time.sleep(delay)
+                elif self.cancel_token.wait(delay):
+                    raise DebateCancelled(self.cancel_token.reason)
+
+    def _stream(self, params: dict, parts: list) -> str:
+        # One streamed completion; received text is appended to parts as it arrives
+        stream = litellm.completion(**params)
+
+        done = threading.Event()
+        if self.cancel_token:
+            threading.Thread(target=self._close_on_cancel, args=(stream, done), daemon=True).start()
+        try:
+            for chunk in stream:
+                if self.cancel_token and self.cancel_token.cancelled:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+        except Exception:
+            # Reading a stream closed on cancellation fails; report the cancellation instead
+            if not (self.cancel_token and self.cancel_token.cancelled):
+                raise
+        finally:
+            done.set()
+            _close_stream(stream)
+
+        if self.cancel_token and self.cancel_token.cancelled:
+            raise DebateCancelled(self.cancel_token.reason)
+        return "".join(parts)
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return self.context_window
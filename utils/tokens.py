@@ -0,0 +1,71 @@
+"""
+Token Estimation - Cheap local token counts for prompts and outputs
+
+count_tokens() uses the model's real tokenizer when tiktoken knows it (OpenAI models)
+and a per-provider characters-per-token ratio otherwise; both run locally in microseconds
+to milliseconds, so every call can be checked before it is sent.
+"""
+from functools import lru_cache
+from typing import Optional
+
+# Average characters per token for English prose across the supported providers
+CHARS_PER_TOKEN = 4
+
+# Llama-family tokenizers (Groq, Ollama) split English slightly finer than OpenAI's
+PROVIDER_CHARS_PER_TOKEN = {
+    "openai": 4.0,
+    "google": 4.0,
+    "groq": 3.6,
+    "ollama": 3.6
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=None)
+def _encoder(model_key: str):
+    provider, _, model = model_key.partition("/")
+    if provider != "openai":
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model_key: Optional[str] = None) -> int:
+    """
+    Count tokens for a specific model ("provider/model"), falling back to estimates.
+
+    Args:
+        text: Text to count
+        model_key: Provider-qualified model name, e.g. "openai/gpt-4o"
+
+    Returns:
+        Token count (exact for OpenAI models when tiktoken is installed)
+    """
+    if not text:
+        return 0
+    if not model_key:
+        return estimate_tokens(text)
+
+    encoder = _encoder(model_key)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+
+    ratio = PROVIDER_CHARS_PER_TOKEN.get(model_key.partition("/")[0], CHARS_PER_TOKEN)
+    return max(1, int(len(text) / ratio) + 1)
+
+
+def tokens_to_words(tokens: int) -> int:
+    """Convert a token count to an approximate English word count."""
+    return int(tokens * 0.75)
@@ -0,0 +1,55 @@
+"""
+Trace Recorder - Captures debate traces for offline load replay
+
+A trace holds one debate's arrival time, phase timings and every LLM call (agent,
+phase, model, prompt/output tokens, latency, offset from arrival). Traces are appended
+to a JSONL file and replayed by benchmarks/replay.py against a simulated provider.
+"""
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import config
+
+
+class TraceRecorder:
+    """Collects the LLM calls of one debate and writes them out as a trace."""
+
+    def __init__(self, debate_id: str, question: str, domain: str, arrival: Optional[float] = None):
+        self.trace = {
+            "debate_id": debate_id,
+            "arrival": arrival or time.time(),
+            "question_words": len(question.split()),
+            "domain": domain,
+            "calls": []
+        }
+        self._lock = threading.Lock()
+
+    def record_call(self, record: dict) -> None:
+        """InstrumentedLLM listener: store one call with its offset from the debate's arrival."""
+        call = dict(record)
+        call["offset_s"] = round(call.pop("started_at") - self.trace["arrival"], 4)
+        with self._lock:
+            self.trace["calls"].append(call)
+
+    def finish(self, results: dict, path: Optional[str] = None) -> dict:
+        """Attach phase timings from the debate results and append the trace to the JSONL file."""
+        self.trace["timings"] = dict(results.get("timings", {}))
+        self.trace["duration_s"] = round(time.time() - self.trace["arrival"], 3)
+
+        path = path or config.TRACE_CONFIG["path"]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as trace_file:
+            trace_file.write(json.dumps(self.trace) + "\n")
+
+        return self.trace
+
+
+def load_traces(path: Optional[str] = None) -> list:
+    """Load recorded traces ordered by arrival time."""
+    path = path or config.TRACE_CONFIG["path"]
+    with open(path, encoding="utf-8") as trace_file:
+        traces = [json.loads(line) for line in trace_file if line.strip()]
+    return sorted(traces, key=lambda trace: trace["arrival"])
@@ -1,3 +1,4 @@
 from workflows.debate_flow import run_debate
+from workflows.tournament_flow import run_tournament
 
-__all__ = ["run_debate"]
+__all__ = ["run_debate", "run_tournament"]
@@ -0,0 +1,512 @@
+"""
+Bulk Flow Orchestrator
+Runs many debates together as provider batch jobs, for nightly non-interactive workloads
+
+Each debate phase is compiled for every debate at once: the calls are grouped by
+provider and model, submitted as batch jobs (utils/batch_provider.py), polled until
+done, and then every debate advances to the next phase together. Prompts come from the
+same task builders as run_debate, so bulk and interactive debates produce the same
+kinds of output and share the phase cache. A debate whose prompt cannot fit its model,
+or whose call still fails after BULK_CONFIG["max_retries"] resubmissions, fails: it skips
+its remaining phases and is not saved to the debate library.
+
+The judge panel exists to cut latency, which bulk runs do not need, so bulk judgments
+always use the single judge.
+
+Usage:
+    python -m workflows.bulk_flow questions.jsonl --mode local
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Callable, Optional
+
+from agents import (
+    create_advocate_agent,
+    create_critic_agent,
+    create_contrarian_agent,
+    create_domain_expert_agent,
+    create_synthesizer_agent,
+    create_judge_agent
+)
+from utils.batch_provider import BatchJobError, get_batch_backend, task_messages
+from utils.context_guard import ContextBudgetError, condense, fit_context, limits_key
+from utils.debate_export import save_debate
+from utils.event_log import log_event
+from utils.llm_factory import estimate_call_cost, get_llm, model_key, route_models
+from utils.output_budget import configured_budget, get_output_budget, length_guidance
+from utils.phase_cache import get_phase_cache
+from utils.retrieval import debate_query, retrieve_passages
+from workflows.debate_flow import (
+    create_advocate_response_task,
+    create_advocate_task,
+    create_contrarian_task,
+    create_critic_response_task,
+    create_critic_task,
+    create_domain_expert_task,
+    create_judge_task,
+    create_synthesizer_task,
+    format_debate_context,
+    format_final_context,
+    format_positions,
+    format_references,
+    format_transcript
+)
+from workflows.domain_panel import domain_view, merge_expert_outputs, split_domains
+import config
+
+BULK_PHASES = ["initial", "response", "reality_check", "synthesis", "judgment"]
+
+AGENT_FACTORIES = {
+    "advocate": create_advocate_agent,
+    "critic": create_critic_agent,
+    "contrarian": create_contrarian_agent,
+    "synthesizer": create_synthesizer_agent,
+    "judge": create_judge_agent
+}
+
+
+class _BulkDebate:
+    """One debate's state in a bulk run: builds each phase's tasks and stores their outputs."""
+
+    def __init__(self, item: dict, run_id: str, agent_models: Optional[dict], model_tier: Optional[str]):
+        self.domains = split_domains(item.get("domain"))
+        question = item["question"]
+        domain = " + ".join(self.domains)
+        self.results = {
+            "debate_id": uuid.uuid4().hex,
+            "started_at": time.time(),
+            "question": question,
+            "domain": domain,
+            "mode": "bulk",
+            "rounds": [],
+            "budgets": {},
+            "models": {},
+            "timings": {},
+            "token_usage": {},
+            "reused_phases": {},
+            "bulk": {"run_id": run_id, "cost_usd": 0.0, "batches": []}
+        }
+        self.error = None
+        # Round 3 reference passages, kept here until the phase's outputs are collected
+        self.references = []
+
+        if agent_models:
+            self.agent_models = agent_models
+        elif config.ROUTER_CONFIG["enabled"] or model_tier:
+            routing = route_models(question, domain, tier_override=model_tier)
+            self.agent_models = routing["agent_models"]
+            self.results["routing"] = routing["decision"]
+        else:
+            self.agent_models = config.AGENT_MODELS
+
+    def _agent(self, agent_name: str, phase: str, domain: Optional[str] = None):
+        budget = get_output_budget(agent_name, phase)
+        if budget:
+            self.results["budgets"][f"{agent_name}:{phase}"] = budget
+        self.results["models"][f"{agent_name}:{phase}"] = model_key(self.agent_models[agent_name])
+        llm = get_llm(agent_name, self.agent_models[agent_name], max_tokens=budget)
+        if agent_name == "domain_expert":
+            return create_domain_expert_agent(domain, llm)
+        return AGENT_FACTORIES[agent_name](llm)
+
+    def _guidance(self, agent_name: str, phase: str) -> str:
+        return length_guidance(agent_name, phase, self.results["budgets"].get(f"{agent_name}:{phase}"))
+
+    def _guarded(self, agent, agent_name: str, phase: str, build: Callable[[int], str]) -> str:
+        context, report = fit_context(
+            build, agent, agent_name, self.agent_models[agent_name],
+            max_output=self.results["budgets"].get(f"{agent_name}:{phase}")
+        )
+        self.results["token_usage"][f"{agent_name}:{phase}"] = report
+        return context
+
+    def specs(self, phase: str) -> list:
+        """(agent_name, agent, task) for every call the phase makes, as in run_debate."""
+        results = self.results
+        question = results["question"]
+
+        if phase == "initial":
+            advocate = self._agent("advocate", phase)
+            critic = self._agent("critic", phase)
+            contrarian = self._agent("contrarian", phase)
+            return [
+                ("advocate", advocate, create_advocate_task(question, advocate, self._guidance("advocate", phase))),
+                ("critic", critic, create_critic_task(question, critic, self._guidance("critic", phase))),
+                ("contrarian", contrarian, create_contrarian_task(question, contrarian, self._guidance("contrarian", phase)))
+            ]
+
+        if phase == "response":
+            def round1_context(level: int) -> str:
+                return format_positions(results, level)
+
+            advocate = self._agent("advocate", phase)
+            critic = self._agent("critic", phase)
+            return [
+                ("advocate", advocate, create_advocate_response_task(
+                    self._guarded(advocate, "advocate", phase, round1_context), advocate, self._guidance("advocate", phase)
+                )),
+                ("critic", critic, create_critic_response_task(
+                    self._guarded(critic, "critic", phase, round1_context), critic, self._guidance("critic", phase)
+                ))
+            ]
+
+        if phase == "reality_check":
+            round1_output = results["rounds"][0]
+            specs = []
+            self.references = []
+            for expert_domain in self.domains:
+                domain_expert = self._agent("domain_expert", phase, expert_domain)
+                passages = []
+                if config.RETRIEVAL_CONFIG["enabled"]:
+                    passages = retrieve_passages(expert_domain, debate_query(question, [
+                        round1_output['advocate'], round1_output['critic'], round1_output['contrarian']
+                    ]))
+                self.references += [
+                    {"domain": expert_domain, "source": p["source"], "score": p["score"]} for p in passages
+                ]
+                view = domain_view(expert_domain) if len(self.domains) > 1 else condense
+                reference_block = format_references(expert_domain, passages)
+
+                def build(level: int, view=view, reference_block=reference_block) -> str:
+                    return format_debate_context(results, level, view, reference_block)
+
+                specs.append(("domain_expert", domain_expert, create_domain_expert_task(
+                    expert_domain,
+                    self._guarded(domain_expert, "domain_expert", phase, build),
+                    domain_expert,
+                    self._guidance("domain_expert", phase)
+                )))
+            return specs
+
+        if phase == "synthesis":
+            synthesizer = self._agent("synthesizer", phase)
+            return [("synthesizer", synthesizer, create_synthesizer_task(
+                self._guarded(synthesizer, "synthesizer", phase, lambda level: format_transcript(results, level)),
+                synthesizer,
+                self._guidance("synthesizer", phase)
+            ))]
+
+        judge = self._agent("judge", phase)
+        return [("judge", judge, create_judge_task(
+            self._guarded(judge, "judge", phase, lambda level: format_final_context(results, level)),
+            judge,
+            results["budgets"].get("judge:judgment")
+        ))]
+
+    def collect(self, phase: str, outputs: list) -> None:
+        """Store a phase's outputs in the same shape run_debate uses."""
+        results = self.results
+        if phase == "initial":
+            results["rounds"].append({
+                "round": 1,
+                "phase": "Initial Positions",
+                "advocate": outputs[0],
+                "critic": outputs[1],
+                "contrarian": outputs[2]
+            })
+        elif phase == "response":
+            results["rounds"].append({
+                "round": 2,
+                "phase": "Adversarial Responses",
+                "advocate_response": outputs[0],
+                "critic_response": outputs[1]
+            })
+        elif phase == "reality_check":
+            merged, duplicates = merge_expert_outputs(dict(zip(self.domains, outputs)))
+            if len(self.domains) > 1:
+                results["domain_panel"] = {
+                    "outputs": dict(zip(self.domains, outputs)),
+                    "duplicates_removed": duplicates
+                }
+            results["rounds"].append({
+                "round": 3,
+                "phase": "Domain Expert Reality Check",
+                "domain_expert": merged,
+                "references": self.references
+            })
+        else:
+            results[phase] = outputs[0]
+
+    def record(self, agent_name: str, phase: str, outcome: dict, discounted: bool) -> None:
+        """Add one call's counted tokens and estimated cost."""
+        usage = self.results["token_usage"].setdefault(f"{agent_name}:{phase}", {})
+        usage["calls"] = usage.get("calls", 0) + 1
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + outcome["prompt_tokens"]
+        usage["output_tokens"] = usage.get("output_tokens", 0) + outcome["output_tokens"]
+
+        settings = self.agent_models[agent_name]
+        cost = estimate_call_cost(limits_key(settings), outcome["prompt_tokens"], outcome["output_tokens"])["cost_usd"]
+        if discounted:
+            cost *= 1 - config.BULK_CONFIG["batch_discount"].get(settings.get("simulates", settings["provider"]), 0.0)
+        self.results["bulk"]["cost_usd"] = round(self.results["bulk"]["cost_usd"] + cost, 6)
+
+
+def run_batches(requests: list, mode: str = "auto", tenant: str = "default", poll_interval_s: Optional[float] = None) -> tuple:
+    """
+    Submit requests as batch jobs (one per provider and model) and wait for all of them.
+
+    Requests that fail are resubmitted up to BULK_CONFIG["max_retries"] times, within one
+    overall BULK_CONFIG["max_wait_hours"] window; requests still pending when it closes
+    count as timed out and are not retried.
+
+    Args:
+        requests: Dicts with "custom_id", "agent", "settings", "messages" and "max_tokens"
+        mode: Backend mode for utils.batch_provider.get_batch_backend
+        tenant: Scheduler tenant for providers called directly
+        poll_interval_s: Seconds between status checks (default from BULK_CONFIG)
+
+    Returns:
+        (custom_id -> outcome, list of job records); outcomes carry "job_id" and "batch_priced"
+    """
+    settings = config.BULK_CONFIG
+    poll_interval_s = settings["poll_interval_s"] if poll_interval_s is None else poll_interval_s
+    backends = {}
+    outcomes = {}
+    jobs = []
+    deadline = time.time() + settings["max_wait_hours"] * 3600
+
+    for attempt in range(settings["max_retries"] + 1):
+        pending = [request for request in requests if "content" not in outcomes.get(request["custom_id"], {})]
+        if not pending or time.time() > deadline:
+            break
+
+        groups = {}
+        for request in pending:
+            # The local stand-in plays the provider a simulated agent simulates
+            provider = request["settings"]["provider"]
+            if mode == "local":
+                provider = request["settings"].get("simulates", provider)
+            groups.setdefault((provider, request["settings"]["model"]), []).append(request)
+
+        submitted = []
+        for (provider, model), group in groups.items():
+            if provider not in backends:
+                backends[provider] = get_batch_backend(provider, mode, tenant)
+            backend = backends[provider]
+            size = settings["max_requests_per_batch"]
+            for start in range(0, len(group), size):
+                chunk = group[start:start + size]
+                record = {
+                    "provider": provider,
+                    "model": model,
+                    "job_id": backend.submit(chunk),
+                    "requests": len(chunk),
+                    "attempt": attempt,
+                    "submitted_at": time.time()
+                }
+                jobs.append(record)
+                submitted.append((backend, record, chunk))
+                log_event("batch_submitted", **record)
+
+        while submitted:
+            waiting = []
+            for backend, record, chunk in submitted:
+                try:
+                    done = backend.poll(record["job_id"])
+                except BatchJobError as e:
+                    done = {request["custom_id"]: {"error": str(e)} for request in chunk}
+                if done is None:
+                    waiting.append((backend, record, chunk))
+                    continue
+                record["wall_s"] = round(time.time() - record["submitted_at"], 2)
+                record["failed"] = sum(1 for request in chunk if "content" not in done.get(request["custom_id"], {}))
+                for request in chunk:
+                    outcome = done.get(request["custom_id"], {"error": "missing from batch output"})
+                    outcomes[request["custom_id"]] = dict(
+                        outcome, batch_priced=backend.uses_batch_pricing, job_id=record["job_id"]
+                    )
+                log_event("batch_completed", logging.WARNING if record["failed"] else logging.INFO, **record)
+            submitted = waiting
+            if submitted and time.time() > deadline:
+                # Give up on jobs past the completion window; their requests count as failed
+                for backend, record, chunk in submitted:
+                    backend.cancel(record["job_id"])
+                    for request in chunk:
+                        outcomes[request["custom_id"]] = {"error": "batch timed out", "job_id": record["job_id"]}
+                break
+            if submitted:
+                time.sleep(poll_interval_s)
+
+    return outcomes, jobs
+
+
+def run_bulk(
+    items: list,
+    agent_models: Optional[dict] = None,
+    model_tier: Optional[str] = None,
+    mode: str = "auto",
+    tenant: str = "default",
+    reuse_phases: Optional[bool] = None,
+    poll_interval_s: Optional[float] = None,
+    on_phase_complete: Optional[Callable[[str, dict], None]] = None
+) -> dict:
+    """
+    Run many debates phase by phase as batch jobs.
+
+    Args:
+        items: Dicts with "question" and optional "domain" (several domains joined with " + ")
+        agent_models: Optional per-agent model settings for every debate, bypassing the router
+        model_tier: Optional tier name from config.MODEL_TIERS forcing the router's choice
+        mode: "auto" (provider batch endpoints where available), "local" (file-based
+            stand-in provider) or "direct" (no batch endpoints)
+        tenant: Scheduler tenant for providers called directly
+        reuse_phases: Reuse agent outputs whose exact inputs were seen before (default from
+            config.PHASE_CACHE_CONFIG)
+        poll_interval_s: Seconds between batch status checks (default from BULK_CONFIG)
+        on_phase_complete: Optional callback(phase, phase summary) after each phase
+
+    Returns:
+        Dictionary with "run_id", per-debate "results" (run_debate's shape, plus "bulk"
+        with each debate's estimated cost), per-phase summaries, "jobs" and "failed" debates
+    """
+    run_id = uuid.uuid4().hex
+    started_at = time.time()
+    if reuse_phases is None:
+        reuse_phases = config.PHASE_CACHE_CONFIG["enabled"]
+    cache = get_phase_cache() if reuse_phases else None
+
+    debates = [_BulkDebate(item, run_id, agent_models, model_tier) for item in items]
+    phases = [phase for phase in BULK_PHASES
+              if (phase != "reality_check" or config.DEBATE_CONFIG["enable_domain_expert"])
+              and (phase != "response" or config.DEBATE_CONFIG["max_rounds"] >= 2)]
+    summary = {"run_id": run_id, "debates": len(debates), "phases": {}, "jobs": []}
+    log_event("bulk_start", run_id=run_id, debates=len(debates), mode=mode, phases=phases)
+
+    for phase in phases:
+        phase_started = time.time()
+        compiled = []
+        requests = []
+        reused = 0
+
+        for debate in debates:
+            if debate.error:
+                continue
+            try:
+                specs = debate.specs(phase)
+            except ContextBudgetError as e:
+                # One oversized prompt fails its own debate, not the whole run
+                debate.error = {"phase": phase, "error": str(e)}
+                log_event("bulk_debate_failed", logging.WARNING, debate_id=debate.results["debate_id"], **debate.error)
+                continue
+
+            outputs = [None] * len(specs)
+            keys = [None] * len(specs)
+            for index, (agent_name, agent, task) in enumerate(specs):
+                settings = debate.agent_models[agent_name]
+                budget = debate.results["budgets"].get(f"{agent_name}:{phase}")
+                if cache:
+                    keys[index] = cache.keys(
+                        agent_name, phase, settings, configured_budget(agent_name, phase), agent, task.description,
+                        debate.results["question"]
+                    )
+                    output, reuse = cache.get(*keys[index], debate.results["question"])
+                    if output is not None:
+                        outputs[index] = output
+                        debate.results["reused_phases"][f"{agent_name}:{phase}"] = reuse
+                        reused += 1
+                        continue
+                requests.append({
+                    "custom_id": f"{debate.results['debate_id']}:{phase}:{index}",
+                    "agent": agent_name,
+                    "settings": settings,
+                    "messages": task_messages(task),
+                    "max_tokens": budget
+                })
+            compiled.append((debate, specs, outputs, keys))
+
+        outcomes, jobs = run_batches(requests, mode, tenant, poll_interval_s) if requests else ({}, [])
+        summary["jobs"] += jobs
+
+        failed_calls = 0
+        for debate, specs, outputs, keys in compiled:
+            for index, (agent_name, _, _) in enumerate(specs):
+                if outputs[index] is not None:
+                    continue
+                outcome = outcomes.get(f"{debate.results['debate_id']}:{phase}:{index}", {"error": "not submitted"})
+                if "content" not in outcome:
+                    # A call that failed all its retries fails its debate; the other calls are still kept
+                    failed_calls += 1
+                    if not debate.error:
+                        debate.error = {"phase": phase, "agent": agent_name, "error": outcome.get("error")}
+                        log_event(
+                            "bulk_debate_failed", logging.WARNING, debate_id=debate.results["debate_id"], **debate.error
+                        )
+                    continue
+                outputs[index] = outcome["content"]
+                if outcome["job_id"] not in debate.results["bulk"]["batches"]:
+                    debate.results["bulk"]["batches"].append(outcome["job_id"])
+                debate.record(agent_name, phase, outcome, outcome["batch_priced"])
+                if cache and outputs[index]:
+                    cache.put(*keys[index], debate.results["question"], agent_name, phase, outputs[index])
+            if debate.error:
+                continue
+            debate.collect(phase, outputs)
+            debate.results["timings"][phase] = round(time.time() - phase_started, 2)
+
+        summary["phases"][phase] = {
+            "requests": len(requests),
+            "reused": reused,
+            "failed": failed_calls,
+            "jobs": len(jobs),
+            "wall_s": round(time.time() - phase_started, 2)
+        }
+        log_event("bulk_phase", run_id=run_id, phase=phase, **summary["phases"][phase])
+        if on_phase_complete:
+            on_phase_complete(phase, summary["phases"][phase])
+
+    for debate in debates:
+        if debate.error:
+            debate.results["bulk"]["error"] = debate.error
+        elif config.LIBRARY_CONFIG["enabled"]:
+            save_debate(debate.results)
+
+    summary["results"] = [debate.results for debate in debates]
+    summary["failed"] = [debate.results["debate_id"] for debate in debates if debate.error]
+    summary["cost_usd"] = round(sum(debate.results["bulk"]["cost_usd"] for debate in debates), 6)
+    summary["elapsed_s"] = round(time.time() - started_at, 2)
+    log_event(
+        "bulk_end", run_id=run_id, debates=len(debates), failed=len(summary["failed"]),
+        cost_usd=summary["cost_usd"], elapsed_s=summary["elapsed_s"]
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many debates as provider batch jobs")
+    parser.add_argument("questions", help='JSONL file with one {"question": ..., "domain": ...} per line')
+    parser.add_argument("--mode", choices=["auto", "local", "direct"], default="auto",
+                        help="auto: provider batch endpoints; local: file-based stand-in; direct: no batching")
+    parser.add_argument("--tier", default=None, help="Force a model tier from config.MODEL_TIERS")
+    parser.add_argument("--out", default=None, help="JSONL file for the debate results")
+    parser.add_argument("--poll-s", type=float, default=None, help="Seconds between batch status checks")
+    args = parser.parse_args()
+
+    with open(args.questions, encoding="utf-8") as questions_file:
+        items = [json.loads(line) for line in questions_file if line.strip()]
+
+    summary = run_bulk(
+        items,
+        model_tier=args.tier,
+        mode=args.mode,
+        poll_interval_s=args.poll_s,
+        on_phase_complete=lambda phase, stats: print(f"{phase}: {stats}")
+    )
+
+    out = args.out or config.BULK_CONFIG["results_path"]
+    directory = os.path.dirname(out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(out, "a", encoding="utf-8") as out_file:
+        for results in summary["results"]:
+            out_file.write(json.dumps(results, default=str) + "\n")
+
+    print(f"{summary['debates']} debates ({len(summary['failed'])} failed), {len(summary['jobs'])} batch jobs, "
+          f"est. ${summary['cost_usd']:.4f}, {summary['elapsed_s']}s -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@
 Debate Flow Orchestrator
 Manages the multi-agent debate workflow using CrewAI
 """
+import functools
+import logging
+import time
+import uuid
 from crewai import Task, Crew, Process
 from typing import Optional, Callable
 
@@ -13,45 +17,201 @@ from agents import (
     create_synthesizer_agent,
     create_judge_agent
 )
+from utils.llm_factory import get_llm, model_key, route_models, record_routing_decision
+from utils.debate_export import OUTPUT_AGENTS, save_debate
+from utils.output_budget import configured_budget, get_output_budget, length_guidance, update_budgets
+from utils.context_guard import TokenLedger, condense, context_limit, fit_context
+from utils.budget_planner import BudgetTracker
+from utils.sections import section_completeness
+from utils.tokens import count_tokens
+from utils.cancellation import CancelToken
+from utils.event_log import EventLogListener, log_event
+from utils.instrumented_llm import InstrumentedLLM
+from utils.phase_cache import get_phase_cache
+from utils.profiler import DebateProfiler
+from utils.retrieval import debate_query, format_passages, retrieve_passages
+from utils.scheduler import get_scheduler
+from utils.trace_recorder import TraceRecorder
+from workflows.domain_panel import domain_view, merge_expert_outputs, split_domains
+from workflows.judge_panel import run_judge_panel
+from workflows.parallel import kickoff_concurrently, single_task_crew
 import config
 
 
-def run_debate(
-    question: str,
-    domain: str = "general business strategy",
-    on_step_complete: Optional[Callable[[str, str], None]] = None
-) -> dict:
+def format_positions(results: dict, level: int = 0, older: bool = False, view: Callable = condense) -> str:
     """
-    Run a full multi-agent debate on a strategic question.
+    Render the question and Round 1 positions as embedded in Round 2 and Round 3 prompts.
 
     Args:
-        question: The strategic question to debate
-        domain: Domain context for the domain expert
-        on_step_complete: Optional callback(agent_name, output) called after each step
+        results: Debate results with Round 1 completed
+        level: Context guard degradation level (0 = full outputs)
+        older: Whether later rounds follow in the same prompt
+        view: condense-compatible view applied to each output (e.g. a domain focus)
+    """
+    round1_output = results["rounds"][0]
+    return f"""
+    ORIGINAL QUESTION: {results['question']}
+
+    ADVOCATE'S POSITION:
+    {view(round1_output['advocate'], 'advocate', level, older)}
+
+    CRITIC'S ANALYSIS:
+    {view(round1_output['critic'], 'critic', level, older)}
+
+    CONTRARIAN'S ALTERNATIVES:
+    {view(round1_output['contrarian'], 'contrarian', level, older)}
+    """
+
+
+def format_debate_context(
+    results: dict,
+    level: int = 0,
+    view: Callable = condense,
+    reference_block: str = ""
+) -> str:
+    """Render Round 1 and (when it ran) the Round 2 exchange for the domain expert."""
+    rounds = {round_data["round"]: round_data for round_data in results["rounds"]}
+    exchange = ""
+    if 2 in rounds:
+        exchange = f"""
+        ADVOCATE'S RESPONSE TO CRITICISM:
+        {view(rounds[2]['advocate_response'], 'advocate', level)}
+
+        CRITIC'S FOLLOW-UP:
+        {view(rounds[2]['critic_response'], 'critic', level)}
+        """
+    return f"""
+        {format_positions(results, level, older=True, view=view)}
+        {exchange}
+        {reference_block}
+        """
+
+
+def format_references(domain: str, passages: list) -> str:
+    """Reference block of retrieved passages for a domain expert prompt ("" when there are none)."""
+    if not passages:
+        return ""
+    return f"""
+            REFERENCE PASSAGES (from the {domain} document index; cite them as [n]):
+
+            {format_passages(passages)}
+            """
+
+
+def format_transcript(results: dict, level: int = 0) -> str:
+    """
+    Render the debate rounds so far as the transcript shown to the synthesizer and judge.
+
+    Args:
+        results: Debate results with the completed rounds
+        level: Context guard degradation level (0 = full transcript)
+    """
+    rounds = {round_data["round"]: round_data for round_data in results["rounds"]}
+    round1_output = rounds[1]
+    latest = max(rounds)
+
+    transcript = f"""
+    ORIGINAL QUESTION: {results['question']}
+
+    === ROUND 1: INITIAL POSITIONS ===
+
+    ADVOCATE:
+    {condense(round1_output['advocate'], 'advocate', level, older=True)}
+
+    CRITIC:
+    {condense(round1_output['critic'], 'critic', level, older=True)}
+
+    CONTRARIAN:
+    {condense(round1_output['contrarian'], 'contrarian', level, older=True)}
+    """
+
+    # Round 2 is skipped when a budget plan drops it
+    if 2 in rounds:
+        transcript += f"""
+    === ROUND 2: ADVERSARIAL EXCHANGE ===
+
+    ADVOCATE RESPONSE:
+    {condense(rounds[2]['advocate_response'], 'advocate', level, older=latest > 2)}
+
+    CRITIC RESPONSE:
+    {condense(rounds[2]['critic_response'], 'critic', level, older=latest > 2)}
+    """
+
+    if 3 in rounds:
+        transcript += f"""
+    === ROUND 3: DOMAIN EXPERT ===
+
+    {condense(rounds[3].get('domain_expert', ''), 'domain_expert', level)}
+        """
+
+    return transcript
+
+
+def format_final_context(results: dict, level: int = 0) -> str:
+    """Render the transcript plus synthesis shown to the judge."""
+    return f"""
+    {format_transcript(results, level)}
+
+    === SYNTHESIS ===
+
+    {condense(results['synthesis'], 'synthesizer', level)}
+    """
+
+
+# ============================================
+# LLM BUILDER (shared with workflows/tournament_flow.py)
+# ============================================
+
+def build_llm(
+    agent_name: str,
+    phase: str,
+    agent_config: dict,
+    budget: Optional[int] = None,
+    listeners: Optional[list] = None,
+    cancel_token: Optional[CancelToken] = None,
+    tenant: str = "default",
+    priority: str = "interactive"
+) -> InstrumentedLLM:
+    """
+    Build an agent's LLM for one phase.
+
+    Every call is capped at the output budget, reported to the listeners, refused if its
+    prompt cannot fit the model (context guard), stopped on cancellation and queued on
+    the shared provider scheduler.
+
+    Args:
+        agent_name: Agent the LLM is for
+        phase: Debate phase the calls belong to
+        agent_config: The agent's model settings
+        budget: Output token budget (None = uncapped)
+        listeners: InstrumentedLLM listeners (e.g. TokenLedger.record_call)
+        cancel_token: Optional CancelToken for the run
+        tenant: Tenant the calls are scheduled and capped under
+        priority: Scheduling class from config.SCHEDULER_CONFIG
 
     Returns:
-        Dictionary containing all debate outputs and final synthesis
+        InstrumentedLLM wrapping the provider LLM
     """
-    results = {
-        "question": question,
-        "domain": domain,
-        "rounds": []
-    }
+    scheduler = get_scheduler()
+    llm = get_llm(agent_name, agent_config, max_tokens=budget, streaming=cancel_token is not None)
+    return InstrumentedLLM(
+        llm, agent_name, phase,
+        listeners=listeners,
+        model=model_key(agent_config),
+        context_limit=context_limit(agent_config) if config.CONTEXT_GUARD_CONFIG["enabled"] else None,
+        max_output=budget,
+        cancel_token=cancel_token,
+        slot=scheduler.slot_for(agent_config, tenant, priority, cancel_token) if scheduler else None
+    )
 
-    # Create all agents
-    advocate = create_advocate_agent()
-    critic = create_critic_agent()
-    contrarian = create_contrarian_agent()
-    domain_expert = create_domain_expert_agent(domain)
-    synthesizer = create_synthesizer_agent()
-    judge = create_judge_agent()
 
-    # ============================================
-    # ROUND 1: Initial Positions (Parallel)
-    # ============================================
+# ============================================
+# TASK BUILDERS (shared with workflows/bulk_flow.py)
+# ============================================
 
-    # Task 1: Advocate's initial position
-    advocate_task = Task(
+def create_advocate_task(question: str, advocate, length: str = "") -> Task:
+    """Build the advocate's Round 1 task."""
+    return Task(
         description=f"""
         Analyze the following strategic question and build the strongest possible case FOR it:
 
@@ -62,13 +222,17 @@ def run_debate(
         (2) STRATEGIC CASE: 3-5 major arguments with evidence
         (3) ANTICIPATED OBJECTIONS: Top 2-3 objections and your preemptive rebuttals
         (4) CALL TO ACTION: What specific next step this analysis supports
+
+        {length}
         """,
         expected_output="A compelling, evidence-based case FOR the proposal",
         agent=advocate
     )
 
-    # Task 2: Critic's initial position
-    critic_task = Task(
+
+def create_critic_task(question: str, critic, length: str = "") -> Task:
+    """Build the critic's Round 1 task."""
+    return Task(
         description=f"""
         Analyze the following strategic question and identify all weaknesses, risks, and failure modes:
 
@@ -79,13 +243,17 @@ def run_debate(
         (2) KEY VULNERABILITIES: 3-5 specific weaknesses ranked by severity
         (3) FAILURE SCENARIOS: 2-3 concrete 'If X, then Y' failure paths
         (4) BURDEN OF PROOF: What evidence would be required to address your concerns
+
+        {length}
         """,
         expected_output="A thorough risk analysis with specific failure scenarios",
         agent=critic
     )
 
-    # Task 3: Contrarian's alternative approaches
-    contrarian_task = Task(
+
+def create_contrarian_task(question: str, contrarian, length: str = "") -> Task:
+    """Build the contrarian's Round 1 task."""
+    return Task(
         description=f"""
         Analyze the following strategic question and propose genuinely different alternative approaches:
 
@@ -96,257 +264,581 @@ def run_debate(
         (2) ALTERNATIVE APPROACHES: 2-3 genuinely different paths with rationale
         (3) HYBRID POSSIBILITIES: Elements that could be combined with the original proposal
         (4) UNEXPLORED QUESTIONS: What questions should we be asking that we aren't?
+
+        {length}
         """,
         expected_output="Alternative approaches and reframing of the problem",
         agent=contrarian
     )
 
-    # Run Round 1: Initial positions (parallel execution)
-    round1_crew = Crew(
-        agents=[advocate, critic, contrarian],
-        tasks=[advocate_task, critic_task, contrarian_task],
-        process=Process.sequential,  # CrewAI handles parallel internally
-        verbose=config.DEBATE_CONFIG["verbose"]
-    )
-
-    round1_results = round1_crew.kickoff()
 
-    # Store round 1 results
-    round1_output = {
-        "round": 1,
-        "phase": "Initial Positions",
-        "advocate": str(round1_results.tasks_output[0]) if round1_results.tasks_output else "",
-        "critic": str(round1_results.tasks_output[1]) if len(round1_results.tasks_output) > 1 else "",
-        "contrarian": str(round1_results.tasks_output[2]) if len(round1_results.tasks_output) > 2 else ""
-    }
-    results["rounds"].append(round1_output)
-
-    if on_step_complete:
-        on_step_complete("Round 1 Complete", "Initial positions from Advocate, Critic, and Contrarian")
-
-    # ============================================
-    # ROUND 2: Adversarial Responses
-    # ============================================
-
-    debate_context = f"""
-    ORIGINAL QUESTION: {question}
-
-    ADVOCATE'S POSITION:
-    {round1_output['advocate']}
-
-    CRITIC'S ANALYSIS:
-    {round1_output['critic']}
-
-    CONTRARIAN'S ALTERNATIVES:
-    {round1_output['contrarian']}
-    """
-
-    # Advocate responds to criticism
-    advocate_response_task = Task(
+def create_advocate_response_task(debate_context: str, advocate, length: str = "") -> Task:
+    """Build the advocate's Round 2 rebuttal over the Round 1 positions."""
+    return Task(
         description=f"""
-        Review the debate so far and respond to the Critic's concerns and Contrarian's alternatives:
+            Review the debate so far and respond to the Critic's concerns and Contrarian's alternatives:
 
-        {debate_context}
+            {debate_context}
 
-        Address the Critic's key vulnerabilities and explain why the proposed approach is still superior
-        to the Contrarian's alternatives. Acknowledge valid points but defend your core thesis.
-        """,
+            Address the Critic's key vulnerabilities and explain why the proposed approach is still superior
+            to the Contrarian's alternatives. Acknowledge valid points but defend your core thesis.
+
+            {length}
+            """,
         expected_output="Rebuttal addressing criticism while maintaining core argument",
         agent=advocate
     )
 
-    # Critic responds to advocate's rebuttals
-    critic_response_task = Task(
+
+def create_critic_response_task(debate_context: str, critic, length: str = "") -> Task:
+    """Build the critic's Round 2 follow-up over the Round 1 positions."""
+    return Task(
         description=f"""
-        Review the debate so far and evaluate whether your concerns have been adequately addressed:
+            Review the debate so far and evaluate whether your concerns have been adequately addressed:
 
-        {debate_context}
+            {debate_context}
 
-        Assess whether the Advocate's arguments hold up to scrutiny. Acknowledge what they got right,
-        but press on remaining weaknesses. Consider if the Contrarian's alternatives address your concerns better.
-        """,
+            Assess whether the Advocate's arguments hold up to scrutiny. Acknowledge what they got right,
+            but press on remaining weaknesses. Consider if the Contrarian's alternatives address your concerns better.
+
+            {length}
+            """,
         expected_output="Evaluation of rebuttals and remaining concerns",
         agent=critic
     )
 
-    round2_crew = Crew(
-        agents=[advocate, critic],
-        tasks=[advocate_response_task, critic_response_task],
-        process=Process.sequential,
-        verbose=config.DEBATE_CONFIG["verbose"]
-    )
-
-    round2_results = round2_crew.kickoff()
-
-    round2_output = {
-        "round": 2,
-        "phase": "Adversarial Responses",
-        "advocate_response": str(round2_results.tasks_output[0]) if round2_results.tasks_output else "",
-        "critic_response": str(round2_results.tasks_output[1]) if len(round2_results.tasks_output) > 1 else ""
-    }
-    results["rounds"].append(round2_output)
-
-    if on_step_complete:
-        on_step_complete("Round 2 Complete", "Adversarial responses exchanged")
 
-    # ============================================
-    # ROUND 3: Domain Expert Reality Check
-    # ============================================
+def create_synthesizer_task(transcript: str, synthesizer, length: str = "") -> Task:
+    """Build the synthesizer's task over the debate transcript."""
+    return Task(
+        description=f"""
+        Synthesize the entire debate into actionable strategic options:
 
-    if config.DEBATE_CONFIG["enable_domain_expert"]:
-        full_debate_context = f"""
-        {debate_context}
+        {transcript}
 
-        ADVOCATE'S RESPONSE TO CRITICISM:
-        {round2_output['advocate_response']}
-
-        CRITIC'S FOLLOW-UP:
-        {round2_output['critic_response']}
-        """
-
-        domain_expert_task = Task(
-            description=f"""
-            Review the entire debate and provide domain-specific grounding:
+        Provide:
+        (1) CONVERGENCE POINTS: Where all/most perspectives agreed
+        (2) PRODUCTIVE TENSIONS: Genuine disagreements representing real trade-offs
+        (3) STRATEGIC OPTIONS: 2-4 distinct approaches synthesized from the debate
+        (4) DECISION CRITERIA: Framework for choosing between options
+        (5) OPEN QUESTIONS: What remains unresolved
 
-            {full_debate_context}
+        {length}
+        """,
+        expected_output="Synthesized strategic options with clear trade-offs",
+        agent=synthesizer
+    )
 
-            As a domain expert in {domain}, provide:
-            (1) DOMAIN CONTEXT: Key facts the debate must account for
-            (2) REGULATORY CONSIDERATIONS: What compliance/regulatory factors apply
-            (3) IMPLEMENTATION REALITIES: What the debate is getting right/wrong about feasibility
-            (4) PRECEDENTS: Relevant examples from this domain with lessons
-            (5) CRITICAL DEPENDENCIES: What must be true for any approach to succeed
-            """,
-            expected_output="Domain-grounded reality check on the debate",
-            agent=domain_expert
-        )
 
-        domain_crew = Crew(
-            agents=[domain_expert],
-            tasks=[domain_expert_task],
-            process=Process.sequential,
-            verbose=config.DEBATE_CONFIG["verbose"]
-        )
+def create_judge_task(final_context: str, judge, budget: Optional[int] = None) -> Task:
+    """Build the single judge's task over the full transcript plus synthesis (budget: output token cap)."""
+    return Task(
+        description=f"""
+        Evaluate the entire debate and synthesis, then provide your final assessment:
 
-        domain_results = domain_crew.kickoff()
+        {final_context}
 
-        round3_output = {
-            "round": 3,
-            "phase": "Domain Expert Reality Check",
-            "domain_expert": str(domain_results.tasks_output[0]) if domain_results.tasks_output else ""
-        }
-        results["rounds"].append(round3_output)
+        Provide:
+        (1) EXECUTIVE ASSESSMENT: 2-3 sentence summary of what this debate revealed
+        (2) ARGUMENT SCORECARD: Which arguments survived/failed scrutiny
+        (3) EVIDENCE QUALITY: What was well-supported vs. speculative
+        (4) REMAINING UNCERTAINTIES: What we still don't know (ranked by importance)
+        (5) DECISION READINESS: Is this ready for decision? If not, what's needed?
+        (6) RECOMMENDATION: Your advised course of action (clearly marked as opinion)
 
-        if on_step_complete:
-            on_step_complete("Round 3 Complete", "Domain expert provided reality check")
+        {length_guidance("judge", "judgment", budget)}
+        """,
+        expected_output="Final judgment and recommendation for the decision-maker",
+        agent=judge
+    )
 
-    # ============================================
-    # SYNTHESIS PHASE
-    # ============================================
 
-    all_debate_content = f"""
-    ORIGINAL QUESTION: {question}
+def create_domain_expert_task(domain: str, debate_context: str, domain_expert, length: str = "") -> Task:
+    """Build one domain expert's reality-check task over the (focused) debate context."""
+    return Task(
+        description=f"""
+        Review the entire debate and provide domain-specific grounding:
 
-    === ROUND 1: INITIAL POSITIONS ===
+        {debate_context}
 
-    ADVOCATE:
-    {round1_output['advocate']}
+        As a domain expert in {domain}, provide:
+        (1) DOMAIN CONTEXT: Key facts the debate must account for
+        (2) REGULATORY CONSIDERATIONS: What compliance/regulatory factors apply
+        (3) IMPLEMENTATION REALITIES: What the debate is getting right/wrong about feasibility
+        (4) PRECEDENTS: Relevant examples from this domain with lessons
+        (5) CRITICAL DEPENDENCIES: What must be true for any approach to succeed
 
-    CRITIC:
-    {round1_output['critic']}
+        {length}
+        """,
+        expected_output="Domain-grounded reality check on the debate",
+        agent=domain_expert
+    )
 
-    CONTRARIAN:
-    {round1_output['contrarian']}
 
-    === ROUND 2: ADVERSARIAL EXCHANGE ===
+def run_debate(
+    question: str,
+    domain: str = "general business strategy",
+    on_step_complete: Optional[Callable[[str, str], None]] = None,
+    model_tier: Optional[str] = None,
+    agent_models: Optional[dict] = None,
+    cancel_token: Optional[CancelToken] = None,
+    profile: bool = False,
+    reuse_phases: Optional[bool] = None,
+    tenant: str = "default",
+    priority: str = "interactive",
+    max_cost_usd: Optional[float] = None,
+    max_latency_s: Optional[float] = None
+) -> dict:
+    """
+    Run a full multi-agent debate on a strategic question.
 
-    ADVOCATE RESPONSE:
-    {round2_output['advocate_response']}
+    Args:
+        question: The strategic question to debate
+        domain: Domain context for the domain expert; several domains (a list, or a string
+            joined with " + ") get one concurrent expert each, merged into one Round 3 entry
+        on_step_complete: Optional callback(agent_name, output) called after each step
+        model_tier: Optional tier name from config.MODEL_TIERS forcing the router's choice
+        agent_models: Optional per-agent model settings, bypassing the router (e.g. simulated providers)
+        cancel_token: Optional CancelToken; once cancelled the debate raises DebateCancelled
+            at the next phase boundary and in-flight calls stop waiting
+        profile: Record per-phase wall/CPU/allocation profiles split into local overhead vs.
+            network wait in results["profile"], and export a speedscope flamegraph
+        reuse_phases: Reuse agent outputs whose exact inputs were seen before (default from
+            config.PHASE_CACHE_CONFIG); reused outputs are listed in results["reused_phases"]
+        tenant: Tenant the debate's LLM calls are scheduled and capped under
+        priority: Scheduling class from config.SCHEDULER_CONFIG ("interactive", "api", "batch")
+        max_cost_usd: Optional dollar budget; rounds, models and output caps are planned to fit
+            it and re-planned between phases, with planned vs. actual spend in results["budget"]
+        max_latency_s: Optional wall-clock budget in seconds, planned and enforced the same way
 
-    CRITIC RESPONSE:
-    {round2_output['critic_response']}
+    Returns:
+        Dictionary containing all debate outputs and final synthesis
     """
+    started_at = time.time()
+    domains = split_domains(domain)
+    domain = " + ".join(domains)
 
-    if config.DEBATE_CONFIG["enable_domain_expert"]:
-        all_debate_content += f"""
-    === ROUND 3: DOMAIN EXPERT ===
+    results = {
+        "debate_id": uuid.uuid4().hex,
+        "started_at": started_at,
+        "question": question,
+        "domain": domain,
+        "rounds": [],
+        "budgets": {},
+        "models": {},
+        "timings": {},
+        "token_usage": {},
+        "reused_phases": {}
+    }
 
-    {results['rounds'][-1].get('domain_expert', '')}
-        """
+    if reuse_phases is None:
+        reuse_phases = config.PHASE_CACHE_CONFIG["enabled"]
+    cache = get_phase_cache() if reuse_phases else None
+
+    ledger = TokenLedger()
+    listeners = [ledger.record_call, EventLogListener(results["debate_id"]).record_call]
+    recorder = None
+    if config.TRACE_CONFIG["enabled"]:
+        recorder = TraceRecorder(results["debate_id"], question, domain, arrival=started_at)
+        listeners.append(recorder.record_call)
+
+    profiler = None
+    if profile:
+        profiler = DebateProfiler(results["debate_id"])
+        listeners.append(profiler.record_call)
+
+    try:
+        # Pick a model per agent from the tier ladder (or keep the configured models)
+        if not agent_models:
+            if config.ROUTER_CONFIG["enabled"] or model_tier:
+                routing = route_models(question, domain, tier_override=model_tier)
+                agent_models = routing["agent_models"]
+                results["routing"] = routing["decision"]
+            else:
+                agent_models = config.AGENT_MODELS
+
+        # Fit rounds, models and output caps to the budget; later phases are re-planned as spend comes in
+        tracker = None
+        if max_cost_usd is not None or max_latency_s is not None:
+            tracker = BudgetTracker(
+                agent_models, max_cost_usd, max_latency_s, started_at=started_at, domain_experts=len(domains)
+            )
+            agent_models = dict(tracker.plan["agent_models"])
+            listeners.append(tracker.record_call)
+            log_event(
+                "budget_planned",
+                debate_id=results["debate_id"],
+                max_cost_usd=max_cost_usd,
+                max_latency_s=max_latency_s,
+                estimate=tracker.plan["estimate"],
+                moves=tracker.plan["moves"],
+                feasible=tracker.plan["feasible"]
+            )
+
+        log_event(
+            "debate_start",
+            debate_id=results["debate_id"],
+            domain=domain,
+            tenant=tenant,
+            priority=priority,
+            question_words=len(question.split()),
+            models={agent_name: model_key(settings) for agent_name, settings in agent_models.items()}
+        )
 
-    synthesizer_task = Task(
-        description=f"""
-        Synthesize the entire debate into actionable strategic options:
+        def llm_for(agent_name: str, phase: str):
+            # Output budgets differ per phase, so each phase gets its own capped LLM
+            budget = (tracker and tracker.output_cap(agent_name, phase)) or get_output_budget(agent_name, phase)
+            if budget:
+                results["budgets"][f"{agent_name}:{phase}"] = budget
+            # The model actually used, after routing and any budget downgrade
+            results["models"][f"{agent_name}:{phase}"] = model_key(agent_models[agent_name])
+            # Every call is counted before it is sent and refused if it cannot fit the model
+            return build_llm(agent_name, phase, agent_models[agent_name], budget, listeners, cancel_token, tenant, priority)
+
+        def check_cancelled():
+            # Stop between phases once the caller has abandoned the debate
+            if cancel_token and cancel_token.cancelled:
+                log_event("debate_cancelled", logging.WARNING, debate_id=results["debate_id"], reason=cancel_token.reason)
+                cancel_token.raise_if_cancelled()
+
+        def enforce_budget() -> None:
+            # Re-plan the remaining phases against what is left of the budget
+            if tracker and tracker.checkpoint(list(results["timings"])):
+                agent_models.update(tracker.plan["agent_models"])
+                log_event(
+                    "budget_replanned", logging.WARNING,
+                    debate_id=results["debate_id"], **tracker.replans[-1]
+                )
+
+        def planned(phase: str) -> bool:
+            return tracker is None or tracker.planned(phase)
+
+        def guidance(agent_name: str, phase: str) -> str:
+            return length_guidance(agent_name, phase, results["budgets"].get(f"{agent_name}:{phase}"))
+
+        def begin_phase(phase: str, agents: list) -> None:
+            if profiler:
+                profiler.begin(phase)
+            log_event("phase_start", debate_id=results["debate_id"], phase=phase, agents=agents)
+
+        def log_outputs(outputs: dict) -> None:
+            for key, text in outputs.items():
+                if key not in OUTPUT_AGENTS or not isinstance(text, str):
+                    continue
+                agent_name, phase = OUTPUT_AGENTS[key]
+                fields = {
+                    "debate_id": results["debate_id"],
+                    "agent": agent_name,
+                    "phase": phase,
+                    "output_tokens": count_tokens(text, model_key(agent_models[agent_name])),
+                    "completeness": section_completeness(text, agent_name, phase)
+                }
+                if config.EVENT_LOG_CONFIG["include_text"]:
+                    fields["text"] = text
+                log_event("agent_output", **fields)
+
+        def run_tasks(phase: str, specs: list, concurrent: bool = False) -> list:
+            # Run (agent_name, agent, task) specs as one crew (or one crew each, concurrently),
+            # skipping tasks with cached outputs. A spec may name its own phase as a fourth
+            # item when one step spans phases (the judge panel's scorecards and overview).
+            outputs = [None] * len(specs)
+            keys = [None] * len(specs)
+            phases = [spec[3] if len(spec) > 3 else phase for spec in specs]
+
+            if cache:
+                for index, (agent_name, agent, task, *_) in enumerate(specs):
+                    keys[index] = cache.keys(
+                        agent_name, phases[index], agent_models[agent_name],
+                        configured_budget(agent_name, phases[index]), agent, task.description, question
+                    )
+                    output, reuse = cache.get(*keys[index], question)
+                    if output is not None:
+                        outputs[index] = output
+                        results["reused_phases"][f"{agent_name}:{phases[index]}"] = reuse
+                        log_event(
+                            "phase_reused", debate_id=results["debate_id"],
+                            agent=agent_name, phase=phases[index], reuse=reuse
+                        )
+
+            pending = [index for index, output in enumerate(outputs) if output is None]
+            if pending:
+                if concurrent:
+                    task_outputs = kickoff_concurrently([single_task_crew(*specs[index][1:3]) for index in pending])
+                else:
+                    crew = Crew(
+                        agents=[specs[index][1] for index in pending],
+                        tasks=[specs[index][2] for index in pending],
+                        process=Process.sequential,  # CrewAI handles parallel internally
+                        verbose=config.DEBATE_CONFIG["verbose"]
+                    )
+                    task_outputs = crew.kickoff().tasks_output
+                for position, index in enumerate(pending):
+                    outputs[index] = str(task_outputs[position]) if position < len(task_outputs) else ""
+                    if cache and outputs[index]:
+                        cache.put(*keys[index], question, specs[index][0], phases[index], outputs[index])
+
+            return outputs
+
+        def guarded_context(agent, agent_name: str, phase: str, build: Callable[[int], str]) -> str:
+            # Degrade the embedded transcript until the prompt fits the agent's model
+            context, report = fit_context(
+                build, agent, agent_name, agent_models[agent_name],
+                max_output=results["budgets"].get(f"{agent_name}:{phase}")
+            )
+            results["token_usage"][f"{agent_name}:{phase}"] = report
+            if report["degradation"] != "full":
+                log_event(
+                    "context_degraded", logging.WARNING,
+                    debate_id=results["debate_id"], agent=agent_name, phase=phase, **report
+                )
+            return context
+
+        check_cancelled()
+
+        begin_phase("initial", ["advocate", "critic", "contrarian"])
+
+        # Create all agents
+        advocate = create_advocate_agent(llm_for("advocate", "initial"))
+        critic = create_critic_agent(llm_for("critic", "initial"))
+        contrarian = create_contrarian_agent(llm_for("contrarian", "initial"))
+
+        # ============================================
+        # ROUND 1: Initial Positions (Parallel)
+        # ============================================
+
+        advocate_task = create_advocate_task(question, advocate, guidance("advocate", "initial"))
+        critic_task = create_critic_task(question, critic, guidance("critic", "initial"))
+        contrarian_task = create_contrarian_task(question, contrarian, guidance("contrarian", "initial"))
+
+        # Run Round 1: Initial positions (parallel execution)
+        phase_started = time.time()
+        round1_results = run_tasks("initial", [
+            ("advocate", advocate, advocate_task),
+            ("critic", critic, critic_task),
+            ("contrarian", contrarian, contrarian_task)
+        ])
+        results["timings"]["initial"] = round(time.time() - phase_started, 2)
+
+        # Store round 1 results
+        round1_output = {
+            "round": 1,
+            "phase": "Initial Positions",
+            "advocate": round1_results[0],
+            "critic": round1_results[1],
+            "contrarian": round1_results[2]
+        }
+        results["rounds"].append(round1_output)
+        log_outputs(round1_output)
 
-        {all_debate_content}
+        if on_step_complete:
+            on_step_complete("Round 1 Complete", "Initial positions from Advocate, Critic, and Contrarian")
+
+        check_cancelled()
+        enforce_budget()
+
+        # ============================================
+        # ROUND 2: Adversarial Responses
+        # ============================================
+
+        def round1_context(level: int) -> str:
+            return format_positions(results, level)
+
+        round2_output = None
+        if planned("response") and config.DEBATE_CONFIG["max_rounds"] >= 2:
+            begin_phase("response", ["advocate", "critic"])
+
+            advocate = create_advocate_agent(llm_for("advocate", "response"))
+            critic = create_critic_agent(llm_for("critic", "response"))
+
+            advocate_response_task = create_advocate_response_task(
+                guarded_context(advocate, "advocate", "response", round1_context), advocate, guidance("advocate", "response")
+            )
+            critic_response_task = create_critic_response_task(
+                guarded_context(critic, "critic", "response", round1_context), critic, guidance("critic", "response")
+            )
+
+            phase_started = time.time()
+            round2_results = run_tasks("response", [
+                ("advocate", advocate, advocate_response_task),
+                ("critic", critic, critic_response_task)
+            ])
+            results["timings"]["response"] = round(time.time() - phase_started, 2)
+
+            round2_output = {
+                "round": 2,
+                "phase": "Adversarial Responses",
+                "advocate_response": round2_results[0],
+                "critic_response": round2_results[1]
+            }
+            results["rounds"].append(round2_output)
+            log_outputs(round2_output)
+
+            if on_step_complete:
+                on_step_complete("Round 2 Complete", "Adversarial responses exchanged")
+
+        check_cancelled()
+        enforce_budget()
+
+        # ============================================
+        # ROUND 3: Domain Expert Reality Check
+        # ============================================
+
+        if config.DEBATE_CONFIG["enable_domain_expert"] and planned("reality_check"):
+            begin_phase("reality_check", ["domain_expert"] * len(domains))
+
+            # One expert per domain, each seeing the debate sections relevant to its domain
+            expert_specs = []
+            references = []
+            for expert_domain in domains:
+                domain_expert = create_domain_expert_agent(expert_domain, llm_for("domain_expert", "reality_check"))
+
+                # Ground the domain expert (and only the domain expert) in indexed reference documents
+                passages = []
+                if config.RETRIEVAL_CONFIG["enabled"]:
+                    passages = retrieve_passages(expert_domain, debate_query(question, [
+                        round1_output['advocate'], round1_output['critic'], round1_output['contrarian']
+                    ]))
+                references += [{"domain": expert_domain, "source": p["source"], "score": p["score"]} for p in passages]
+
+                build = functools.partial(
+                    format_debate_context, results,
+                    view=domain_view(expert_domain) if len(domains) > 1 else condense,
+                    reference_block=format_references(expert_domain, passages)
+                )
+                domain_expert_task = create_domain_expert_task(
+                    expert_domain,
+                    guarded_context(domain_expert, "domain_expert", "reality_check", build),
+                    domain_expert,
+                    guidance("domain_expert", "reality_check")
+                )
+                expert_specs.append(("domain_expert", domain_expert, domain_expert_task))
+
+            phase_started = time.time()
+            domain_results = run_tasks("reality_check", expert_specs, concurrent=len(expert_specs) > 1)
+            results["timings"]["reality_check"] = round(time.time() - phase_started, 2)
+
+            merged, duplicates = merge_expert_outputs(dict(zip(domains, domain_results)))
+            if len(domains) > 1:
+                results["domain_panel"] = {
+                    "outputs": dict(zip(domains, domain_results)),
+                    "duplicates_removed": duplicates
+                }
+
+            round3_output = {
+                "round": 3,
+                "phase": "Domain Expert Reality Check",
+                "domain_expert": merged,
+                "references": references
+            }
+            results["rounds"].append(round3_output)
+            log_outputs(round3_output)
+
+            if on_step_complete:
+                on_step_complete("Round 3 Complete", "Domain expert provided reality check")
+
+            check_cancelled()
+            enforce_budget()
+
+        # ============================================
+        # SYNTHESIS PHASE
+        # ============================================
+
+        begin_phase("synthesis", ["synthesizer"])
+
+        synthesizer = create_synthesizer_agent(llm_for("synthesizer", "synthesis"))
+
+        synthesizer_task = create_synthesizer_task(
+            guarded_context(synthesizer, "synthesizer", "synthesis", lambda level: format_transcript(results, level)),
+            synthesizer,
+            guidance("synthesizer", "synthesis")
+        )
 
-        Provide:
-        (1) CONVERGENCE POINTS: Where all/most perspectives agreed
-        (2) PRODUCTIVE TENSIONS: Genuine disagreements representing real trade-offs
-        (3) STRATEGIC OPTIONS: 2-4 distinct approaches synthesized from the debate
-        (4) DECISION CRITERIA: Framework for choosing between options
-        (5) OPEN QUESTIONS: What remains unresolved
-        """,
-        expected_output="Synthesized strategic options with clear trade-offs",
-        agent=synthesizer
-    )
+        phase_started = time.time()
+        results["synthesis"] = run_tasks("synthesis", [("synthesizer", synthesizer, synthesizer_task)])[0]
+        results["timings"]["synthesis"] = round(time.time() - phase_started, 2)
+        log_outputs({"synthesis": results["synthesis"]})
 
-    synthesis_crew = Crew(
-        agents=[synthesizer],
-        tasks=[synthesizer_task],
-        process=Process.sequential,
-        verbose=config.DEBATE_CONFIG["verbose"]
-    )
+        if on_step_complete:
+            on_step_complete("Synthesis Complete", "Options synthesized from debate")
 
-    synthesis_results = synthesis_crew.kickoff()
+        check_cancelled()
+        enforce_budget()
 
-    results["synthesis"] = str(synthesis_results.tasks_output[0]) if synthesis_results.tasks_output else ""
+        # ============================================
+        # JUDGMENT PHASE
+        # ============================================
 
-    if on_step_complete:
-        on_step_complete("Synthesis Complete", "Options synthesized from debate")
+        begin_phase("judgment", ["judge_panel"] if config.DEBATE_CONFIG["judge_panel"] else ["judge"])
 
-    # ============================================
-    # JUDGMENT PHASE
-    # ============================================
+        phase_started = time.time()
 
-    final_context = f"""
-    {all_debate_content}
+        if config.DEBATE_CONFIG["judge_panel"]:
+            panel = run_judge_panel(results, llm_for, guarded_context, run_tasks)
+            results["judgment"] = panel["judgment"]
+            results["judge_panel"] = panel["panel"]
+        else:
+            judge = create_judge_agent(llm_for("judge", "judgment"))
+            judge_task = create_judge_task(
+                guarded_context(judge, "judge", "judgment", lambda level: format_final_context(results, level)), judge, results["budgets"].get("judge:judgment")
+            )
+            results["judgment"] = run_tasks("judgment", [("judge", judge, judge_task)])[0]
 
-    === SYNTHESIS ===
+        results["timings"]["judgment"] = round(time.time() - phase_started, 2)
+        log_outputs({"judgment": results["judgment"]})
 
-    {results['synthesis']}
-    """
+        if on_step_complete:
+            on_step_complete("Judgment Complete", "Final assessment delivered")
 
-    judge_task = Task(
-        description=f"""
-        Evaluate the entire debate and synthesis, then provide your final assessment:
+        begin_phase("finalize", [])
 
-        {final_context}
+        # Merge the counted per-call tokens into the pre-flight reports
+        for key, usage in ledger.usage.items():
+            results["token_usage"].setdefault(key, {}).update(usage)
 
-        Provide:
-        (1) EXECUTIVE ASSESSMENT: 2-3 sentence summary of what this debate revealed
-        (2) ARGUMENT SCORECARD: Which arguments survived/failed scrutiny
-        (3) EVIDENCE QUALITY: What was well-supported vs. speculative
-        (4) REMAINING UNCERTAINTIES: What we still don't know (ranked by importance)
-        (5) DECISION READINESS: Is this ready for decision? If not, what's needed?
-        (6) RECOMMENDATION: Your advised course of action (clearly marked as opinion)
-        """,
-        expected_output="Final judgment and recommendation for the decision-maker",
-        agent=judge
-    )
+        if recorder:
+            recorder.finish(results)
 
-    judge_crew = Crew(
-        agents=[judge],
-        tasks=[judge_task],
-        process=Process.sequential,
-        verbose=config.DEBATE_CONFIG["verbose"]
-    )
+        # Feed observed output usage back into the adaptive budgets (planned caps are per-request, not defaults)
+        if results["budgets"] and not tracker:
+            update_budgets(results)
+
+        if tracker:
+            results["budget"] = tracker.report(results["timings"])
 
-    judge_results = judge_crew.kickoff()
+        # Record the routing decision with its observed outcome for threshold tuning
+        if "routing" in results:
+            results["routing"]["elapsed_s"] = round(time.time() - started_at, 2)
+            record_routing_decision(results["routing"])
 
-    results["judgment"] = str(judge_results.tasks_output[0]) if judge_results.tasks_output else ""
+        if config.LIBRARY_CONFIG["enabled"]:
+            save_debate(results)
 
-    if on_step_complete:
-        on_step_complete("Judgment Complete", "Final assessment delivered")
+        if profiler:
+            results["profile"] = profiler.finish()
+            results["profile"]["speedscope_path"] = profiler.export()
 
-    return results
+        log_event(
+            "debate_end",
+            debate_id=results["debate_id"],
+            duration_s=round(time.time() - started_at, 2),
+            timings=results["timings"],
+            cost_usd=results["budget"]["actual"]["cost_usd"] if tracker else None,
+            output_tokens=sum(usage.get("output_tokens", 0) for usage in results["token_usage"].values())
+        )
+        scheduler = get_scheduler()
+        if scheduler:
+            metrics = scheduler.metrics()
+            log_event(
+                "scheduler_metrics",
+                debate_id=results["debate_id"],
+                tenant=tenant,
+                tenant_queue=metrics["tenants"].get(tenant),
+                classes=metrics["classes"],
+                providers=metrics["providers"]
+            )
+
+        return results
+    finally:
+        # Errors and cancellations must not leave the sampler thread and allocation tracing running
+        if profiler:
+            profiler.stop()
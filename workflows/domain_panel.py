@@ -0,0 +1,126 @@
+"""
+Domain Panel - One domain expert per domain, run concurrently
+
+A debate can span several domains ("fintech + EU regulation + retail ops"). Each domain
+gets its own expert, and every expert sees a focused transcript: each debater's
+opening section plus the sections that mention the expert's domain, not the whole
+debate. The experts run at the same time, so adding a domain costs about one more
+concurrent call, not one more sequential call. Their outputs are merged section by
+section into a single Round 3 entry, with sentences that another expert already made
+removed.
+"""
+import logging
+import re
+
+from utils.context_guard import SENTENCE_END, condense
+from utils.event_log import log_event
+from utils.retrieval import tokenize
+from utils.sections import parse_sections
+import config
+
+# " + " needs spaces around it so names such as "C++ tooling" stay whole
+DOMAIN_SEPARATORS = re.compile(r"\s+\+\s+|\s*[;\n]\s*")
+
+DOMAIN_SECTIONS = {
+    1: "DOMAIN CONTEXT",
+    2: "REGULATORY CONSIDERATIONS",
+    3: "IMPLEMENTATION REALITIES",
+    4: "PRECEDENTS",
+    5: "CRITICAL DEPENDENCIES"
+}
+
+
+def split_domains(domain) -> list:
+    """
+    Normalize a domain argument to a list of distinct domains.
+
+    Args:
+        domain: A domain string (several may be joined with " + ", ";" or newlines) or a list of domains
+
+    Returns:
+        Non-empty list of domain names, capped at DOMAIN_PANEL_CONFIG["max_domains"] (the
+        dropped ones are logged as a "domains_dropped" warning)
+    """
+    parts = domain if isinstance(domain, (list, tuple)) else DOMAIN_SEPARATORS.split(domain or "")
+    domains = list(dict.fromkeys(part.strip() for part in parts if part and part.strip()))
+    max_domains = config.DOMAIN_PANEL_CONFIG["max_domains"]
+    if len(domains) > max_domains:
+        log_event("domains_dropped", logging.WARNING, kept=domains[:max_domains], dropped=domains[max_domains:])
+    return domains[:max_domains] or ["general business strategy"]
+
+
+def focus_output(text: str, agent_name: str, domain: str, level: int = 0, older: bool = False) -> str:
+    """
+    Keep the sections of one debater's output that a domain's expert needs.
+
+    The opening (thesis) section is always kept, plus up to
+    DOMAIN_PANEL_CONFIG["relevant_sections"] further sections ranked by how many of the
+    domain's terms they mention. Unstructured outputs are kept whole.
+    """
+    sections = parse_sections(text)
+    if not sections:
+        return condense(text, agent_name, level, older)
+
+    terms = set(tokenize(domain))
+    ranked = sorted(
+        sections[1:],
+        key=lambda section: -len(terms & set(tokenize(f"{section['title']} {section['body']}")))
+    )
+    kept = {id(sections[0])} | {id(section) for section in ranked[:config.DOMAIN_PANEL_CONFIG["relevant_sections"]]}
+    focused = "\n\n".join(f"({s['number']}) {s['title']}: {s['body']}" for s in sections if id(s) in kept)
+    return condense(focused, agent_name, level, older)
+
+
+def domain_view(domain: str):
+    """A condense-compatible view (text, agent_name, level, older) focused on one domain."""
+    def view(text: str, agent_name: str, level: int = 0, older: bool = False) -> str:
+        return focus_output(text, agent_name, domain, level, older)
+    return view
+
+
+def _sentences(text: str) -> list:
+    return [sentence for sentence in SENTENCE_END.split(" ".join(text.split())) if sentence.strip()]
+
+
+def _similar(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def merge_expert_outputs(outputs: dict) -> tuple:
+    """
+    Merge per-domain expert outputs into one five-section domain expert output.
+
+    Args:
+        outputs: Domain -> that domain expert's output
+
+    Returns:
+        (merged text, number of duplicate sentences removed)
+    """
+    if len(outputs) == 1:
+        return next(iter(outputs.values())), 0
+
+    threshold = config.DOMAIN_PANEL_CONFIG["duplicate_threshold"]
+    parsed = {domain: {s["number"]: s["body"] for s in parse_sections(text)} for domain, text in outputs.items()}
+    seen = []
+    removed = 0
+    merged = []
+
+    for number, title in DOMAIN_SECTIONS.items():
+        lines = []
+        for domain, sections in parsed.items():
+            # Unstructured outputs are attached whole to the first section
+            body = sections.get(number, "") if sections else (outputs[domain] if number == 1 else "")
+            kept = []
+            for sentence in _sentences(body):
+                terms = set(tokenize(sentence))
+                if any(_similar(terms, other) >= threshold for other in seen):
+                    removed += 1
+                    continue
+                seen.append(terms)
+                kept.append(sentence)
+            if kept:
+                lines.append(f"[{domain}] " + " ".join(kept))
+        if lines:
+            merged.append(f"({number}) {title}:\n" + "\n".join(lines))
+
+    return "\n\n".join(merged), removed
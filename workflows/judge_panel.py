@@ -0,0 +1,233 @@
+"""
+Judge Panel - Low-latency alternative to the single judge
+
+Several fast small-model judges run at the same time: one scores the ARGUMENT SCORECARD
+for each participant's slice of the debate (advocate, critic, contrarian) and one writes
+the overview sections from the synthesis. A local aggregation step (no LLM call) merges
+them into the same six-section format as the single judge's results["judgment"].
+Within run_debate, panel prompts go through the context guard and the phase cache like
+every other phase.
+"""
+import re
+import time
+from typing import Callable, Optional
+
+from crewai import Task
+
+from agents import create_judge_agent
+from utils.context_guard import condense
+from utils.output_budget import length_guidance
+from utils.sections import parse_sections
+from workflows.parallel import kickoff_concurrently, single_task_crew
+
+# Slice name -> (label, result keys holding that participant's arguments)
+PANEL_SLICES = {
+    "advocate": ("ADVOCATE", ["advocate", "advocate_response"]),
+    "critic": ("CRITIC", ["critic", "critic_response"]),
+    "contrarian": ("CONTRARIAN", ["contrarian"])
+}
+
+SCORECARD_LINE = re.compile(
+    r"^\s*[-*•]\s*(?P<argument>.+?)\s*\|\s*\**(?P<verdict>SURVIVED|FAILED|CONTESTED)\**\s*\|\s*(?P<score>\d+(?:\.\d+)?)"
+    r"(?:\s*/\s*10)?\s*(?:\|\s*(?P<reason>.*))?$",
+    re.MULTILINE | re.IGNORECASE
+)
+
+OVERVIEW_SECTIONS = {
+    1: "EXECUTIVE ASSESSMENT",
+    3: "EVIDENCE QUALITY",
+    4: "REMAINING UNCERTAINTIES",
+    5: "DECISION READINESS",
+    6: "RECOMMENDATION"
+}
+
+
+def _debate_outputs(results: dict) -> dict:
+    outputs = {}
+    for round_data in results.get("rounds", []):
+        outputs.update({key: value for key, value in round_data.items() if isinstance(value, str)})
+    return outputs
+
+
+def _opening(text: str) -> str:
+    sections = parse_sections(text)
+    return sections[0]["body"] if sections else text[:500]
+
+
+def parse_scorecard(text: str) -> list:
+    """Parse '- argument | VERDICT | score | reason' lines into dicts."""
+    return [{
+        "argument": match.group("argument").strip(),
+        "verdict": match.group("verdict").upper(),
+        "score": min(float(match.group("score")), 10.0),
+        "reason": (match.group("reason") or "").strip()
+    } for match in SCORECARD_LINE.finditer(text or "")]
+
+
+def aggregate_panel(scorecards: dict, overview: str) -> tuple:
+    """
+    Merge slice scorecards and the overview into the single judge's output format.
+
+    Returns:
+        (judgment text, per-slice summary dict)
+    """
+    summary = {}
+    scorecard_blocks = []
+
+    for slice_name, text in scorecards.items():
+        entries = parse_scorecard(text)
+        survived = sum(1 for entry in entries if entry["verdict"] == "SURVIVED")
+        mean_score = round(sum(e["score"] for e in entries) / len(entries), 2) if entries else None
+        summary[slice_name] = {
+            "arguments": len(entries),
+            "survived": survived,
+            "failed": sum(1 for entry in entries if entry["verdict"] == "FAILED"),
+            "mean_score": mean_score,
+            "entries": entries
+        }
+
+        label = PANEL_SLICES[slice_name][0].title()
+        if entries:
+            lines = "\n".join(
+                f"- {e['argument']} — **{e['verdict']}** ({e['score']:g}/10){': ' + e['reason'] if e['reason'] else ''}"
+                for e in entries
+            )
+            scorecard_blocks.append(
+                f"**{label}** — {survived}/{len(entries)} arguments survived, mean score {mean_score:g}/10\n{lines}"
+            )
+        else:
+            scorecard_blocks.append(f"**{label}**\n{text.strip()}")
+
+    overview_sections = {section["number"]: section["body"] for section in parse_sections(overview)}
+    parts = []
+    for number in range(1, 7):
+        if number == 2:
+            parts.append("(2) ARGUMENT SCORECARD:\n" + "\n\n".join(scorecard_blocks))
+        elif number in overview_sections:
+            parts.append(f"({number}) {OVERVIEW_SECTIONS[number]}: {overview_sections[number]}")
+
+    # Fall back to the raw overview when its sections could not be parsed
+    if not overview_sections:
+        parts.insert(0, overview.strip())
+
+    return "\n\n".join(parts), summary
+
+
+def _full_context(agent, agent_name: str, phase: str, build: Callable[[int], str]) -> str:
+    return build(0)
+
+
+def _run_concurrently(phase: str, specs: list, concurrent: bool = True) -> list:
+    return kickoff_concurrently([single_task_crew(agent, task) for _, agent, task, _ in specs])
+
+
+def run_judge_panel(
+    results: dict,
+    llm_for: Callable[[str, str], object],
+    guarded_context: Optional[Callable] = None,
+    run_tasks: Optional[Callable] = None
+) -> dict:
+    """
+    Judge a finished debate with the parallel small-model panel.
+
+    Args:
+        results: Debate results containing rounds and synthesis
+        llm_for: Callable(agent_name, phase) returning the LLM for a panel judge
+        guarded_context: Callable(agent, agent_name, phase, build) fitting a prompt context
+            to the panel model, as in run_debate (default: the full context)
+        run_tasks: Callable(phase, specs, concurrent) running (agent_name, agent, task, phase)
+            specs concurrently, as in run_debate (default: no phase cache)
+
+    Returns:
+        Dictionary with "judgment" (six-section text), per-slice "panel" scores and "latency_s"
+    """
+    guarded_context = guarded_context or _full_context
+    run_tasks = run_tasks or _run_concurrently
+    outputs = _debate_outputs(results)
+    question = results["question"]
+    specs = []
+    # Output caps recorded by llm_for (possibly reduced by a budget plan)
+    budgets = results.get("budgets", {})
+
+    for slice_name, (label, keys) in PANEL_SLICES.items():
+        def scorecard_context(level: int, slice_name=slice_name, label=label, keys=keys) -> str:
+            arguments = "\n\n".join(
+                condense(outputs[key], slice_name, level, older=key != keys[-1]) for key in keys if outputs.get(key)
+            )
+            challenges = "\n\n".join(
+                f"{other_label}: {_opening(outputs[other_keys[0]])}"
+                for other, (other_label, other_keys) in PANEL_SLICES.items()
+                if other != slice_name and outputs.get(other_keys[0])
+            )
+            return f"""
+            QUESTION: {question}
+
+            THE {label}'S ARGUMENTS:
+            {arguments}
+
+            POSITIONS CHALLENGING THEM:
+            {challenges}
+            """
+
+        judge = create_judge_agent(llm_for("judge_panel", "scorecard"))
+        task = Task(
+            description=f"""
+            You are one member of a judging panel. Score ONLY the {label}'s arguments; other
+            judges score the other participants.
+            {guarded_context(judge, "judge_panel", "scorecard", scorecard_context)}
+            Provide only an ARGUMENT SCORECARD: one line per major argument, exactly in this form:
+            - <argument in under 15 words> | SURVIVED or FAILED or CONTESTED | <score 1-10> | <one-line reason>
+
+            {length_guidance("judge_panel", "scorecard", budgets.get("judge_panel:scorecard"))}
+            """,
+            expected_output=f"A one-line-per-argument scorecard for the {label}",
+            agent=judge
+        )
+        specs.append(("judge_panel", judge, task, "scorecard"))
+
+    openings = "\n".join(
+        f"{label}: {_opening(outputs[keys[0]])}"
+        for label, keys in PANEL_SLICES.values() if outputs.get(keys[0])
+    )
+
+    def overview_context(level: int) -> str:
+        domain_context = ""
+        if outputs.get("domain_expert"):
+            domain_context = f"\n        DOMAIN EXPERT:\n        {condense(outputs['domain_expert'], 'domain_expert', level)}\n"
+        return f"""
+        QUESTION: {question}
+
+        OPENING POSITIONS:
+        {openings}
+        {domain_context}
+        SYNTHESIS:
+        {condense(results.get('synthesis', ''), 'synthesizer', level)}
+        """
+
+    overview_judge = create_judge_agent(llm_for("judge_panel", "overview"))
+    overview_task = Task(
+        description=f"""
+        You are the overview member of a judging panel; other judges score individual arguments.
+        {guarded_context(overview_judge, "judge_panel", "overview", overview_context)}
+        Provide exactly these sections:
+        (1) EXECUTIVE ASSESSMENT: 2-3 sentence summary of what this debate revealed
+        (3) EVIDENCE QUALITY: What was well-supported vs. speculative
+        (4) REMAINING UNCERTAINTIES: What we still don't know (ranked by importance)
+        (5) DECISION READINESS: Is this ready for decision? If not, what's needed?
+        (6) RECOMMENDATION: Your advised course of action (clearly marked as opinion)
+
+        {length_guidance("judge_panel", "overview", budgets.get("judge_panel:overview"))}
+        """,
+        expected_output="Overview sections of the final judgment",
+        agent=overview_judge
+    )
+    specs.append(("judge_panel", overview_judge, overview_task, "overview"))
+
+    started = time.time()
+    panel_outputs = run_tasks("judgment", specs, concurrent=True)
+    latency = round(time.time() - started, 2)
+
+    scorecards = dict(zip(PANEL_SLICES, panel_outputs[:-1]))
+    judgment, summary = aggregate_panel(scorecards, panel_outputs[-1])
+
+    return {"judgment": judgment, "panel": summary, "latency_s": latency}
@@ -0,0 +1,30 @@
+"""
+Parallel Crew Helpers - Run independent single-task crews concurrently
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from crewai import Task, Crew, Process
+
+import config
+
+
+def single_task_crew(agent, task: Task) -> Crew:
+    """Wrap one agent and its task in a crew."""
+    return Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=config.DEBATE_CONFIG["verbose"]
+    )
+
+
+def kickoff(crew: Crew) -> str:
+    """Kick off a single-task crew and return its output."""
+    result = crew.kickoff()
+    return str(result.tasks_output[0]) if result.tasks_output else ""
+
+
+def kickoff_concurrently(crews: list) -> list:
+    """Kick off independent single-task crews in parallel and return their outputs in order."""
+    with ThreadPoolExecutor(max_workers=len(crews)) as executor:
+        return list(executor.map(kickoff, crews))
@@ -0,0 +1,334 @@
+"""
+Tournament Flow Orchestrator
+Debates several competing options ("A vs B vs C") in one pass using CrewAI
+
+Instead of one full debate per option, the critic and contrarian analyse the shared
+problem framing once, one advocate per option builds its case concurrently, and the
+synthesizer and judge compare every option in a single call each. LLMs are built like
+run_debate's, so the context guard, token ledger, event log, cancellation and scheduler
+apply to tournaments too.
+"""
+import logging
+import time
+import uuid
+from crewai import Task
+from typing import Optional, Callable
+
+from agents import (
+    create_advocate_agent,
+    create_critic_agent,
+    create_contrarian_agent,
+    create_synthesizer_agent,
+    create_judge_agent
+)
+from utils.llm_factory import model_key, route_models, record_routing_decision
+from utils.cancellation import CancelToken
+from utils.context_guard import TokenLedger, condense, fit_context
+from utils.debate_export import save_debate
+from utils.event_log import EventLogListener, log_event
+from utils.output_budget import get_output_budget, length_guidance
+from workflows.debate_flow import build_llm
+from workflows.parallel import kickoff, kickoff_concurrently, single_task_crew
+import config
+
+
+def run_tournament(
+    question: str,
+    options: list,
+    domain: str = "general business strategy",
+    on_step_complete: Optional[Callable[[str, str], None]] = None,
+    model_tier: Optional[str] = None,
+    cancel_token: Optional[CancelToken] = None,
+    tenant: str = "default",
+    priority: str = "interactive"
+) -> dict:
+    """
+    Run a multi-option tournament debate with shared Round 1 context.
+
+    Args:
+        question: The strategic question framing the choice
+        options: Two or more competing options to compare (repeats are dropped)
+        domain: Domain context for the debate
+        on_step_complete: Optional callback(agent_name, output) called after each step
+        model_tier: Optional tier name from config.MODEL_TIERS forcing the router's choice
+        cancel_token: Optional CancelToken; once cancelled the tournament raises DebateCancelled
+        tenant: Tenant the LLM calls are scheduled and capped under
+        priority: Scheduling class from config.SCHEDULER_CONFIG ("interactive", "api", "batch")
+
+    Returns:
+        Dictionary containing the shared analysis, one advocate case per option,
+        the comparative synthesis and the final judgment
+    """
+    # Repeated options (ignoring case and spacing) would collapse into one advocate case
+    unique = {}
+    for option in options:
+        option = " ".join((option or "").split())
+        if option:
+            unique.setdefault(option.lower(), option)
+    options = list(unique.values())
+    if len(options) < 2:
+        raise ValueError("A tournament needs at least two options")
+
+    started_at = time.time()
+
+    results = {
+        "debate_id": uuid.uuid4().hex,
+        "started_at": started_at,
+        "question": question,
+        "domain": domain,
+        "mode": "tournament",
+        "options": options,
+        "rounds": [],
+        "budgets": {},
+        "models": {},
+        "timings": {},
+        "token_usage": {}
+    }
+
+    if config.ROUTER_CONFIG["enabled"] or model_tier:
+        routing = route_models(question, domain, tier_override=model_tier)
+        agent_models = routing["agent_models"]
+        results["routing"] = routing["decision"]
+    else:
+        agent_models = config.AGENT_MODELS
+
+    ledger = TokenLedger()
+    listeners = [ledger.record_call, EventLogListener(results["debate_id"]).record_call]
+
+    def llm_for(agent_name: str, phase: str):
+        budget = get_output_budget(agent_name, phase)
+        if budget:
+            results["budgets"][f"{agent_name}:{phase}"] = budget
+        results["models"][f"{agent_name}:{phase}"] = model_key(agent_models[agent_name])
+        return build_llm(agent_name, phase, agent_models[agent_name], budget, listeners, cancel_token, tenant, priority)
+
+    def guarded_context(agent, agent_name: str, phase: str, build: Callable[[int], str]) -> str:
+        # Degrade the embedded cases until the prompt fits the agent's model
+        context, report = fit_context(
+            build, agent, agent_name, agent_models[agent_name],
+            max_output=results["budgets"].get(f"{agent_name}:{phase}")
+        )
+        results["token_usage"][f"{agent_name}:{phase}"] = report
+        if report["degradation"] != "full":
+            log_event(
+                "context_degraded", logging.WARNING,
+                debate_id=results["debate_id"], agent=agent_name, phase=phase, **report
+            )
+        return context
+
+    def check_cancelled():
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+    option_list = "\n".join(f"        OPTION {chr(65 + i)}: {option}" for i, option in enumerate(options))
+
+    # ============================================
+    # ROUND 1: Shared Framing + Option Cases (Parallel)
+    # ============================================
+
+    critic = create_critic_agent(llm_for("critic", "initial"))
+    critic_task = Task(
+        description=f"""
+        Analyze the following strategic choice and identify the weaknesses, risks, and failure modes
+        of each option, plus the risks shared by all of them:
+
+        QUESTION: {question}
+
+        OPTIONS:
+{option_list}
+
+        Follow your output format strictly:
+        (1) CRITICAL THESIS: One-sentence summary of your primary concern
+        (2) KEY VULNERABILITIES: The most severe weaknesses, labelled by option (or "ALL")
+        (3) FAILURE SCENARIOS: 2-3 concrete 'If X, then Y' failure paths
+        (4) BURDEN OF PROOF: What evidence each option would need to address your concerns
+
+        {length_guidance("critic", "initial")}
+        """,
+        expected_output="A comparative risk analysis across all options",
+        agent=critic
+    )
+
+    contrarian = create_contrarian_agent(llm_for("contrarian", "initial"))
+    contrarian_task = Task(
+        description=f"""
+        Analyze the following strategic choice and challenge its framing:
+
+        QUESTION: {question}
+
+        OPTIONS:
+{option_list}
+
+        Follow your output format strictly:
+        (1) REFRAME: Is this the right set of options? How might we think about the choice differently?
+        (2) ALTERNATIVE APPROACHES: 2-3 paths outside the listed options, with rationale
+        (3) HYBRID POSSIBILITIES: Elements of the listed options that could be combined
+        (4) UNEXPLORED QUESTIONS: What questions should we be asking that we aren't?
+
+        {length_guidance("contrarian", "initial")}
+        """,
+        expected_output="Alternative approaches and reframing of the choice",
+        agent=contrarian
+    )
+
+    crews = [single_task_crew(critic, critic_task), single_task_crew(contrarian, contrarian_task)]
+
+    for option in options:
+        advocate = create_advocate_agent(llm_for("advocate", "initial"))
+        advocate_task = Task(
+            description=f"""
+            Analyze the following strategic choice and build the strongest possible case FOR one option:
+
+            QUESTION: {question}
+
+            ALL OPTIONS:
+{option_list}
+
+            YOU ARE ADVOCATING FOR: {option}
+
+            Follow your output format strictly:
+            (1) THESIS: One-sentence summary of why this option wins
+            (2) STRATEGIC CASE: 3-5 major arguments with evidence, including why it beats the other options
+            (3) ANTICIPATED OBJECTIONS: Top 2-3 objections and your preemptive rebuttals
+            (4) CALL TO ACTION: What specific next step this analysis supports
+
+            {length_guidance("advocate", "initial")}
+            """,
+            expected_output=f"A compelling, evidence-based case FOR: {option}",
+            agent=advocate
+        )
+        crews.append(single_task_crew(advocate, advocate_task))
+
+    phase_started = time.time()
+    outputs = kickoff_concurrently(crews)
+    results["timings"]["initial"] = round(time.time() - phase_started, 2)
+
+    round1_output = {
+        "round": 1,
+        "phase": "Shared Framing & Option Cases",
+        "critic": outputs[0],
+        "contrarian": outputs[1],
+        "advocates": dict(zip(options, outputs[2:]))
+    }
+    results["rounds"].append(round1_output)
+
+    if on_step_complete:
+        on_step_complete("Round 1 Complete", f"Shared analysis and cases for {len(options)} options")
+
+    check_cancelled()
+
+    # ============================================
+    # COMPARATIVE SYNTHESIS
+    # ============================================
+
+    def tournament_content(level: int) -> str:
+        advocate_cases = "\n".join(
+            f"""
+    ADVOCATE FOR OPTION {chr(65 + i)} ({option}):
+    {condense(case, 'advocate', level)}
+    """ for i, (option, case) in enumerate(round1_output["advocates"].items())
+        )
+
+        return f"""
+    ORIGINAL QUESTION: {question}
+
+    OPTIONS:
+{option_list}
+
+    === OPTION CASES ===
+    {advocate_cases}
+
+    === SHARED ANALYSIS ===
+
+    CRITIC:
+    {condense(round1_output['critic'], 'critic', level)}
+
+    CONTRARIAN:
+    {condense(round1_output['contrarian'], 'contrarian', level)}
+    """
+
+    synthesizer = create_synthesizer_agent(llm_for("synthesizer", "synthesis"))
+    synthesizer_task = Task(
+        description=f"""
+        Compare all options in this tournament and synthesize actionable strategic options:
+
+        {guarded_context(synthesizer, "synthesizer", "synthesis", tournament_content)}
+
+        Provide:
+        (1) CONVERGENCE POINTS: Where all/most perspectives agreed
+        (2) PRODUCTIVE TENSIONS: The real trade-offs between the options
+        (3) STRATEGIC OPTIONS: Each listed option (plus any strong hybrid) with its key assumptions and trade-offs
+        (4) DECISION CRITERIA: Framework for choosing between options
+        (5) OPEN QUESTIONS: What remains unresolved
+
+        {length_guidance("synthesizer", "synthesis")}
+        """,
+        expected_output="A side-by-side synthesis of all options with clear trade-offs",
+        agent=synthesizer
+    )
+
+    phase_started = time.time()
+    results["synthesis"] = kickoff(single_task_crew(synthesizer, synthesizer_task))
+    results["timings"]["synthesis"] = round(time.time() - phase_started, 2)
+
+    if on_step_complete:
+        on_step_complete("Synthesis Complete", "Options compared side by side")
+
+    check_cancelled()
+
+    # ============================================
+    # JUDGMENT PHASE
+    # ============================================
+
+    def final_content(level: int) -> str:
+        return f"""
+    {tournament_content(level)}
+
+    === SYNTHESIS ===
+
+    {condense(results['synthesis'], 'synthesizer', level)}
+    """
+
+    judge = create_judge_agent(llm_for("judge", "judgment"))
+    judge_task = Task(
+        description=f"""
+        Evaluate the entire tournament and synthesis, then rank the options:
+
+        {guarded_context(judge, "judge", "judgment", final_content)}
+
+        Provide:
+        (1) EXECUTIVE ASSESSMENT: 2-3 sentence summary of what this tournament revealed
+        (2) ARGUMENT SCORECARD: Which arguments for and against each option survived/failed scrutiny
+        (3) EVIDENCE QUALITY: What was well-supported vs. speculative
+        (4) REMAINING UNCERTAINTIES: What we still don't know (ranked by importance)
+        (5) DECISION READINESS: Is this ready for decision? If not, what's needed?
+        (6) RECOMMENDATION: Your ranking of the options and advised course of action (clearly marked as opinion)
+
+        {length_guidance("judge", "judgment")}
+        """,
+        expected_output="Final ranking and recommendation for the decision-maker",
+        agent=judge
+    )
+
+    phase_started = time.time()
+    results["judgment"] = kickoff(single_task_crew(judge, judge_task))
+    results["timings"]["judgment"] = round(time.time() - phase_started, 2)
+
+    # Shared critic + contrarian, one advocate per option, one synthesizer, one judge
+    results["llm_calls"] = len(options) + 4
+
+    if on_step_complete:
+        on_step_complete("Judgment Complete", "Final ranking delivered")
+
+    # Merge the counted per-call tokens into the pre-flight reports
+    for key, usage in ledger.usage.items():
+        results["token_usage"].setdefault(key, {}).update(usage)
+
+    if "routing" in results:
+        results["routing"]["elapsed_s"] = round(time.time() - started_at, 2)
+        record_routing_decision(results["routing"])
+
+    if config.LIBRARY_CONFIG["enabled"]:
+        save_debate(results)
+
+    return results